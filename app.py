@@ -2,17 +2,17 @@
 import streamlit as st
 import json
 import os
+import sys
 import pandas as pd
+import time
 from datetime import datetime
-from pathlib import Path
 
-# Import your existing scripts
-from scripts.fetch_jobs import fetch_jobs
-from scripts.rank_jobs import rank_jobs
-from scripts.generate_docs import generate_documents
-from scripts.update_sheet import update_google_sheet
-from scripts.company_scraper import fetch_company_jobs
-from config import JOB_CRITERIA, COMPANY_CAREERS
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from job_store import iter_jobs, legacy_path, store_path
+from llm_gateway import METRICS_PATH, model_for
+from pipeline import format_stats
+from pipeline_runner import RUNNER
+from config import JOB_CRITERIA
 
 st.set_page_config(
     page_title="Job Automation Dashboard",
@@ -20,6 +20,43 @@ st.set_page_config(
     layout="wide"
 )
 
+# Dashboard table columns and their dtypes; records missing a field get the column's empty value
+DASHBOARD_SCHEMA = {
+    "title": "string",
+    "company": "string",
+    "location": "string",
+    "match_score": "float64",
+    "url": "string"
+}
+PAGE_SIZE = 100
+
+
+def store_signature(name):
+    """(path, mtime_ns, size) of a job store, or None if it has not been written"""
+    for path in (store_path(name), legacy_path(name)):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            return path, stat.st_mtime_ns, stat.st_size
+    return None
+
+
+@st.cache_data(max_entries=4)
+def load_dashboard_jobs(name, signature):
+    """
+    Load a job store into a fixed-schema DataFrame sorted by match score.
+
+    `signature` is only the cache key: the store is re-read once its file changes.
+    """
+    columns = {column: [] for column in DASHBOARD_SCHEMA}
+    for job in iter_jobs(name):
+        # LinkedIn records carry 'url', older company-page records 'link'
+        job = {**job, "url": job.get("url") or job.get("link")}
+        for column, values in columns.items():
+            values.append(job.get(column))
+    df = pd.DataFrame(columns).astype(DASHBOARD_SCHEMA)
+    return df.sort_values("match_score", ascending=False, na_position="last", ignore_index=True)
+
+
 # Sidebar Navigation
 st.sidebar.title("Navigation")
 page = st.sidebar.radio("Go to", ["Dashboard", "Run Automation", "Job Criteria", "Settings"])
@@ -31,22 +68,28 @@ if page == "Dashboard":
     col1, col2, col3 = st.columns(3)
     
     # Load last run data
-    if os.path.exists("data/ranked_jobs.json"):
-        with open("data/ranked_jobs.json", "r") as f:
-            last_jobs = json.load(f)
+    signature = store_signature("ranked_jobs")
+    if signature:
+        df = load_dashboard_jobs("ranked_jobs", signature)
         
         with col1:
-            st.metric("Jobs in Pipeline", len(last_jobs))
+            st.metric("Jobs in Pipeline", len(df))
         with col2:
-            avg_score = sum(j.get('match_score', 0) for j in last_jobs) / len(last_jobs) if last_jobs else 0
-            st.metric("Avg. Match Score", f"{avg_score:.2f}")
+            st.metric("Avg. Match Score", f"{df['match_score'].mean():.2f}" if len(df) else "–")
         with col3:
-            st.metric("Latest Run", datetime.now().strftime("%Y-%m-%d"))
+            st.metric("Latest Run", datetime.fromtimestamp(signature[1] / 1e9).strftime("%Y-%m-%d"))
 
         st.subheader("Top Matches")
-        df = pd.DataFrame(last_jobs)
         if not df.empty:
-            st.dataframe(df[['title', 'company', 'location', 'match_score', 'link']], use_container_width=True)
+            pages = max((len(df) - 1) // PAGE_SIZE + 1, 1)
+            page_number = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+            start = (page_number - 1) * PAGE_SIZE
+            st.dataframe(
+                df.iloc[start:start + PAGE_SIZE],
+                use_container_width=True,
+                hide_index=True,
+                column_config={"url": st.column_config.LinkColumn("Link")}
+            )
     else:
         st.info("No run data found. Head to 'Run Automation' to start.")
 
@@ -59,37 +102,37 @@ elif page == "Run Automation":
         update_gsheet = st.checkbox("Update Google Sheet", value=True)
         limit = st.slider("Max jobs to process", 5, 50, 20)
 
-    if st.button("Start Automation Pipeline", type="primary"):
-        status = st.empty()
-        progress = st.progress(0)
-        
-        try:
-            status.info("🔍 Fetching jobs...")
-            if mode == "Job Boards":
-                jobs = fetch_jobs()
-            else:
-                jobs = fetch_company_jobs()
-            progress.progress(25)
-            
-            status.info(f"📊 Ranking {len(jobs)} jobs...")
-            ranked = rank_jobs(jobs, max_jobs=limit)
-            progress.progress(50)
-            
-            if gen_docs:
-                status.info("📝 Tailoring resumes and cover letters...")
-                generate_documents(ranked)
-                progress.progress(75)
-                
-            if update_gsheet:
-                status.info("📝 Updating tracking sheet...")
-                update_google_sheet(ranked)
-                progress.progress(100)
-                
-            status.success(f"✅ Successfully processed {len(ranked)} jobs!")
-            st.balloons()
-            
-        except Exception as e:
-            st.error(f"Pipeline failed: {str(e)}")
+    running = RUNNER.is_running()
+    if st.button("Start Automation Pipeline", type="primary", disabled=running):
+        started = RUNNER.start(
+            source="boards" if mode == "Job Boards" else "companies",
+            limit=limit,
+            generate_docs=gen_docs,
+            update_tracker=update_gsheet
+        )
+        if not started:
+            st.warning("A pipeline run is already in progress.")
+
+    # The run continues in the background; this page only polls its progress
+    run = RUNNER.snapshot()
+    if run["status"] == "running":
+        st.info(f"⏳ {format_stats(run['stats']) or 'Starting...'}")
+        st.progress(min(run["finished"] / run["total"], 1.0) if run["total"] else 0.0)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Jobs Finished", f"{run['finished']} / {run['total']}")
+        col2.metric("Throughput", f"{run['throughput']:.1f} jobs/min")
+        col3.metric("ETA", f"{run['eta']:.0f}s" if run["eta"] is not None else "–")
+        time.sleep(1)
+        st.rerun()
+    elif run["status"] == "done":
+        st.success(f"✅ Processed {run['stats']['fetch']['done']} jobs in {run['elapsed']:.0f}s, "
+                   f"{len(run['qualified'])} qualified!")
+        for stage, job, error in run["errors"]:
+            st.warning(f"{stage} failed for {job.get('title', 'source')} at {job.get('company', '')}: {error}")
+        if run["errors"]:
+            st.info("Run again to retry only the failed steps; completed work is checkpointed.")
+    elif run["status"] in ("failed", "busy"):
+        st.error(f"Pipeline failed: {run['error']}")
 
 elif page == "Job Criteria":
     st.title("🎯 Matching Criteria")
@@ -102,3 +145,13 @@ elif page == "Settings":
     for key in keys:
         exists = "✅ Set" if os.getenv(key) else "❌ Missing"
         st.write(f"- **{key}**: {exists}")
+    
+    st.subheader("LLM Usage (last run)")
+    st.write(f"Models: ranking **{model_for('match')}**, documents **{model_for('resume')}**")
+    if os.path.exists(METRICS_PATH):
+        with open(METRICS_PATH, "r", encoding="utf-8") as f:
+            metrics = json.load(f)
+        st.caption(f"Exported {metrics['exported_at']}")
+        st.dataframe(pd.DataFrame.from_dict(metrics["stages"], orient="index"), use_container_width=True)
+    else:
+        st.info("No LLM metrics recorded yet.")
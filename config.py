@@ -1,9 +1,14 @@
 """Configuration file for job application automation"""
+import json
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Settings shared with scripts/config.py
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared_config.json"), encoding="utf-8") as f:
+    SHARED_CONFIG = json.load(f)
+
 # Target job criteria for Munich market
 JOB_CRITERIA = {
     "locations": ["Munich", "München", "Bavaria", "Bayern", "Germany", "Remote"],
@@ -21,7 +26,7 @@ JOB_CRITERIA = {
         "agile", "scrum", "stakeholder", "waterfall", "confluence",
         "jira", "powerbi", "tableau", "excel"
     ],
-    "exclude_keywords": ["senior", "lead", "principal", "director", "head of"],
+    "exclude_keywords": SHARED_CONFIG["exclude_keywords"],
     "min_match_score": 0.75,  # 75% match threshold
     "max_jobs_per_run": 20
 }
@@ -78,7 +83,7 @@ COMPANY_CAREERS = [
     },
     {
         "name": "SAP",
-        "url": "https://jobs.sap.com/search/?location=Munich",
+        "url": "https://jobs.sap.com/search/?locationsearch=Munich",
         "keywords": ["Project Manager", "Data Analyst", "Consultant"]
     },
     {
@@ -87,3 +92,8 @@ COMPANY_CAREERS = [
         "keywords": ["Project Manager", "Data Analyst", "Program Manager"]
     }
 ]
+
+# Per-company selector profiles (see company_scraper.compile_profile)
+for company in COMPANY_CAREERS:
+    if company["name"] in SHARED_CONFIG["company_profiles"]:
+        company["profile"] = SHARED_CONFIG["company_profiles"][company["name"]]
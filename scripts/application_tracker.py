@@ -0,0 +1,207 @@
+"""SQLite-backed application tracker.
+
+Replaces the data/applications_tracking.json file that was reloaded, scanned
+and rewritten for every status update. Applications are looked up through a
+(company, position) index, batches of status updates run in one
+transaction, and every status change is kept in status_history. The JSON
+and summary.txt files are now exports, written on demand.
+"""
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+TRACKER_PATH = "data/applications.db"
+LEGACY_JSON_PATH = "data/applications_tracking.json"
+SUMMARY_PATH = "data/applications_summary.txt"
+
+FIELDS = ("company", "position", "location", "application_date", "status",
+          "match_score", "job_url", "career_page", "last_updated", "notes")
+
+
+def lookup_key(text):
+    """Case- and whitespace-insensitive form used for company/position lookups"""
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+def timestamp():
+    return datetime.now().strftime('%Y-%m-%d %H:%M')
+
+
+class ApplicationTracker:
+    """Applications table plus status history in one SQLite database (WAL mode)"""
+
+    def __init__(self, path=TRACKER_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS applications (
+                id INTEGER PRIMARY KEY,
+                company TEXT NOT NULL,
+                position TEXT NOT NULL,
+                company_key TEXT NOT NULL,
+                position_key TEXT NOT NULL,
+                location TEXT,
+                application_date TEXT,
+                status TEXT,
+                match_score TEXT,
+                job_url TEXT,
+                career_page TEXT,
+                last_updated TEXT,
+                notes TEXT DEFAULT ''
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_company_position
+                ON applications (company_key, position_key);
+            CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status);
+            CREATE TABLE IF NOT EXISTS status_history (
+                application_id INTEGER NOT NULL REFERENCES applications (id),
+                status TEXT NOT NULL,
+                changed_at TEXT NOT NULL,
+                note TEXT DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS idx_status_history_application
+                ON status_history (application_id);
+        """)
+        self._import_legacy_json()
+
+    def _import_legacy_json(self):
+        """One-time import of the old JSON tracking file into an empty database"""
+        if not os.path.exists(LEGACY_JSON_PATH):
+            return
+        if self.conn.execute("SELECT 1 FROM applications LIMIT 1").fetchone():
+            return
+        try:
+            with open(LEGACY_JSON_PATH, "r") as f:
+                applications = json.load(f)
+        except json.JSONDecodeError:
+            return
+        self.upsert_applications(applications)
+
+    def upsert_applications(self, applications):
+        """
+        Insert or refresh applications in a single transaction.
+
+        Existing rows keep their status, application date and notes, so
+        re-syncing ranked jobs never overwrites progress recorded from emails.
+
+        Returns:
+            Number of applications written
+        """
+        count = 0
+        with self.conn:
+            for app in applications:
+                row = {field: app.get(field, "") for field in FIELDS}
+                row["status"] = row["status"] or "To Apply"
+                row["last_updated"] = row["last_updated"] or timestamp()
+                row["company_key"] = lookup_key(row["company"])
+                row["position_key"] = lookup_key(row["position"])
+                existing = self.find(row["company"], row["position"])
+                if existing is not None:
+                    self.conn.execute("""
+                        UPDATE applications SET location = :location, match_score = :match_score,
+                            job_url = :job_url, career_page = :career_page
+                        WHERE id = :id
+                    """, {**row, "id": existing["id"]})
+                else:
+                    cursor = self.conn.execute("""
+                        INSERT INTO applications (company, position, company_key, position_key, location,
+                            application_date, status, match_score, job_url, career_page, last_updated, notes)
+                        VALUES (:company, :position, :company_key, :position_key, :location,
+                            :application_date, :status, :match_score, :job_url, :career_page, :last_updated, :notes)
+                    """, row)
+                    self.conn.execute(
+                        "INSERT INTO status_history (application_id, status, changed_at) VALUES (?, ?, ?)",
+                        (cursor.lastrowid, row["status"], row["last_updated"])
+                    )
+                count += 1
+        return count
+
+    def find(self, company, position):
+        """Return the application row for company/position, or None"""
+        return self.conn.execute(
+            "SELECT * FROM applications WHERE company_key = ? AND position_key = ?",
+            (lookup_key(company), lookup_key(position))
+        ).fetchone()
+
+    def update_statuses(self, updates):
+        """
+        Apply a batch of status updates in one transaction.
+
+        Args:
+            updates: Dicts with company, position, status and optional notes
+
+        Returns:
+            List of booleans, True where a matching application was updated
+        """
+        results = []
+        now = timestamp()
+        with self.conn:
+            for update in updates:
+                row = self.find(update.get('company'), update.get('position'))
+                if row is None:
+                    results.append(False)
+                    continue
+
+                notes = update.get('notes', '')
+                if notes:
+                    notes = f"{row['notes']}\n{notes}" if row['notes'] else notes
+                else:
+                    notes = row['notes']
+                self.conn.execute(
+                    "UPDATE applications SET status = ?, notes = ?, last_updated = ? WHERE id = ?",
+                    (update['status'], notes, now, row['id'])
+                )
+                self.conn.execute(
+                    "INSERT INTO status_history (application_id, status, changed_at, note) VALUES (?, ?, ?, ?)",
+                    (row['id'], update['status'], now, update.get('notes', ''))
+                )
+                results.append(True)
+        return results
+
+    def applications(self):
+        """All applications as dicts, in insertion order"""
+        rows = self.conn.execute(f"SELECT {', '.join(FIELDS)} FROM applications ORDER BY id")
+        return [dict(row) for row in rows]
+
+    def history(self, company, position):
+        """Status changes for one application, oldest first"""
+        rows = self.conn.execute("""
+            SELECT h.status, h.changed_at, h.note FROM status_history h
+            JOIN applications a ON a.id = h.application_id
+            WHERE a.company_key = ? AND a.position_key = ?
+            ORDER BY h.rowid
+        """, (lookup_key(company), lookup_key(position)))
+        return [dict(row) for row in rows]
+
+    def export_json(self, path=LEGACY_JSON_PATH):
+        """Write the applications as the old tracking JSON file"""
+        applications = self.applications()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(applications, f, indent=2)
+        os.replace(tmp_path, path)
+        return len(applications)
+
+    def export_summary(self, path=SUMMARY_PATH):
+        """Write the plain-text applications summary"""
+        with open(path, "w") as f:
+            f.write(f"Job Applications Summary\n")
+            f.write(f"Generated: {timestamp()}\n")
+            f.write(f"="*80 + "\n\n")
+
+            for i, app in enumerate(self.applications(), 1):
+                f.write(f"{i}. {app['company']} - {app['position']}\n")
+                f.write(f"   Location: {app['location']}\n")
+                f.write(f"   Match Score: {app['match_score']}\n")
+                f.write(f"   Status: {app['status']}\n")
+                f.write(f"   Job URL: {app['job_url']}\n")
+                if app['career_page']:
+                    f.write(f"   Career Page: {app['career_page']}\n")
+                f.write(f"\n")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,122 @@
+"""Score several jobs per OpenAI request.
+
+The resume and instructions are sent once per batch instead of once per job.
+Batches are packed greedily under a token budget, and a batch whose response
+is malformed is split in half and retried until single jobs remain.
+"""
+import asyncio
+
+from llm_gateway import context_window, parse_json
+from prompts import batch_match_messages, match_result
+from rate_limit import estimate_tokens
+from scoring_engine import response_text
+
+# Bump whenever the batch prompt changes so cached scores are not reused
+BATCH_PROMPT_VERSION = "match-batch-v2"
+
+# Share of the model's context window (input and output) one batch may fill;
+# estimate_tokens is approximate, so leave headroom
+CONTEXT_SHARE = 0.85
+MAX_BATCH_SIZE = 10
+OUTPUT_TOKENS_PER_JOB = 150
+MAX_DESCRIPTION_CHARS = 3000
+
+
+def format_job(job_id, job):
+    description = (job.get('description') or 'N/A')[:MAX_DESCRIPTION_CHARS]
+    return f"""ID: {job_id}
+Title: {job.get('title', 'N/A')}
+Company: {job.get('company', 'N/A')}
+Location: {job.get('location', 'N/A')}
+Description: {description}
+"""
+
+
+def build_batch_messages(batch, resume):
+    """Messages for one batch of (job_id, job) pairs"""
+    postings = "\n".join(format_job(job_id, job) for job_id, job in batch)
+    return batch_match_messages(postings, len(batch), resume)
+
+
+def token_budget(model):
+    """Prompt plus output tokens one batch request to `model` may use"""
+    return int(CONTEXT_SHARE * context_window(model))
+
+
+def plan_batches(jobs, resume, budget, max_batch_size=MAX_BATCH_SIZE):
+    """Greedily pack jobs into batches whose prompt and output fit `budget` tokens.
+
+    Returns lists of (job_id, job) pairs; IDs are the job's index in `jobs`
+    so they stay stable when a batch is split.
+    """
+    overhead = sum(estimate_tokens(m["content"]) for m in batch_match_messages("", 0, resume))
+    batches, batch, used = [], [], overhead
+
+    for i, job in enumerate(jobs):
+        cost = estimate_tokens(format_job(f"J{i}", job)) + OUTPUT_TOKENS_PER_JOB
+        if batch and (used + cost > budget or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append((f"J{i}", job))
+        used += cost
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def parse_batch_response(content, job_ids):
+    """Map job ID -> result dict; raises ValueError if anything is missing"""
+    items = parse_json(content)
+    if not isinstance(items, list):
+        raise ValueError("Batch response is not a JSON array")
+
+    results = {}
+    for item in items:
+        if isinstance(item, dict) and item.get("id") in job_ids:
+            results[item["id"]] = match_result(item)
+
+    missing = set(job_ids) - set(results)
+    if missing:
+        raise ValueError(f"Batch response missing jobs: {sorted(missing)}")
+    return results
+
+
+async def score_in_batches(jobs, resume, engine, error_result):
+    """Score jobs through `engine` in batches; returns results in job order"""
+    results = {}
+    pending = plan_batches(jobs, resume, token_budget(engine.model))
+    print(f"Packed {len(jobs)} jobs into {len(pending)} batch requests")
+
+    while pending:
+        requests = [
+            (build_batch_messages(batch, resume), OUTPUT_TOKENS_PER_JOB * len(batch) + 50)
+            for batch in pending
+        ]
+        responses = await engine.run(requests)
+
+        retry = []
+        for batch, response in zip(pending, responses):
+            job_ids = [job_id for job_id, _ in batch]
+            if isinstance(response, Exception):
+                # The engine already retried transport errors; splitting won't help
+                print(f"Error scoring batch of {len(batch)} jobs: {response}")
+                results.update({job_id: dict(error_result) for job_id in job_ids})
+                continue
+            try:
+                results.update(parse_batch_response(response_text(response), job_ids))
+            except (ValueError, KeyError, TypeError) as e:
+                if len(batch) == 1:
+                    print(f"Error calculating AI match for {batch[0][1].get('title')}: {e}")
+                    results[job_ids[0]] = dict(error_result)
+                else:
+                    print(f"Malformed batch of {len(batch)} jobs ({e}), splitting and retrying")
+                    middle = len(batch) // 2
+                    retry.extend([batch[:middle], batch[middle:]])
+        pending = retry
+
+    return [results[f"J{i}"] for i in range(len(jobs))]
+
+
+def score_jobs_in_batches(jobs, resume, engine, error_result):
+    return asyncio.run(score_in_batches(jobs, resume, engine, error_result))
@@ -0,0 +1,105 @@
+"""Micro-benchmark: the original email classifier and extractor vs. email_classifier.
+
+Generates a synthetic corpus of job-related and unrelated emails, then times
+the original classify_email/extract_company_position against the
+email_classifier versions and reports how often their results agree.
+
+Usage:
+    python scripts/bench_email_classifier.py
+    python scripts/bench_email_classifier.py --emails 20000 --body-words 400
+"""
+import argparse
+import random
+import re
+import time
+
+from email_classifier import EMAIL_KEYWORDS, classify_email, extract_company_position
+
+COMPANIES = ["BMW", "Siemens", "SAP", "Allianz", "Infineon", "Celonis", "Rohde and Schwarz"]
+POSITIONS = ["Data Analyst", "Data Scientist", "ML Engineer", "Business Analyst", "BI Developer"]
+TEMPLATES = [
+    ("Your application for {position} at {company}",
+     "Thank you for applying. We have received your application for {position} at {company}."),
+    ("Interview invitation", "We would like to invite you to an interview for the position of {position} at "
+     "{company}. Please pick a slot for a zoom call with the team."),
+    ("Update on your application for {position} at {company}",
+     "Unfortunately we have decided to move forward with other candidates for the role of {position} at {company}."),
+    ("Congratulations", "We are pleased to offer you the role of {position} at {company}."),
+    ("Weekly deals", "Save 20% on everything this week, do not miss our special offer."),
+    ("Project sync", "Can we move our meeting to Thursday? I will send a Teams link."),
+]
+FILLER = ("we look forward to hearing from you please find the details below regarding next steps "
+          "our team reviews every application carefully and will get back to you soon").split()
+
+
+def legacy_classify_email(subject, body):
+    """The original classifier: lowercase, then one substring scan per keyword per category"""
+    text = f"{subject.lower()} {body.lower()}"
+    if any(keyword in text for keyword in EMAIL_KEYWORDS['interview']):
+        return 'Interview Scheduled'
+    if any(keyword in text for keyword in EMAIL_KEYWORDS['rejection']):
+        return 'Rejected'
+    if any(keyword in text for keyword in EMAIL_KEYWORDS['offer']):
+        return 'Offer Received'
+    if any(keyword in text for keyword in EMAIL_KEYWORDS['received']):
+        return 'Application Received'
+    return None
+
+
+def legacy_extract_company_position(subject, body):
+    """The original extractor, compiling its patterns on every call"""
+    patterns = [
+        r'(position|role|opportunity)\s+(?:of|as|for)?\s+([\w\s]+)\s+at\s+([\w\s]+)',
+        r'([\w\s]+)\s+-\s+([\w\s]+)\s+position',
+        r'application\s+for\s+([\w\s]+)\s+at\s+([\w\s]+)',
+    ]
+    text = f"{subject} {body}"
+    for pattern in patterns:
+        match = re.compile(pattern, re.IGNORECASE).search(text)
+        if match:
+            groups = match.groups()
+            return {'position': groups[-2].strip(), 'company': groups[-1].strip()}
+    return None
+
+
+def synthetic_corpus(count, body_words, seed=0):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        subject, body = rng.choice(TEMPLATES)
+        values = {"company": rng.choice(COMPANIES), "position": rng.choice(POSITIONS)}
+        filler = " ".join(rng.choice(FILLER) for _ in range(body_words))
+        corpus.append((subject.format(**values), f"{filler}.\n\n{body.format(**values)}\n\n{filler}."))
+    return corpus
+
+
+def time_call(function, corpus):
+    start = time.perf_counter()
+    results = [function(subject, body) for subject, body in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email classification")
+    parser.add_argument('--emails', type=int, default=5000)
+    parser.add_argument('--body-words', type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.emails, args.body_words)
+    print(f"{'stage':<10} {'legacy s':>9} {'new s':>11} {'speedup':>8}  agree")
+
+    total_old = total_new = 0.0
+    for stage, old, new in [("classify", legacy_classify_email, classify_email),
+                            ("extract", legacy_extract_company_position, extract_company_position)]:
+        old_time, old_results = time_call(old, corpus)
+        new_time, new_results = time_call(new, corpus)
+        total_old += old_time
+        total_new += new_time
+        agree = sum(a == b for a, b in zip(old_results, new_results))
+        print(f"{stage:<10} {old_time:9.2f} {new_time:11.2f} {old_time / new_time:7.1f}x  {agree}/{len(corpus)}")
+
+    print(f"\n{'total':<10} {total_old:9.2f} {total_new:11.2f} {total_old / total_new:7.1f}x")
+    print(f"Throughput: {len(corpus) / total_old:.0f} -> {len(corpus) / total_new:.0f} emails/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Micro-benchmark: legacy html.parser cascade vs. lxml + SoupStrainer parsing.
+
+Runs both parse paths over saved career-page HTML fixtures, reporting the
+time per page and whether they extract the same jobs.
+
+Usage:
+    python scripts/bench_parsing.py --fetch        # save current COMPANY_CAREERS pages as fixtures
+    python scripts/bench_parsing.py                # benchmark data/html_fixtures/*.html
+    python scripts/bench_parsing.py DIR --repeat 20
+"""
+import argparse
+import glob
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from company_scraper import (
+    COMPANY_CAREERS, USER_AGENT, extract_link, extract_location, extract_title,
+    matches_criteria, parse_company_page
+)
+from http_cache import get_session
+
+FIXTURE_DIR = 'data/html_fixtures'
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+def legacy_parse(html, company):
+    """The original parse path: full html.parser tree and a five-way select cascade"""
+    soup = BeautifulSoup(html, 'html.parser')
+    job_cards = (
+        soup.select('.job-listing') or
+        soup.select('.position') or
+        soup.select('[class*="job"]') or
+        soup.select('a[href*="/careers/"]') or
+        soup.select('a[href*="/jobs/"]')
+    )
+
+    jobs = []
+    for card in job_cards[:50]:
+        title = extract_title(card)
+        link = extract_link(card, company['url'])
+        location = extract_location(card)
+        if title and link and matches_criteria(title, company.get('keywords', [])):
+            jobs.append({'title': title, 'location': location or 'Munich', 'link': link})
+    return jobs
+
+
+def fetch_fixtures(directory):
+    """Save the current HTML of every configured career page"""
+    os.makedirs(directory, exist_ok=True)
+    for company in COMPANY_CAREERS:
+        try:
+            response = get_session().get(company['url'], headers={'User-Agent': USER_AGENT}, timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Skipping {company['name']}: {e}")
+            continue
+        path = os.path.join(directory, f"{slugify(company['name'])}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Saved {path} ({len(response.text) / 1024:.0f} KB)")
+
+
+def time_parse(parse, html, company, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        jobs = parse(html, company)
+    return (time.perf_counter() - start) / repeat, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark career page parsing")
+    parser.add_argument('directory', nargs='?', default=FIXTURE_DIR)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--fetch', action='store_true', help="Save live career pages as fixtures first")
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_fixtures(args.directory)
+
+    paths = sorted(glob.glob(os.path.join(args.directory, '*.html')))
+    if not paths:
+        print(f"No fixtures in {args.directory}; run with --fetch to save some")
+        return
+
+    companies = {slugify(c['name']): c for c in COMPANY_CAREERS}
+    print(f"{'fixture':<28} {'KB':>6} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}  same jobs")
+
+    total_old = total_new = 0.0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        slug = os.path.splitext(os.path.basename(path))[0]
+        company = companies.get(slug, {'name': slug, 'url': 'https://example.com/careers/', 'keywords': []})
+
+        old_time, old_jobs = time_parse(legacy_parse, html, company, args.repeat)
+        new_time, new_jobs = time_parse(parse_company_page, html, company, args.repeat)
+        total_old += old_time
+        total_new += new_time
+
+        same = [(j['title'], j['link']) for j in old_jobs] == [(j['title'], j['link']) for j in new_jobs]
+        print(f"{slug:<28} {len(html) / 1024:6.0f} {old_time * 1000:10.1f} {new_time * 1000:8.1f} "
+              f"{old_time / new_time:7.1f}x  {'yes' if same else 'NO'}")
+
+    print(f"\n{'total':<28} {'':>6} {total_old * 1000:10.1f} {total_new * 1000:8.1f} {total_old / total_new:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,96 +1,248 @@
 """Company Career Pages Scraper"""
+import argparse
+import json
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+import threading
 import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
 import logging
 
 from config import COMPANY_CAREERS, JOB_CRITERIA
+from http_cache import ValidatorStore, conditional_get, get_session
+from job_details import iter_with_descriptions
+from job_store import write_jobs
+from structured_sources import iter_structured_jobs
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def fetch_company_jobs() -> List[Dict]:
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+MAX_WORKERS = 8          # companies fetched in parallel
+HOST_DELAY = 2.0         # minimum seconds between requests to one host
+MAX_PER_HOST = 1         # concurrent requests allowed per host
+PARSER_VERSION = 2       # bump when extraction changes so cached parses are redone
+
+
+class HostScheduler:
     """
-    Fetch jobs from company career pages.
+    Per-host politeness scheduler.
     
-    Returns:
-        List of job dictionaries
+    Different hosts are fetched in parallel, while requests to the same host
+    are capped at `max_per_host` in flight and spaced by the larger of
+    `delay` and the host's robots.txt Crawl-delay.
     """
-    all_jobs = []
     
-    for company in COMPANY_CAREERS:
-        logger.info(f"Scraping {company['name']}...")
-        
+    def __init__(self, delay: float = HOST_DELAY, max_per_host: int = MAX_PER_HOST,
+                 user_agent: str = USER_AGENT):
+        self.delay = delay
+        self.max_per_host = max_per_host
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._hosts = {}
+    
+    def _load_robots(self, host_url: str) -> Optional[RobotFileParser]:
         try:
-            jobs = scrape_company_page(company)
-            all_jobs.extend(jobs)
-            logger.info(f"Found {len(jobs)} jobs from {company['name']}")
-            
-            # Be polite - add delay between requests
-            time.sleep(2)
+            response = get_session().get(f"{host_url}/robots.txt", headers={'User-Agent': self.user_agent}, timeout=10)
+            if response.status_code != 200:
+                return None
+            robots = RobotFileParser()
+            robots.parse(response.text.splitlines())
+            return robots
+        except requests.RequestException:
+            return None
+    
+    def _host_state(self, url: str) -> Dict:
+        parsed = urlparse(url)
+        host_url = f"{parsed.scheme}://{parsed.netloc}"
+        
+        with self._lock:
+            state = self._hosts.get(parsed.netloc)
+            if state is None:
+                state = {
+                    'semaphore': threading.Semaphore(self.max_per_host),
+                    'ready': threading.Event(),
+                    'next_time': 0.0,
+                    'delay': self.delay,
+                    'robots': None
+                }
+                self._hosts[parsed.netloc] = state
+                owner = True
+            else:
+                owner = False
+        
+        # The first thread to see a host loads robots.txt; the rest wait for it
+        # (set even if loading fails, or the waiting threads would hang)
+        if owner:
+            try:
+                robots = self._load_robots(host_url)
+                if robots:
+                    crawl_delay = robots.crawl_delay(self.user_agent)
+                    if crawl_delay:
+                        state['delay'] = max(self.delay, float(crawl_delay))
+                    state['robots'] = robots
+            finally:
+                state['ready'].set()
+        else:
+            state['ready'].wait()
+        
+        return state
+    
+    def allowed(self, url: str) -> bool:
+        """Check robots.txt rules for this URL"""
+        robots = self._host_state(url)['robots']
+        return robots is None or robots.can_fetch(self.user_agent, url)
+    
+    @contextmanager
+    def slot(self, url: str):
+        """Hold a request slot for the URL's host, waiting out its delay first"""
+        state = self._host_state(url)
+        with state['semaphore']:
+            with self._lock:
+                start = max(time.monotonic(), state['next_time'])
+                state['next_time'] = start + state['delay']
+            wait = start - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+
+def iter_company_jobs(companies: List[Dict] = COMPANY_CAREERS,
+                      max_workers: int = MAX_WORKERS,
+                      scheduler: Optional[HostScheduler] = None,
+                      validators: Optional[ValidatorStore] = None) -> Iterator[Dict]:
+    """
+    Scrape company career pages concurrently, yielding jobs as each page finishes.
+    
+    Args:
+        companies: Company dictionaries with name, url, and keywords
+        max_workers: Number of pages fetched in parallel
+        scheduler: Per-host politeness scheduler (a fresh one by default)
+        validators: Conditional GET store (loaded from disk by default)
+    
+    Yields:
+        Job dictionaries
+    """
+    scheduler = scheduler or HostScheduler()
+    validators = validators or ValidatorStore()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(scrape_company_page, company, scheduler, validators): company
+                for company in companies
+            }
             
-        except Exception as e:
-            logger.error(f"Error scraping {company['name']}: {str(e)}")
-            continue
+            for future in as_completed(futures):
+                company = futures[future]
+                try:
+                    jobs = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping {company['name']}: {str(e)}")
+                    continue
+                
+                logger.info(f"Found {len(jobs)} jobs from {company['name']}")
+                yield from jobs
+    finally:
+        validators.save()
+        for host, stats in validators.stats.items():
+            logger.info(
+                f"{host}: {stats['not_modified']}/{stats['requests']} unchanged, "
+                f"{stats['bytes_saved'] / 1024:.0f} KB and {stats['seconds_saved']:.1f}s saved"
+            )
+
+
+def stream_company_jobs(fetch_descriptions: bool = True) -> Iterator[Dict]:
+    """
+    Stream jobs from company career pages, optionally with their descriptions.
     
+    Detail pages are fetched as soon as their listing page has been parsed,
+    sharing the listing scraper's per-host politeness scheduler.
+    
+    Yields:
+        Job dictionaries
+    """
+    scheduler = HostScheduler()
+    jobs = iter_company_jobs(scheduler=scheduler)
+    if fetch_descriptions:
+        jobs = iter_with_descriptions(jobs, scheduler=scheduler)
+    return jobs
+
+
+def fetch_company_jobs(fetch_descriptions: bool = True) -> List[Dict]:
+    """
+    Fetch jobs from company career pages.
+    
+    Args:
+        fetch_descriptions: Also fetch each job's detail page for its description
+    
+    Returns:
+        List of job dictionaries
+    """
+    all_jobs = list(stream_company_jobs(fetch_descriptions))
     logger.info(f"Total jobs found from company pages: {len(all_jobs)}")
     return all_jobs
 
 
-def scrape_company_page(company: Dict) -> List[Dict]:
+def scrape_company_page(company: Dict, scheduler: Optional[HostScheduler] = None,
+                        validators: Optional[ValidatorStore] = None) -> List[Dict]:
     """
     Scrape a single company career page.
     
     Args:
         company: Company dictionary with name, url, and keywords
+        scheduler: Per-host politeness scheduler; requests are unthrottled without one
+        validators: ETag/Last-Modified store; unchanged pages reuse the previous parse
     
     Returns:
         List of job dictionaries
     """
     jobs = []
+    url = company['url']
     
     try:
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         }
         
-        response = requests.get(company['url'], headers=headers, timeout=15)
-        response.raise_for_status()
+        if scheduler and not scheduler.allowed(url):
+            logger.warning(f"robots.txt disallows {url}, skipping {company['name']}")
+            return jobs
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        api = (company.get('profile') or {}).get('api')
+        if api and (not scheduler or scheduler.allowed(api['url'])):
+            try:
+                return list(iter_structured_jobs(company, scheduler, matches_criteria))
+            except Exception as e:
+                logger.warning(f"{company['name']} API failed ({str(e)}), falling back to the HTML page")
         
-        # Generic scraping - you'll need to customize selectors per company
-        # This is a template that works for many career pages
+        signature = parse_signature(company)
+        start = time.monotonic()
+        with scheduler.slot(url) if scheduler else nullcontext():
+            response = conditional_get(url, validators, signature, headers=headers, timeout=15)
         
-        # Try common job listing selectors
-        job_cards = (
-            soup.select('.job-listing') or
-            soup.select('.position') or
-            soup.select('[class*="job"]') or
-            soup.select('a[href*="/careers/"]') or
-            soup.select('a[href*="/jobs/"]')
-        )
+        if response.status_code == 304 and validators:
+            logger.info(f"{company['name']} unchanged since last run, reusing parsed jobs")
+            return validators.not_modified(url, time.monotonic() - start)
+        response.raise_for_status()
         
-        for card in job_cards[:50]:  # Limit to first 50 matches
-            title = extract_title(card)
-            link = extract_link(card, company['url'])
-            location = extract_location(card)
-            
-            if not title or not link:
-                continue
-            
-            # Filter by keywords and job titles
-            if matches_criteria(title, company.get('keywords', [])):
-                jobs.append({
-                    'company': company['name'],
-                    'title': title,
-                    'location': location or 'Munich',  # Default to Munich
-                    'link': link,
-                    'source': 'company_careers',
-                    'description': ''  # Could be fetched in a second pass
-                })
+        profile = compile_profile(company)
+        if profile:
+            # Later pages are only fetched when the first one changed; new
+            # postings show up on page one first
+            jobs = scrape_profile_pages(response, company, profile, scheduler)
+        else:
+            jobs = parse_company_page(response.text, company)
+        
+        if validators:
+            validators.update(url, response, signature, jobs, time.monotonic() - start)
         
     except Exception as e:
         logger.error(f"Error parsing {company['name']}: {str(e)}")
@@ -98,6 +250,239 @@ def scrape_company_page(company: Dict) -> List[Dict]:
     return jobs
 
 
+# Generic job listing selectors, most specific first
+GENERIC_SELECTORS = [
+    '.job-listing',
+    '.position',
+    '[class*="job"]',
+    'a[href*="/careers/"]',
+    'a[href*="/jobs/"]',
+]
+
+COMPILED_GENERIC_SELECTORS = [soupsieve.compile(sel) for sel in GENERIC_SELECTORS]
+
+MAX_CARDS_PER_PAGE = 50
+
+_profile_cache: Dict[str, Dict] = {}
+_profile_lock = threading.Lock()
+
+
+def compile_profile(company: Dict) -> Optional[Dict]:
+    """
+    Compile a company's extraction profile, once per process.
+    
+    Profiles are kept per company name under "company_profiles" in
+    shared_config.json and attached to COMPANY_CAREERS by both config modules.
+    Check one against a saved page with --check '<name>' page.html; the
+    profiles are tested against the listing markup in tests/fixtures/careers/,
+    and a profile that matches nothing on the live page is logged and replaced
+    by the generic cascade.
+    
+    A profile (the optional 'profile' key in COMPANY_CAREERS) has:
+        list:       selector matching one element per job
+        title:      selector for the title inside a list item (default: the item)
+        link:       selector for the element carrying the href (default: the item)
+        location:   selector for the location text (default: keyword search)
+        pagination: {'param': 'startrow', 'step': 25, 'max_pages': 4} to page
+                    through a query parameter, or {'next': 'a.next', 'max_pages': 4}
+                    to follow a "next page" link
+        api:        JSON search endpoint, if the site has one; used instead of
+                    the HTML page (see structured_sources)
+    
+    Returns:
+        Dictionary of compiled selectors, or None if the company has no profile
+    """
+    profile = company.get('profile')
+    if not profile or not profile.get('list'):
+        return None
+    
+    key = json.dumps([company['name'], profile], sort_keys=True)
+    with _profile_lock:
+        if key not in _profile_cache:
+            pagination = profile.get('pagination') or {}
+            _profile_cache[key] = {
+                field: soupsieve.compile(profile[field]) if profile.get(field) else None
+                for field in ('list', 'title', 'link', 'location')
+            }
+            _profile_cache[key]['next'] = soupsieve.compile(pagination['next']) if pagination.get('next') else None
+            _profile_cache[key]['pagination'] = pagination
+        return _profile_cache[key]
+
+
+def parse_with_profile(html: str, company: Dict, profile: Dict,
+                       page_url: Optional[str] = None) -> Tuple[List[Dict], int, Optional[str]]:
+    """
+    Extract jobs from a page using a compiled company profile.
+    
+    Args:
+        html: Page HTML
+        company: Company dictionary with name, url, and keywords
+        profile: Output of compile_profile
+        page_url: URL the HTML came from, for resolving relative links
+    
+    Returns:
+        (matching jobs, number of list items on the page, next page URL or None)
+    """
+    page_url = page_url or company['url']
+    soup = BeautifulSoup(html, 'lxml')
+    items = profile['list'].select(soup, limit=MAX_CARDS_PER_PAGE)
+    
+    jobs = []
+    for item in items:
+        title_el = profile['title'].select_one(item) if profile['title'] else item
+        link_el = profile['link'].select_one(item) if profile['link'] else item
+        location_el = profile['location'].select_one(item) if profile['location'] else None
+        
+        title = extract_title(title_el) if title_el else ''
+        link = extract_link(link_el, page_url) if link_el else ''
+        location = location_el.get_text(' ', strip=True) if location_el else extract_location(item)
+        
+        if title and link and matches_criteria(title, company.get('keywords', [])):
+            jobs.append({
+                'company': company['name'],
+                'title': title,
+                'location': location or 'Munich',
+                'link': link,
+                'source': 'company_careers',
+                'description': ''
+            })
+    
+    next_url = None
+    if profile['next']:
+        next_el = profile['next'].select_one(soup)
+        if next_el and next_el.get('href'):
+            next_url = urljoin(page_url, next_el['href'])
+    
+    return jobs, len(items), next_url
+
+
+def next_page_url(url: str, pagination: Dict, page: int) -> str:
+    """URL of page `page` (0-based) for a query-parameter pagination rule"""
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query))
+    query[pagination['param']] = str(pagination.get('start', 0) + page * pagination['step'])
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def scrape_profile_pages(response, company: Dict, profile: Dict,
+                         scheduler: Optional[HostScheduler] = None) -> List[Dict]:
+    """
+    Extract jobs with a company profile, following its pagination rule.
+    
+    Args:
+        response: Response for the first page
+        company: Company dictionary with name, url, keywords and profile
+        profile: Output of compile_profile
+        scheduler: Per-host politeness scheduler for the follow-up pages
+    
+    Returns:
+        List of job dictionaries
+    """
+    pagination = profile['pagination']
+    max_pages = pagination.get('max_pages', 1) if pagination else 1
+    
+    jobs, item_count, next_url = parse_with_profile(response.text, company, profile, response.url)
+    if not item_count:
+        logger.warning(f"Profile for {company['name']} matched no listings; its selectors may be stale, "
+                       f"falling back to the generic selectors")
+        return parse_company_page(response.text, company)
+    
+    page = 1
+    while item_count and page < max_pages:
+        if pagination.get('param'):
+            next_url = next_page_url(company['url'], pagination, page)
+        if not next_url:
+            break
+        if scheduler and not scheduler.allowed(next_url):
+            logger.warning(f"robots.txt disallows {next_url}, stopping {company['name']} pagination")
+            break
+        
+        with scheduler.slot(next_url) if scheduler else nullcontext():
+            page_response = get_session().get(next_url, headers={'User-Agent': USER_AGENT}, timeout=15)
+        page_response.raise_for_status()
+        
+        page_jobs, item_count, next_url = parse_with_profile(page_response.text, company, profile, next_url)
+        jobs.extend(page_jobs)
+        page += 1
+    
+    return jobs
+
+
+def is_candidate_region(name: str, attrs: Dict) -> bool:
+    """
+    Whether an element could hold a job card for GENERIC_SELECTORS.
+    Used while parsing so everything else on the page is never built into the tree.
+    """
+    classes = attrs.get('class', '')
+    if isinstance(classes, list):
+        classes = ' '.join(classes)
+    if 'job' in classes or 'position' in classes.split():
+        return True
+    href = attrs.get('href', '')
+    return name == 'a' and ('/careers/' in href or '/jobs/' in href)
+
+
+CANDIDATE_STRAINER = SoupStrainer(is_candidate_region)
+
+
+def parse_signature(company: Dict) -> str:
+    """
+    Fingerprint of everything that affects parsing besides the page itself.
+    A cached parse is only reused while this stays the same.
+    """
+    return json.dumps({
+        'parser': PARSER_VERSION,
+        'criteria': JOB_CRITERIA,
+        'name': company['name'],
+        'keywords': company.get('keywords', []),
+        'profile': company.get('profile')
+    }, sort_keys=True)
+
+
+def parse_company_page(html: str, company: Dict) -> List[Dict]:
+    """
+    Extract matching jobs from a career page's HTML.
+    
+    Args:
+        html: Page HTML
+        company: Company dictionary with name, url, and keywords
+    
+    Returns:
+        List of job dictionaries
+    """
+    jobs = []
+    
+    # Generic cascade for companies without a profile: parse only candidate
+    # job regions with lxml, then stop at the first selector that matches
+    soup = BeautifulSoup(html, 'lxml', parse_only=CANDIDATE_STRAINER)
+    job_cards = []
+    for selector in COMPILED_GENERIC_SELECTORS:
+        job_cards = selector.select(soup)
+        if job_cards:
+            break
+    
+    for card in job_cards[:MAX_CARDS_PER_PAGE]:
+        title = extract_title(card)
+        link = extract_link(card, company['url'])
+        location = extract_location(card)
+        
+        if not title or not link:
+            continue
+        
+        # Filter by keywords and job titles
+        if matches_criteria(title, company.get('keywords', [])):
+            jobs.append({
+                'company': company['name'],
+                'title': title,
+                'location': location or 'Munich',  # Default to Munich
+                'link': link,
+                'source': 'company_careers',
+                'description': ''  # Filled in by job_details.iter_with_descriptions
+            })
+    
+    return jobs
+
+
 def extract_title(element) -> str:
     """
     Extract job title from an element.
@@ -125,11 +510,9 @@ def extract_link(element, base_url: str) -> str:
         if a_tag:
             link = a_tag.get('href', '')
     
-    # Make absolute URL
+    # Make absolute URL (resolved like a browser would, so detail pages can be fetched)
     if link and not link.startswith('http'):
-        base = base_url.rstrip('/')
-        link = link.lstrip('/')
-        link = f"{base}/{link}"
+        link = urljoin(base_url, link)
     
     return link
 
@@ -181,30 +564,51 @@ def matches_criteria(title: str, keywords: List[str]) -> bool:
     return matches >= 1
 
 
-# Company-specific scrapers (optional - for better results)
-
-def scrape_bmw(url: str) -> List[Dict]:
-    """
-    BMW-specific scraper.
-    Customize based on BMW careers page structure.
-    """
-    # TODO: Implement BMW-specific logic
-    pass
-
-
-def scrape_siemens(url: str) -> List[Dict]:
+def check_profile(company_name: str, fixture_path: str) -> List[Dict]:
     """
-    Siemens-specific scraper.
+    Run a company's extraction against a stored HTML fixture.
+    
+    Args:
+        company_name: Name as listed in COMPANY_CAREERS
+        fixture_path: Saved copy of the company's career page
+    
+    Returns:
+        Jobs extracted from the fixture (profile if configured and it matches, else generic)
     """
-    # TODO: Implement Siemens-specific logic
-    pass
+    company = next(c for c in COMPANY_CAREERS if c['name'].lower() == company_name.lower())
+    with open(fixture_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    
+    profile = compile_profile(company)
+    if not profile:
+        return parse_company_page(html, company)
+    
+    jobs, item_count, _ = parse_with_profile(html, company, profile)
+    logger.info(f"{company['name']} profile matched {item_count} listings, {len(jobs)} after keyword filter")
+    if not item_count:
+        logger.warning(f"Profile for {company['name']} matched nothing, using the generic selectors")
+        return parse_company_page(html, company)
+    return jobs
 
 
 if __name__ == '__main__':
-    # Test the scraper
-    jobs = fetch_company_jobs()
-    print(f"Found {len(jobs)} jobs")
+    parser = argparse.ArgumentParser(description="Scrape company career pages")
+    parser.add_argument('--check', nargs=2, metavar=('COMPANY', 'FIXTURE'),
+                        help="Test a company's extraction against a saved HTML page")
+    args = parser.parse_args()
+    
+    if args.check:
+        for job in check_profile(*args.check):
+            print(f"{job['title']} | {job['location']} | {job['link']}")
+        raise SystemExit
+    
+    # Run the scraper, writing jobs as their descriptions arrive
+    def report(jobs):
+        for job in jobs:
+            print(f"\n{job['company']}: {job['title']}")
+            print(f"Link: {job['link']}")
+            print(f"Description: {len(job['description'])} chars")
+            yield job
     
-    for job in jobs[:5]:
-        print(f"\n{job['company']}: {job['title']}")
-        print(f"Link: {job['link']}")
+    count = write_jobs('company_jobs', report(stream_company_jobs()))
+    print(f"\nFound {count} jobs, saved to data/company_jobs.jsonl")
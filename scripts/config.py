@@ -1,4 +1,11 @@
 """Configuration for job search automation"""
+import json
+import os
+
+# Settings shared with the top-level config.py
+with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared_config.json'),
+          encoding='utf-8') as f:
+    SHARED_CONFIG = json.load(f)
 
 # Job search criteria
 JOB_CRITERIA = {
@@ -28,6 +35,7 @@ JOB_CRITERIA = {
     ],
     'locations': ['Munich, Germany', 'München, Germany'],
     'experience_level': ['entry', 'junior', '0-2 years'],
+    'exclude_keywords': SHARED_CONFIG['exclude_keywords'],
     'max_jobs_per_run': 50
 }
 
@@ -35,12 +43,12 @@ JOB_CRITERIA = {
 COMPANY_CAREERS = [
     {
         'name': 'BMW Group',
-        'url': 'https://www.bmwgroup.jobs/de/de/opportunities.html',
+        'url': 'https://www.bmwgroup.jobs/de/de/jobfinder.html?location=Munich',
         'keywords': ['project', 'data', 'analyst']
     },
     {
         'name': 'Siemens',
-        'url': 'https://jobs.siemens.com/careers',
+        'url': 'https://jobs.siemens.com/careers?location=Munich',
         'keywords': ['project', 'data', 'analyst', 'PMO']
     },
     {
@@ -55,7 +63,17 @@ COMPANY_CAREERS = [
     },
     {
         'name': 'SAP',
-        'url': 'https://jobs.sap.com/',
+        'url': 'https://jobs.sap.com/search/?locationsearch=Munich',
         'keywords': ['project', 'data', 'analyst']
+    },
+    {
+        'name': 'Microsoft',
+        'url': 'https://careers.microsoft.com/professionals/us/en/search-results?location=Munich',
+        'keywords': ['project', 'data', 'analyst', 'program manager']
     }
 ]
+
+# Per-company selector profiles (see company_scraper.compile_profile)
+for company in COMPANY_CAREERS:
+    if company['name'] in SHARED_CONFIG['company_profiles']:
+        company['profile'] = SHARED_CONFIG['company_profiles'][company['name']]
@@ -0,0 +1,214 @@
+"""Cross-source job deduplication.
+
+The same role often arrives from both the LinkedIn feed and a company career
+page, with different URLs and slightly different titles. This stage merges
+such duplicates before ranking so each role is scored and tailored once.
+
+Exact duplicates share a canonical URL. Near-duplicates are found with
+MinHash signatures over the normalized title and company, bucketed by an LSH
+index so only jobs sharing a band are ever compared, and then verified on
+title, company and description containment against every member of both
+clusters (no transitive chaining).
+
+Usage:
+    python scripts/dedup.py   # merge the raw_jobs and company_jobs stores into raw_jobs
+"""
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+
+from job_store import load_jobs, write_jobs
+from seen_jobs import canonical_url
+
+NUM_PERM = 64
+BANDS = 16               # 16 bands x 4 rows: pairs above ~0.5 similarity collide
+ROWS = NUM_PERM // BANDS
+TITLE_THRESHOLD = 0.6    # token Jaccard between normalized titles
+DESCRIPTION_THRESHOLD = 0.5  # shingle containment, so a truncated copy still matches the full text
+
+MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.RandomState(42)
+PERM_A = _rng.randint(1, 1 << 31, NUM_PERM).astype(np.uint64)
+PERM_B = _rng.randint(0, 1 << 31, NUM_PERM).astype(np.uint64)
+
+# Gender markers and legal suffixes that differ between sources for one role
+TITLE_NOISE = re.compile(r"\((?:[mwfdx]\s*/\s*)+[mwfdx]\)|\b(?:all genders?|m/w/d|w/m/d|f/m/d|m/f/d)\b", re.I)
+COMPANY_NOISE = re.compile(r"\b(?:gmbh|ag|se|kg|co|inc|ltd|llc|group|technologies|& co)\b\.?", re.I)
+WORD_RE = re.compile(r"[\w+#]+")
+
+# Title words that make otherwise similar titles different roles
+SENIORITY_WORDS = {"junior", "senior", "lead", "principal", "head", "intern", "internship",
+                   "trainee", "werkstudent", "praktikant", "praktikum", "working", "student"}
+
+
+def normalize_title(title):
+    return " ".join(WORD_RE.findall(TITLE_NOISE.sub(" ", title or "").lower()))
+
+
+def normalize_company(company):
+    return " ".join(WORD_RE.findall(COMPANY_NOISE.sub(" ", (company or "").lower())))
+
+
+def shingles(job):
+    """Title unigrams/bigrams plus the company, as the LSH key set"""
+    words = normalize_title(job.get("title")).split()
+    company = normalize_company(job.get("company"))
+    items = {f"t:{w}" for w in words}
+    items |= {f"t:{a} {b}" for a, b in zip(words, words[1:])}
+    items.add(f"c:{company}")
+    return items
+
+
+def description_shingles(job, size=3):
+    words = WORD_RE.findall((job.get("description") or "").lower())
+    return {" ".join(words[i:i + size]) for i in range(max(0, len(words) - size + 1))}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def containment(a, b):
+    """Share of the smaller set found in the larger one: 1.0 when one text is a truncation of the other"""
+    return len(a & b) / min(len(a), len(b)) if a and b else 1.0
+
+
+def minhash(items):
+    """MinHash signature of a shingle set"""
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in items],
+        dtype=np.uint64
+    )
+    return ((np.outer(hashes, PERM_A) + PERM_B) % MERSENNE_PRIME).min(axis=0)
+
+
+def candidate_pairs(signatures):
+    """Pairs of indices sharing at least one LSH band"""
+    buckets = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        for band in range(BANDS):
+            buckets[(band, sig[band * ROWS:(band + 1) * ROWS].tobytes())].append(i)
+
+    pairs = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pairs.add((members[x], members[y]))
+    return pairs
+
+
+def is_near_duplicate(a, b):
+    """Verify an LSH candidate pair on the actual fields"""
+    if normalize_company(a.get("company")) != normalize_company(b.get("company")):
+        return False
+    title_a = set(normalize_title(a.get("title")).split())
+    title_b = set(normalize_title(b.get("title")).split())
+    if jaccard(title_a, title_b) < TITLE_THRESHOLD:
+        return False
+    if title_a & SENIORITY_WORDS != title_b & SENIORITY_WORDS:
+        return False
+    # LinkedIn descriptions are cut to 500 chars while career pages give the full
+    # text, so compare by containment rather than Jaccard. A missing description
+    # (e.g. not yet fetched) can't contradict the match.
+    return containment(description_shingles(a), description_shingles(b)) >= DESCRIPTION_THRESHOLD
+
+
+def provenance(job):
+    """Where a record came from; merged records carry one entry per source"""
+    if job.get("sources"):
+        return job["sources"]
+    return [{
+        "source": job.get("source"),
+        "url": job.get("url") or job.get("link"),
+        "title": job.get("title"),
+        "company": job.get("company")
+    }]
+
+
+def merge_records(records):
+    """Merge duplicates: richest record wins, gaps filled from the others"""
+    records = sorted(records, key=lambda j: len(j.get("description") or ""), reverse=True)
+    merged = dict(records[0])
+    for other in records[1:]:
+        for key, value in other.items():
+            if value and not merged.get(key):
+                merged[key] = value
+
+    sources, seen_urls = [], set()
+    for record in records:
+        for entry in provenance(record):
+            if entry["url"] not in seen_urls:
+                seen_urls.add(entry["url"])
+                sources.append(entry)
+    merged["sources"] = sources
+    return merged
+
+
+def deduplicate(jobs):
+    """
+    Merge exact and near-duplicate jobs.
+
+    Returns (merged jobs, stats dict).
+    """
+    parent = list(range(len(jobs)))
+    members = {i: [i] for i in range(len(jobs))}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        parent[root_i] = root_j
+        members[root_j] += members.pop(root_i)
+
+    # Exact: same canonical URL
+    by_url = {}
+    exact = 0
+    for i, job in enumerate(jobs):
+        for entry in provenance(job):
+            key = canonical_url(entry["url"])
+            if not key:
+                continue
+            if key in by_url and find(by_url[key]) != find(i):
+                union(i, by_url[key])
+                exact += 1
+            by_url.setdefault(key, i)
+
+    # Near: LSH candidates verified on title/company/description. Every member
+    # of both clusters must match, so A~B and B~C never pull in an unrelated C.
+    signatures = [minhash(shingles(job)) for job in jobs]
+    near = 0
+    for i, j in sorted(candidate_pairs(signatures)):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j or not is_near_duplicate(jobs[i], jobs[j]):
+            continue
+        if all(is_near_duplicate(jobs[x], jobs[y]) for x in members[root_i] for y in members[root_j]):
+            union(i, j)
+            near += 1
+
+    clusters = defaultdict(list)
+    for i, job in enumerate(jobs):
+        clusters[find(i)].append(job)
+
+    merged = [merge_records(group) if len(group) > 1 else group[0] for group in clusters.values()]
+    stats = {"input": len(jobs), "output": len(merged), "exact": exact, "near": near}
+    return merged, stats
+
+
+def main():
+    jobs = load_jobs("raw_jobs") + load_jobs("company_jobs")
+    merged, stats = deduplicate(jobs)
+    write_jobs("raw_jobs", merged)
+
+    print(f"✅ {stats['input']} jobs -> {stats['output']} unique "
+          f"({stats['exact']} exact URL duplicates, {stats['near']} near-duplicates merged)")
+    print("📁 Saved to: data/raw_jobs.jsonl")
+
+
+if __name__ == "__main__":
+    main()
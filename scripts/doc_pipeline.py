@@ -0,0 +1,114 @@
+"""Parallel document generation with shared rate limiting and checkpoints.
+
+Each job needs several independent LLM calls (tailored resume, cover
+letter). DocumentPipeline runs all of them on one bounded thread pool, so a
+job's documents are generated in parallel with each other and with other
+jobs, while one shared RateLimiter keeps the combined request and token rate
+within the account limits. Each finished document is recorded in a
+checkpoint file straight away; rerunning after a failure only generates the
+documents that are still missing.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rate_limit import RateLimiter
+from scoring_engine import REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE
+
+DOC_CONCURRENCY = int(os.getenv("DOC_CONCURRENCY", 6))
+CHECKPOINT_PATH = "data/doc_checkpoint.json"
+
+
+class DocumentPipeline:
+    """Generates every document for every job on a bounded worker pool"""
+
+    def __init__(self, generators, save, checkpoint_path=CHECKPOINT_PATH,
+                 max_workers=DOC_CONCURRENCY, limiter=None):
+        """
+        Args:
+            generators: {doc_name: (generate(job) -> text, estimate(job) -> tokens)}
+            save: save(key, job, doc_name, text) -> path of the written document
+            checkpoint_path: JSON file recording the documents already written
+            max_workers: LLM calls in flight at once
+            limiter: RateLimiter shared by all workers
+        """
+        self.generators = generators
+        self.save = save
+        self.checkpoint_path = checkpoint_path
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+        self._lock = threading.Lock()
+        try:
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                self.checkpoint = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.checkpoint = {}
+
+    def done(self, key, doc_name):
+        path = self.checkpoint.get(key, {}).get(doc_name)
+        return path if path and os.path.exists(path) else None
+
+    def _save_checkpoint(self):
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _generate(self, key, job, doc_name):
+        generate, estimate = self.generators[doc_name]
+        self.limiter.wait(estimate(job))
+        path = self.save(key, job, doc_name, generate(job))
+        with self._lock:
+            self.checkpoint.setdefault(key, {})[doc_name] = path
+            self._save_checkpoint()
+        return path
+
+    def run(self, jobs, on_job_done=None):
+        """
+        Generate all missing documents.
+
+        Args:
+            jobs: List of (key, job) pairs; key identifies the job in the checkpoint
+            on_job_done: Called as on_job_done(key, job, paths, errors) on the
+                calling thread once all of a job's documents have finished
+
+        Returns:
+            Dictionary of key -> {"paths": {doc: path}, "errors": {doc: exception}}
+        """
+        results = {key: {"paths": {}, "errors": {}} for key, _ in jobs}
+        remaining = {}
+
+        def finish(key, job):
+            if on_job_done:
+                on_job_done(key, job, results[key]["paths"], results[key]["errors"])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for key, job in jobs:
+                remaining[key] = 0
+                for doc_name in self.generators:
+                    path = self.done(key, doc_name)
+                    if path:
+                        results[key]["paths"][doc_name] = path
+                    else:
+                        futures[executor.submit(self._generate, key, job, doc_name)] = (key, job, doc_name)
+                        remaining[key] += 1
+                if not remaining[key]:
+                    finish(key, job)
+
+            for future in as_completed(futures):
+                key, job, doc_name = futures[future]
+                try:
+                    results[key]["paths"][doc_name] = future.result()
+                except Exception as e:
+                    results[key]["errors"][doc_name] = e
+                remaining[key] -= 1
+                if not remaining[key]:
+                    finish(key, job)
+
+        # Nothing left to resume once every document exists
+        if not any(r["errors"] for r in results.values()) and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return results
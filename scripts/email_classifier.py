@@ -0,0 +1,74 @@
+"""Email classifier.
+
+classify_email checks keywords strongest first (KEYWORD_PRIORITY) and stops
+at the first match, so a specific phrase such as 'other candidates' decides
+before a weak word such as 'meeting'. Each check is a plain substring scan,
+which in CPython beats one combined regex over the whole email. The
+extraction patterns for company and position are compiled at import.
+"""
+import re
+
+# Email keywords for classification
+EMAIL_KEYWORDS = {
+    "interview": ["interview", "phone screen", "call you", "speak with you", "meeting", "zoom", "teams"],
+    "rejection": ["unfortunately", "not moving forward", "decided to", "other candidates", "not selected"],
+    "offer": ["offer", "congratulations", "pleased to offer", "job offer"],
+    "received": ["received your application", "thank you for applying", "application received"]
+}
+
+# Keywords that appear in many unrelated emails are checked last; specific phrases first
+KEYWORD_WEIGHTS = {
+    "meeting": 0.5, "zoom": 0.5, "teams": 0.5, "decided to": 0.5, "offer": 0.5,
+    "phone screen": 2.0, "not moving forward": 2.0, "other candidates": 2.0, "not selected": 2.0,
+    "pleased to offer": 2.0, "job offer": 2.0,
+}
+
+# Status per category, in tie-break order
+CATEGORY_STATUS = {
+    "interview": "Interview Scheduled",
+    "rejection": "Rejected",
+    "offer": "Offer Received",
+    "received": "Application Received"
+}
+
+KEYWORD_CATEGORY = {
+    keyword: category for category, keywords in EMAIL_KEYWORDS.items() for keyword in keywords
+}
+# (keyword, status), highest weight first and in CATEGORY_STATUS order within a weight
+KEYWORD_PRIORITY = [
+    (keyword, CATEGORY_STATUS[KEYWORD_CATEGORY[keyword]])
+    for keyword in sorted(KEYWORD_CATEGORY, key=lambda k: -KEYWORD_WEIGHTS.get(k, 1.0))
+]
+
+EXTRACTION_PATTERNS = [
+    re.compile(r'(position|role|opportunity)\s+(?:of|as|for)?\s+([\w\s]+)\s+at\s+([\w\s]+)', re.IGNORECASE),
+    # The leftmost match always starts a run of word/space characters, so only try
+    # there; otherwise every position in a long body is a fresh quadratic attempt
+    re.compile(r'(?<![\w\s])([\w\s]+)\s+-\s+([\w\s]+)\s+position', re.IGNORECASE),
+    re.compile(r'application\s+for\s+([\w\s]+)\s+at\s+([\w\s]+)', re.IGNORECASE),
+]
+
+
+def classify_email(subject, body):
+    """Classify email type by the strongest keyword it contains (KEYWORD_PRIORITY order)"""
+    text = f"{subject} {body}".lower()
+    for keyword, status in KEYWORD_PRIORITY:
+        if keyword in text:
+            return status
+    return None
+
+
+def extract_company_position(subject, body):
+    """Try to extract company name and position from email"""
+    text = f"{subject} {body}"
+
+    for pattern in EXTRACTION_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            groups = match.groups()
+            return {
+                'position': groups[-2].strip(),
+                'company': groups[-1].strip()
+            }
+
+    return None
@@ -0,0 +1,264 @@
+"""Local fake of the Gmail API for offline testing and benchmarking.
+
+Mimics the call shape of the googleapiclient Gmail service that
+monitor_email uses (messages list/get/batchModify, history list,
+getProfile and batch HTTP requests), backed by an in-memory mailbox. Every
+round trip sleeps for a configurable latency and is counted, so sync
+strategies can be compared by round trips as well as wall time.
+
+Usage:
+    python scripts/fake_gmail_service.py --messages 300 --new 20
+"""
+import argparse
+import base64
+import random
+import tempfile
+import time
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+JOB_EMAILS = [
+    ("noreply@{domain}", "Your application for Data Analyst at {company}",
+     "Thank you for applying. We have received your application for Data Analyst at {company}."),
+    ("recruiting@{domain}", "Interview invitation", "We would like to schedule an interview for the position of "
+     "Data Scientist at {company}. Please pick a slot for a zoom call."),
+    ("careers@{domain}", "Update on your application for ML Engineer at {company}",
+     "Unfortunately we have decided to move forward with other candidates."),
+]
+OTHER_EMAILS = [
+    ("newsletter@shop.example", "Weekly deals", "Save 20% on everything this week."),
+    ("friend@example.com", "Dinner on Friday?", "Are you free on Friday evening?"),
+    ("github@example.com", "New sign-in to your account", "We noticed a new sign-in."),
+]
+COMPANIES = ["BMW", "Siemens", "SAP", "Allianz", "Infineon"]
+
+
+def paginate(items, page_token, page_size, key, render):
+    start = int(page_token or 0)
+    response = {key: [render(item) for item in items[start:start + page_size]]}
+    if start + page_size < len(items):
+        response['nextPageToken'] = str(start + page_size)
+    return response
+
+
+def http_error(status, reason):
+    return HttpError(httplib2.Response({'status': status, 'reason': reason}), reason.encode('utf-8'))
+
+
+class FakeRequest:
+    """A deferred API call; execute() costs one round trip"""
+
+    def __init__(self, service, handler, **params):
+        self.service = service
+        self.handler = handler
+        self.params = params
+
+    def run(self):
+        return self.handler()
+
+    def execute(self):
+        self.service.round_trip()
+        return self.run()
+
+
+class FakeBatch:
+    """Batch HTTP request: all added calls share one round trip"""
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback or self.callback))
+
+    def execute(self):
+        self.service.round_trip()
+        for request_id, request, callback in self.requests:
+            self.service.stats['calls'] += 1
+            try:
+                if random.random() < self.service.error_rate:
+                    raise http_error(429, 'Rate Limit Exceeded')
+                callback(request_id, request.run(), None)
+            except HttpError as e:
+                callback(request_id, None, e)
+
+
+class FakeGmailService:
+    """In-memory mailbox behind a googleapiclient-style Gmail interface"""
+
+    def __init__(self, latency=0.05, error_rate=0.0, history_retention=1000):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.history_retention = history_retention
+        self.mailbox = {}
+        self.changes = []       # (history_id, message_id), one per message added
+        self.history_id = 1000
+        self.stats = {'round_trips': 0, 'calls': 0, 'full_gets': 0, 'metadata_gets': 0}
+
+    def round_trip(self):
+        self.stats['round_trips'] += 1
+        time.sleep(self.latency)
+
+    # --- mailbox setup ---
+
+    def add_message(self, sender, subject, body, unread=True):
+        self.history_id += 1
+        message_id = f"m{self.history_id}"
+        self.mailbox[message_id] = {
+            'id': message_id,
+            'threadId': message_id,
+            'labelIds': ['INBOX'] + (['UNREAD'] if unread else []),
+            'snippet': body[:100],
+            'historyId': str(self.history_id),
+            'payload': {
+                'mimeType': 'text/plain',
+                'headers': [{'name': 'From', 'value': sender}, {'name': 'Subject', 'value': subject}],
+                'body': {'data': base64.urlsafe_b64encode(body.encode('utf-8')).decode('ascii')}
+            }
+        }
+        self.changes.append((self.history_id, message_id))
+        return message_id
+
+    def seed(self, count, job_ratio=0.3):
+        """Add `count` messages, about job_ratio of them job-related"""
+        for _ in range(count):
+            company = random.choice(COMPANIES)
+            template = random.choice(JOB_EMAILS if random.random() < job_ratio else OTHER_EMAILS)
+            domain = f"{company.lower()}.example"
+            sender, subject, body = (part.format(company=company, domain=domain) for part in template)
+            self.add_message(sender, subject, body)
+
+    # --- googleapiclient-style interface ---
+
+    def users(self):
+        return FakeUsers(self)
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+
+class FakeUsers:
+    def __init__(self, service):
+        self.service = service
+
+    def getProfile(self, userId):
+        return FakeRequest(self.service, lambda: {'emailAddress': 'me@example.com',
+                                                  'historyId': str(self.service.history_id)})
+
+    def messages(self):
+        return FakeMessages(self.service)
+
+    def history(self):
+        return FakeHistory(self.service)
+
+
+class FakeMessages:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, userId, q='', maxResults=100, pageToken=None):
+        # Only 'is:unread' is honoured; the other query terms are treated as matching
+        def handler():
+            ids = [m for m, message in self.service.mailbox.items()
+                   if 'is:unread' not in q or 'UNREAD' in message['labelIds']]
+            return paginate(ids, pageToken, maxResults, 'messages', lambda m: {'id': m, 'threadId': m})
+        return FakeRequest(self.service, handler, userId=userId, q=q, maxResults=maxResults)
+
+    def list_next(self, request, response):
+        if 'nextPageToken' not in response:
+            return None
+        return self.list(pageToken=response['nextPageToken'], **request.params)
+
+    def get(self, userId, id, format='full', metadataHeaders=None):
+        def handler():
+            message = self.service.mailbox.get(id)
+            if message is None:
+                raise http_error(404, 'Not Found')
+            if format == 'metadata':
+                self.service.stats['metadata_gets'] += 1
+                headers = [h for h in message['payload']['headers']
+                           if not metadataHeaders or h['name'] in metadataHeaders]
+                return {**message, 'payload': {'mimeType': message['payload']['mimeType'], 'headers': headers}}
+            self.service.stats['full_gets'] += 1
+            return message
+        return FakeRequest(self.service, handler)
+
+    def batchModify(self, userId, body):
+        def handler():
+            for message_id in body.get('ids', []):
+                labels = self.service.mailbox[message_id]['labelIds']
+                labels[:] = [l for l in labels if l not in body.get('removeLabelIds', [])]
+                labels.extend(l for l in body.get('addLabelIds', []) if l not in labels)
+            return {}
+        return FakeRequest(self.service, handler)
+
+
+class FakeHistory:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, userId, startHistoryId, historyTypes=None, maxResults=100, pageToken=None):
+        def handler():
+            start = int(startHistoryId)
+            oldest = self.service.history_id - self.service.history_retention
+            if start < oldest:
+                raise http_error(404, 'Requested entity was not found.')
+            changes = [(h, m) for h, m in self.service.changes if h > start]
+            response = paginate(changes, pageToken, maxResults, 'history', lambda change: {
+                'id': str(change[0]),
+                'messagesAdded': [{'message': {'id': change[1], 'threadId': change[1]}}]
+            })
+            response['historyId'] = str(self.service.history_id)
+            return response
+        return FakeRequest(self.service, handler, userId=userId, startHistoryId=startHistoryId,
+                           historyTypes=historyTypes, maxResults=maxResults)
+
+    def list_next(self, request, response):
+        if 'nextPageToken' not in response:
+            return None
+        return self.list(pageToken=response['nextPageToken'], **request.params)
+
+
+def run_sync(service, state_path, label):
+    from monitor_email import sync_job_emails
+
+    before = dict(service.stats)
+    start = time.perf_counter()
+    updates = sync_job_emails(service, state_path=state_path)
+    elapsed = time.perf_counter() - start
+    delta = {k: service.stats[k] - before[k] for k in service.stats}
+    delta['updates'] = len(updates)
+    print(f"{label:<18} {delta['round_trips']:>11} {delta['metadata_gets']:>9} {delta['full_gets']:>9} "
+          f"{len(updates):>8} {elapsed:>8.2f}s")
+    return delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gmail sync against a local fake mailbox")
+    parser.add_argument('--messages', type=int, default=300, help="Messages in the mailbox at the first sync")
+    parser.add_argument('--new', type=int, default=20, help="Messages arriving before the second sync")
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds per HTTP round trip")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of batched calls failing with 429")
+    args = parser.parse_args()
+
+    random.seed(0)
+    service = FakeGmailService(latency=args.latency, error_rate=args.error_rate)
+    service.seed(args.messages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = f"{tmp}/gmail_state.json"
+        print(f"{'sync':<18} {'round trips':>11} {'metadata':>9} {'full':>9} {'updates':>8} {'time':>9}")
+        initial = run_sync(service, state_path, "initial (full)")
+        service.seed(args.new)
+        run_sync(service, state_path, f"incremental (+{args.new})")
+        run_sync(service, state_path, "incremental (+0)")
+
+    # The old loop: one list call, one full get per listed message, one modify per update
+    print(f"\nPer-message sync of the first mailbox would need about "
+          f"{1 + args.messages + initial['updates']} round trips")
+
+
+if __name__ == '__main__':
+    main()
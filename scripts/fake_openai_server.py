@@ -0,0 +1,150 @@
+"""Local fake of the OpenAI chat completions API for offline benchmarking.
+
+Serves /v1/chat/completions with a configurable response latency and rate of
+injected 429s, returning a deterministic match-score JSON for each prompt.
+Usage reports cached prompt tokens the way provider prefix caching would.
+
+Usage:
+    python scripts/fake_openai_server.py --port 8765            # serve only
+    python scripts/fake_openai_server.py --benchmark --jobs 50  # compare concurrency levels
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+
+from aiohttp import web
+
+from scoring_engine import ScoringEngine
+
+
+def fake_match_result(prompt):
+    """Deterministic pseudo-score derived from the prompt text"""
+    score = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % 101
+    return {
+        "match_score": score,
+        "reasoning": "Synthetic score from the fake OpenAI server",
+        "key_matches": ["python", "sql"],
+        "gaps": []
+    }
+
+
+def cached_prefix_tokens(seen, messages, block=128, minimum=1024):
+    """
+    Mimic provider prompt caching: the longest previously seen prefix, in
+    `block`-token steps, counts as cached once the prompt reaches `minimum` tokens.
+    """
+    text = "".join(f"{m['role']}\x1f{m['content']}\x1e" for m in messages)
+    cached = 0
+    for tokens in range(minimum, len(text) // 4 + 1, block):
+        digest = hashlib.sha256(text[:tokens * 4].encode("utf-8")).hexdigest()
+        if digest in seen:
+            cached = tokens
+        seen.add(digest)
+    return cached
+
+
+def create_app(latency=0.5, jitter=0.2, error_rate=0.0):
+    """Build the aiohttp app; latency/jitter are in seconds"""
+    app = web.Application()
+    app["stats"] = {"requests": 0, "throttled": 0}
+    app["prefixes"] = set()
+
+    async def chat_completions(request):
+        payload = await request.json()
+        app["stats"]["requests"] += 1
+
+        if random.random() < error_rate:
+            app["stats"]["throttled"] += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                status=429, headers={"Retry-After": "0.2"}
+            )
+
+        await asyncio.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        prompt = payload["messages"][-1]["content"]
+        job_ids = re.findall(r"^ID: (\S+)$", prompt, re.MULTILINE)
+        if job_ids:
+            # Batch prompt: one result per job posting, scored on its own section
+            sections = re.split(r"^ID: ", prompt, flags=re.MULTILINE)[1:]
+            content = json.dumps([
+                {"id": job_id, **fake_match_result(section)} for job_id, section in zip(job_ids, sections)
+            ])
+        else:
+            content = json.dumps(fake_match_result(prompt))
+        prompt_tokens = sum(len(m["content"]) // 4 for m in payload["messages"])
+        cached_tokens = cached_prefix_tokens(app["prefixes"], payload["messages"])
+        return web.json_response({
+            "id": f"chatcmpl-fake-{app['stats']['requests']}",
+            "object": "chat.completion",
+            "model": payload.get("model", "gpt-4"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        })
+
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    return app
+
+
+async def start_fake_server(port=0, **kwargs):
+    """Start the fake server in the running loop; returns (runner, base_url)"""
+    runner = web.AppRunner(create_app(**kwargs))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+async def benchmark(jobs, concurrency_levels, latency, error_rate):
+    """Time the scoring engine against the fake server at each concurrency level"""
+    runner, base_url = await start_fake_server(latency=latency, error_rate=error_rate)
+    requests = [
+        ([{"role": "user", "content": f"Job {i}: Data Analyst in Munich"}], 500)
+        for i in range(jobs)
+    ]
+
+    try:
+        for concurrency in concurrency_levels:
+            engine = ScoringEngine(concurrency=concurrency, requests_per_minute=10000,
+                                   tokens_per_minute=10_000_000, base_url=base_url, api_key="fake")
+            start = time.perf_counter()
+            results = await engine.run(requests)
+            elapsed = time.perf_counter() - start
+
+            failed = sum(1 for r in results if isinstance(r, Exception))
+            print(f"concurrency={concurrency:>3}  {elapsed:6.2f}s  "
+                  f"{jobs / elapsed:6.1f} jobs/s  retries={engine.stats['retries']}  failed={failed}")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI server for offline benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean response latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--benchmark", action="store_true", help="Run the scoring benchmark and exit")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 20])
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"Benchmarking {args.jobs} jobs at {args.latency}s latency, {args.error_rate:.0%} throttled\n")
+        asyncio.run(benchmark(args.jobs, args.concurrency, args.latency, args.error_rate))
+    else:
+        print(f"Fake OpenAI API on http://127.0.0.1:{args.port}/v1 (set OPENAI_BASE_URL to use it)")
+        web.run_app(create_app(args.latency, error_rate=args.error_rate), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
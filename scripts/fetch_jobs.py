@@ -1,26 +1,58 @@
 """Fetch jobs from Apify LinkedIn/Indeed scrapers"""
+import argparse
 import os
-import json
+from datetime import datetime
 from apify_client import ApifyClient
 import sys
 APIFY_API_KEY = os.getenv("APIFY_API_TOKEN")
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import JOB_CRITERIA
-def fetch_linkedin_jobs():
-    """Fetch jobs from LinkedIn via Apify"""
+from job_store import append_jobs, write_jobs
+from seen_jobs import SeenJobsIndex, query_key
+
+# LinkedIn "date posted" windows supported by the actor, smallest first
+PUBLISHED_WINDOWS = [(1, "r86400"), (7, "r604800"), (30, "r2592000")]
+
+def search_query():
+    """The LinkedIn search this script runs (also the cursor key)"""
+    return {
+        "keywords": " OR ".join(JOB_CRITERIA["job_titles"][:3]),  # First 3 titles
+        "locations": JOB_CRITERIA["locations"][:2]  # Munich, München
+    }
+
+def published_window(cursor):
+    """Smallest date-posted filter covering everything since the cursor date"""
+    if not cursor:
+        return None
+    try:
+        age_days = (datetime.now() - datetime.fromisoformat(cursor[:10])).days + 1
+    except ValueError:
+        return None
+    for days, window in PUBLISHED_WINDOWS:
+        if age_days <= days:
+            return window
+    return None
+
+def fetch_linkedin_jobs(cursor=None):
+    """Fetch jobs from LinkedIn via Apify, optionally only those posted since `cursor`"""
     print("🔍 Connecting to Apify...")
     client = ApifyClient(APIFY_API_KEY)
     
     # Using LinkedIn Jobs Scraper actor (misceres/linkedin-jobs-scraper)
     # Find more actors at: https://apify.com/store
     run_input = {
-        "keywords": " OR ".join(JOB_CRITERIA["job_titles"][:3]),  # First 3 titles
-        "locations": JOB_CRITERIA["locations"][:2],  # Munich, München
+        **search_query(),
         "maxItems": JOB_CRITERIA["max_jobs_per_run"]
     }
     
+    window = published_window(cursor)
+    if window:
+        run_input["publishedAt"] = window
+    
     print(f"📍 Searching for: {run_input['keywords']}")
     print(f"📍 Locations: {run_input['locations']}")
+    if window:
+        print(f"📍 Posted since: {cursor} ({window})")
     
     try:
         # Run the Apify actor
@@ -44,20 +76,45 @@ def fetch_linkedin_jobs():
         print(f"❌ Error fetching jobs: {e}")
         return []
 
-def main():
+def select_unseen(jobs, index):
+    """Keep only new or updated postings, recording everything in the index"""
+    fresh = []
+    for job in jobs:
+        if index.classify(job) != "unchanged":
+            fresh.append(job)
+    return fresh
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch LinkedIn jobs via Apify")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the seen-jobs index and pass every fetched job downstream")
+    args = parser.parse_args(argv)
+    
     print("\n" + "="*50)
     print("🤖 JOB FETCHER STARTING")
     print("="*50 + "\n")
     
-    jobs = fetch_linkedin_jobs()
+    index = SeenJobsIndex()
+    key = query_key(search_query())
+    
+    jobs = fetch_linkedin_jobs(cursor=None if args.full else index.cursor(key))
+    fetched = len(jobs)
+    
+    fresh = select_unseen(jobs, index)
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    append_jobs("job_history", ({**job, "fetched_at": fetched_at} for job in fresh))
+    index.advance_cursor(key, [job.get("posted_date") for job in jobs])
+    index.save()
+    
+    if not args.full:
+        jobs = fresh
     
-    # Save to data/raw_jobs.json
-    os.makedirs("data", exist_ok=True)
-    with open("data/raw_jobs.json", "w", encoding="utf-8") as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False)
+    write_jobs("raw_jobs", jobs)
     
-    print(f"\n✅ SUCCESS: Fetched {len(jobs)} jobs")
-    print(f"📁 Saved to: data/raw_jobs.json\n")
+    stats = index.stats
+    print(f"\n✅ SUCCESS: Fetched {fetched} jobs "
+          f"({stats['new']} new, {stats['updated']} updated, {stats['unchanged']} unchanged)")
+    print(f"📁 Saved {len(jobs)} jobs to: data/raw_jobs.jsonl\n")
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,23 @@
+import argparse
 import os
-import json
-from openai import OpenAI
-import PyPDF2
-from docx import Document
 
-# Get API keys
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+from doc_pipeline import DocumentPipeline
+from job_store import exists, job_key, load_jobs, update_jobs
+from llm_gateway import complete, export_metrics, format_metrics
+from prompts import cover_letter_messages, resume_delta_messages, resume_messages
+from rate_limit import estimate_tokens
+from resume_cache import load_resume, prompt_profile
+from resume_template import (
+    DELTA_MAX_TOKENS, RESUME_LAYOUTS, apply_delta, build_template, parse_delta,
+    render_docx, render_markdown, render_pdf, template_outline
+)
+
+# Documents generated per job, and the file each one is saved as
+# (template-delta resumes are rendered to resume.md/.docx/.pdf instead)
+DOCUMENT_FILES = {
+    "resume": "resume.txt",
+    "cover_letter": "cover_letter.txt"
+}
 
 # Resume formats by country
 RESUME_FORMATS = {
@@ -14,157 +26,139 @@ RESUME_FORMATS = {
     "UK": "2-page CV, no photo, detailed achievements"
 }
 
-def extract_text_from_file(file_path):
-    """Extract text from PDF or DOCX file"""
-    if file_path.endswith('.pdf'):
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-        return text
-    elif file_path.endswith('.docx'):
-        doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text
-    else:
-        raise ValueError("Unsupported file format. Use .pdf or .docx")
-
 def tailor_resume(resume_text, job_description, country="DE"):
     """Use OpenAI to tailor resume to job description"""
-    client = OpenAI(api_key=OPENAI_API_KEY)
     format_instructions = RESUME_FORMATS.get(country, RESUME_FORMATS["DE"])
-    
-    prompt = f"""You are an expert resume writer. Tailor this resume to match the job description.
-
-Resume Format Requirements ({country}):
-{format_instructions}
-
-Current Resume:
-{resume_text}
-
-Job Description:
-{job_description}
+    return complete("resume", resume_messages(resume_text, job_description, country, format_instructions))
 
-Create a tailored resume that:
-1. Highlights relevant skills and experiences
-2. Uses keywords from the job description
-3. Follows the {country} resume format
-4. Maintains truthfulness
-5. Is ATS-friendly
-
-Return only the tailored resume text."""
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.7
-    )
-    return response.choices[0].message.content
+def tailor_resume_delta(template, job_description, country="DE"):
+    """Ask OpenAI only for the tailored changes to a base resume template (JSON text)"""
+    format_instructions = RESUME_FORMATS.get(country, RESUME_FORMATS["DE"])
+    messages = resume_delta_messages(template_outline(template), job_description, country, format_instructions)
+    return complete("resume-delta", messages, max_tokens=DELTA_MAX_TOKENS, temperature=0.3, json_mode=True)
+
+def save_tailored_resume(template, delta_text, stem):
+    """Apply a resume delta to its template and render stem.md, stem.docx and stem.pdf locally"""
+    resume = apply_delta(template, parse_delta(delta_text))
+    path = f"{stem}.md"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_markdown(resume))
+    render_docx(resume, f"{stem}.docx")
+    render_pdf(resume, f"{stem}.pdf")
+    return path
 
 def generate_cover_letter(resume_text, job_description, company_name, country="DE"):
     """Generate cover letter using OpenAI"""
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    
-    prompt = f"""Write a compelling cover letter for this job application.
-
-Resume:
-{resume_text}
-
-Job Description:
-{job_description}
+    return complete("cover_letter", cover_letter_messages(resume_text, job_description, company_name, country))
 
-Company: {company_name}
-Country: {country}
+def country_code_for(job):
+    """Resume format code for a job's location"""
+    country = job.get("location", "DE").split(",")[-1].strip()
+    return "DE" if "Germany" in country or "Deutschland" in country else "UK" if "United Kingdom" in country else "US"
 
-Create a cover letter that:
-1. Is specific to the role and company
-2. Highlights relevant achievements
-3. Shows enthusiasm and cultural fit
-4. Follows {country} business writing conventions
-5. Is concise (max 350 words)
-
-Return only the cover letter text."""
+def process_jobs(full_rewrite=False):
+    """
+    Process ranked jobs and generate documents.
     
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.7
-    )
-    return response.choices[0].message.content
-
-def process_jobs():
-    """Process ranked jobs and generate documents"""
-    try:
-        with open("data/ranked_jobs.json", "r") as f:
-            jobs = json.load(f)
-    except FileNotFoundError:
+    By default resumes are generated as small JSON deltas against a base
+    template per country format and rendered locally; full_rewrite asks the
+    LLM for the complete resume text instead.
+    """
+    if not exists("ranked_jobs"):
         print("❌ Error: Run rank_jobs.py first")
         return
     
-    # Try to find resume file (supports .pdf or .docx)
-    resume_file = None
-    for filename in os.listdir("."):
-        if filename.endswith(('.pdf', '.docx')):
-            resume_file = filename
-            break
+    # Per-record updates can reorder the store, so rank again here
+    jobs = sorted(load_jobs("ranked_jobs"), key=lambda j: j.get("match_score", 0), reverse=True)
     
-    if not resume_file:
+    # Resume file (.pdf or .docx) is parsed once and cached until it changes
+    resume = load_resume()
+    if not resume:
         print("❌ Error: No resume file found (PDF or DOCX)")
         return
     
-    print(f"📄 Loading resume from {resume_file}")
-    resume_text = extract_text_from_file(resume_file)
+    resume_text = resume["text"]
     
     if not resume_text or len(resume_text) < 100:
         print("❌ Error: Resume text is too short or empty")
         return
     
-    print(f"✅ Resume loaded successfully ({len(resume_text)} characters)")
+    print(f"✅ Resume loaded from {resume['path']} ({len(resume_text)} characters, "
+          f"{len(resume['profile'].get('skills', []))} skills)")
     print(f"📄 Processing {len(jobs[:20])} top jobs...\n")
     
     os.makedirs("output", exist_ok=True)
     
-    for i, job in enumerate(jobs[:20], 1):
-        country = job.get("location", "DE").split(",")[-1].strip()
-        country_code = "DE" if "Germany" in country or "Deutschland" in country else "UK" if "United Kingdom" in country else "US"
-        
-        print(f"{i}. {job['title']} at {job['company']} ({country_code})")
-        
-        try:
-            # Generate tailored resume
-            tailored_resume = tailor_resume(resume_text, job["description"], country_code)
-            
-            # Generate cover letter
-            cover_letter = generate_cover_letter(
-                resume_text,
-                job["description"],
-                job["company"],
-                country_code
-            )
-            
-            # Save documents
-            job_id = f"{job['company'].replace(' ', '_')}_{i}"
-            os.makedirs(f"output/{job_id}", exist_ok=True)
-            
-            with open(f"output/{job_id}/resume.txt", "w", encoding="utf-8") as f:
-                f.write(tailored_resume)
-            
-            with open(f"output/{job_id}/cover_letter.txt", "w", encoding="utf-8") as f:
-                f.write(cover_letter)
-            
-            job["documents_generated"] = True
-            print(f"   ✅ Documents generated")
-            
-        except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
-            job["documents_generated"] = False
+    templates = {country: build_template(resume["profile"], country) for country in RESUME_LAYOUTS}
+    if not full_rewrite and not templates["DE"]["experience"]:
+        print("⚠️ No experience entries found in the resume, generating full resumes instead")
+        full_rewrite = True
+    
+    top_jobs = jobs[:20]
+    job_dirs = {}
+    doc_updates = {}
+    for i, job in enumerate(top_jobs, 1):
+        job["country_code"] = country_code_for(job)
+        job_dirs[job_key(job)] = f"output/{job['company'].replace(' ', '_')}_{i}"
+    
+    def save(key, job, doc_name, text):
+        os.makedirs(job_dirs[key], exist_ok=True)
+        if doc_name == "resume" and not full_rewrite:
+            return save_tailored_resume(templates[job["country_code"]], text, f"{job_dirs[key]}/resume")
+        path = f"{job_dirs[key]}/{DOCUMENT_FILES[doc_name]}"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
     
-    # Update jobs file
-    with open("data/ranked_jobs.json", "w") as f:
-        json.dump(jobs, f, indent=2)
+    def on_job_done(key, job, paths, errors):
+        job["documents_generated"] = not errors
+        if errors:
+            print(f"❌ {job['title']} at {job['company']}: {'; '.join(str(e) for e in errors.values())}")
+        else:
+            print(f"✅ {job['title']} at {job['company']} ({job['country_code']})")
+        doc_updates[key] = {"documents_generated": job["documents_generated"]}
+    
+    resume_tokens = estimate_tokens(resume_text)
+    profile_text = prompt_profile(resume)
+    profile_tokens = estimate_tokens(profile_text)
+    if full_rewrite:
+        resume_generator = (
+            lambda job: tailor_resume(resume_text, job["description"], job["country_code"]),
+            lambda job: 2 * resume_tokens + estimate_tokens(job["description"])
+        )
+    else:
+        resume_generator = (
+            lambda job: tailor_resume_delta(templates[job["country_code"]], job["description"], job["country_code"]),
+            lambda job: resume_tokens + estimate_tokens(job["description"]) + DELTA_MAX_TOKENS
+        )
+    
+    pipeline = DocumentPipeline(
+        {
+            "resume": resume_generator,
+            "cover_letter": (
+                lambda job: generate_cover_letter(profile_text, job["description"], job["company"], job["country_code"]),
+                lambda job: profile_tokens + estimate_tokens(job["description"]) + 500
+            )
+        },
+        save
+    )
+    try:
+        results = pipeline.run([(job_key(job), job) for job in top_jobs], on_job_done)
+    finally:
+        # One store update for the run; after a crash, the jobs finished so far are still recorded
+        update_jobs("ranked_jobs", doc_updates)
     
-    print(f"\n✅ Completed! Generated documents for {len(jobs[:20])} jobs")
+    generated = sum(1 for r in results.values() if not r["errors"])
+    print(f"\n✅ Completed! Generated documents for {generated}/{len(top_jobs)} jobs")
+    if generated < len(top_jobs):
+        print("   Rerun to retry the failed documents; finished ones are kept in data/doc_checkpoint.json")
+    if format_metrics():
+        print(f"\nLLM usage:\n{format_metrics()}")
+        export_metrics()
 
 if __name__ == "__main__":
-    process_jobs()
+    parser = argparse.ArgumentParser(description="Generate tailored resumes and cover letters")
+    parser.add_argument("--full-rewrite", action="store_true",
+                        help="Have the LLM write each resume in full instead of a delta on the base template")
+    args = parser.parse_args()
+    process_jobs(full_rewrite=args.full_rewrite)
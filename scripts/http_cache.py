@@ -0,0 +1,137 @@
+"""Shared pooled HTTP session with conditional GET for career pages"""
+import copy
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+VALIDATOR_PATH = 'data/http_validators.json'
+POOL_SIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide keep-alive session.
+
+    Connections are pooled per host, so repeated requests to the same
+    career site reuse the TCP/TLS connection instead of reconnecting.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+class ValidatorStore:
+    """
+    Persistent ETag/Last-Modified validators per URL.
+
+    Each entry also keeps the jobs parsed from the last full response, so a
+    304 Not Modified can short-circuit straight to the previous result.
+    Per-host counters track bytes and time saved by conditional requests.
+    """
+
+    def __init__(self, path: str = VALIDATOR_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self.entries = data.get('entries', {})
+        self.stats = {}
+
+    def conditional_headers(self, url: str, signature: str) -> Dict[str, str]:
+        """Validator headers for the URL, if its cached parse is still usable"""
+        entry = self.entries.get(url)
+        if not entry or entry.get('signature') != signature:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _host_stats(self, url: str) -> Dict:
+        host = urlparse(url).netloc
+        return self.stats.setdefault(host, {
+            'requests': 0,
+            'not_modified': 0,
+            'bytes_downloaded': 0,
+            'bytes_saved': 0,
+            'seconds_saved': 0.0
+        })
+
+    def not_modified(self, url: str, elapsed: float) -> List[Dict]:
+        """Record a 304 and return the jobs parsed from the previous response"""
+        with self._lock:
+            entry = self.entries[url]
+            stats = self._host_stats(url)
+            stats['requests'] += 1
+            stats['not_modified'] += 1
+            stats['bytes_saved'] += entry.get('size', 0)
+            stats['seconds_saved'] += max(0.0, entry.get('cost', 0.0) - elapsed)
+            return copy.deepcopy(entry['jobs'])
+
+    def update(self, url: str, response: requests.Response, signature: str,
+               jobs: List[Dict], cost: float):
+        """
+        Store validators and parsed jobs from a full 200 response.
+
+        Jobs are stored (and returned by not_modified) as deep copies, because
+        callers go on to mutate them (job_details fills in descriptions).
+        """
+        with self._lock:
+            stats = self._host_stats(url)
+            stats['requests'] += 1
+            stats['bytes_downloaded'] += len(response.content)
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if not etag and not last_modified:
+                self.entries.pop(url, None)
+                return
+
+            self.entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'signature': signature,
+                'size': len(response.content),
+                'cost': cost,
+                'jobs': copy.deepcopy(jobs),
+                'fetched_at': time.time()
+            }
+
+    def save(self):
+        """Write the store atomically so a crash never leaves a torn file"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def conditional_get(url: str, validators: Optional[ValidatorStore], signature: str,
+                    timeout: float = 15, **kwargs) -> requests.Response:
+    """GET through the pooled session, sending stored validators if any"""
+    headers = dict(kwargs.pop('headers', {}))
+    if validators:
+        headers.update(validators.conditional_headers(url, signature))
+    return get_session().get(url, headers=headers, timeout=timeout, **kwargs)
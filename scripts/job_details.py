@@ -0,0 +1,141 @@
+"""Second-pass job description fetcher.
+
+Company career pages only list titles and links, so this stage follows each
+job link and fills in the description. It is a generator pipeline: jobs are
+consumed lazily as the listing scraper discovers them and yielded as soon as
+their detail page is fetched, so downstream stages can start early.
+"""
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator
+
+import html2text
+import lxml.html
+
+from http_cache import get_session
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+DETAIL_WORKERS = 8
+MAX_DESCRIPTION_CHARS = 4000
+
+# Page chrome that never contains the job description
+DROP_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'form', 'svg']
+
+# Most specific first; the first non-trivial match wins
+CONTENT_XPATHS = [
+    '//*[@itemprop="description"]',
+    '//*[contains(@class, "job-description") or contains(@class, "jobdescription") or contains(@id, "job-description")]',
+    '//*[contains(@class, "description")]',
+    '//main',
+    '//article',
+    '//body',
+]
+
+
+def extract_description(html: str, max_chars: int = MAX_DESCRIPTION_CHARS) -> str:
+    """
+    Extract readable description text from a job detail page.
+
+    Args:
+        html: Detail page HTML
+        max_chars: Cap on the returned text length
+
+    Returns:
+        Plain-text description (markdown-ish), or '' if nothing usable
+    """
+    if not html or not html.strip():
+        return ''
+
+    tree = lxml.html.fromstring(html)
+    for element in tree.xpath('|'.join(f'//{tag}' for tag in DROP_TAGS)):
+        element.drop_tree()
+
+    content = None
+    for xpath in CONTENT_XPATHS:
+        for element in tree.xpath(xpath):
+            if len(element.text_content().strip()) >= 200:
+                content = element
+                break
+        if content is not None:
+            break
+    if content is None:
+        content = tree
+
+    converter = html2text.HTML2Text()
+    converter.ignore_links = True
+    converter.ignore_images = True
+    converter.body_width = 0
+    text = converter.handle(lxml.html.tostring(content, encoding='unicode'))
+
+    # Collapse runs of blank lines left by removed elements
+    lines = [line.rstrip() for line in text.splitlines()]
+    text = '\n'.join(line for i, line in enumerate(lines) if line or (i and lines[i - 1]))
+    return text.strip()[:max_chars]
+
+
+def fetch_description(job: Dict, scheduler=None, max_chars: int = MAX_DESCRIPTION_CHARS) -> Dict:
+    """Fetch the job's detail page and fill in its description"""
+    url = job.get('link') or job.get('url')
+    try:
+        if scheduler and not scheduler.allowed(url):
+            return job
+        with scheduler.slot(url) if scheduler else nullcontext():
+            response = get_session().get(url, headers={'User-Agent': USER_AGENT}, timeout=15)
+        response.raise_for_status()
+        job['description'] = extract_description(response.text, max_chars)
+    except Exception as e:
+        logger.warning(f"Could not fetch description for {job.get('title')}: {str(e)}")
+    return job
+
+
+def iter_with_descriptions(jobs: Iterable[Dict], scheduler=None,
+                           max_workers: int = DETAIL_WORKERS,
+                           max_chars: int = MAX_DESCRIPTION_CHARS) -> Iterator[Dict]:
+    """
+    Fill in missing descriptions for a stream of jobs.
+
+    Args:
+        jobs: Iterable of job dictionaries (may be a lazy generator)
+        scheduler: Per-host politeness scheduler shared with the listing scraper
+        max_workers: Detail pages fetched in parallel
+        max_chars: Cap on each description's length
+
+    Yields:
+        Job dictionaries, in completion order; duplicate links are dropped
+    """
+    seen = set()
+    pending = set()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for job in jobs:
+            url = job.get('link') or job.get('url')
+            if url:
+                if url in seen:
+                    continue
+                seen.add(url)
+
+            if not url or job.get('description'):
+                yield job
+                continue
+
+            pending.add(executor.submit(fetch_description, job, scheduler, max_chars))
+
+            # Bound the in-flight queue so a fast producer can't run far ahead
+            while len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+            done = {future for future in pending if future.done()}
+            pending -= done
+            for future in done:
+                yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
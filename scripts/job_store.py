@@ -0,0 +1,216 @@
+"""Streaming JSONL job store shared by every pipeline stage.
+
+Each named store is a file data/<name>.jsonl holding one job per line.
+Writes only ever append or atomically replace the file, so a crash never
+loses what was already written. A torn last line is skipped on read.
+Updating a job appends a new version of that record; readers yield only
+the latest version of each job. update_jobs() compacts the store (drops
+the old versions) once STALE_LINES_BEFORE_COMPACT superseded lines pile up.
+
+    for job in iter_jobs("raw_jobs"): ...
+    write_jobs("ranked_jobs", jobs)              # atomic replace
+    append_jobs("job_history", new_jobs)         # append-only
+    update_jobs("ranked_jobs", {job_key(job): {"documents_generated": True}})
+    merge_ranked(ranked_this_run)                # keep the jobs this run did not rank
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+from typing import Dict, Iterable, Iterator, List
+
+from seen_jobs import canonical_url, posting_id
+
+DATA_DIR = "data"
+STALE_LINES_BEFORE_COMPACT = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def store_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"{name}.jsonl")
+
+
+def legacy_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"{name}.json")
+
+
+def job_key(job: Dict) -> str:
+    """Stable identity of a job across stages and runs"""
+    key = posting_id(job) or canonical_url(job.get("url") or job.get("link"))
+    if key:
+        return key
+    text = f"{job.get('title', '')}\x1f{job.get('company', '')}".lower()
+    return "hash:" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def exists(name: str) -> bool:
+    return os.path.exists(store_path(name)) or os.path.exists(legacy_path(name))
+
+
+def _iter_lines(path: str, warn: bool = False) -> Iterator[tuple]:
+    """Yield (offset, record) pairs, skipping a torn or corrupt line (logged if `warn`)"""
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                yield start, json.loads(line)
+            except json.JSONDecodeError:
+                # An unterminated last line is a crashed writer's torn tail
+                if warn and line.endswith(b"\n"):
+                    logger.warning(f"Skipping corrupt line at byte {start} of {path}")
+
+
+def _content_hash(job: Dict) -> str:
+    text = f"{job.get('location', '')}\x1f{job.get('description', '')}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _index(path: str) -> tuple:
+    """
+    Offset of the latest version of each job, and the number of records read.
+
+    Jobs without a URL or posting ID are keyed by title and company, so two
+    different postings can share a key; that is logged, and the later one wins.
+    """
+    latest = {}
+    fallback_hashes = {}
+    count = 0
+    for offset, record in _iter_lines(path, warn=True):
+        count += 1
+        key = job_key(record)
+        latest[key] = offset
+        if key.startswith("hash:"):
+            content = _content_hash(record)
+            if fallback_hashes.setdefault(key, content) != content:
+                logger.warning(f"Jobs without a URL share key {key} ({record.get('title')} at "
+                               f"{record.get('company')}); only the last one is kept")
+                fallback_hashes[key] = content
+    return latest, count
+
+
+def iter_jobs(name: str) -> Iterator[Dict]:
+    """
+    Stream the latest version of every job in a store.
+
+    Only a key -> offset index is held in memory, never the records. Falls
+    back to the old data/<name>.json file if the store has not been written yet.
+    """
+    path = store_path(name)
+    if not os.path.exists(path):
+        try:
+            with open(legacy_path(name), "r", encoding="utf-8") as f:
+                yield from json.load(f)
+        except FileNotFoundError:
+            pass
+        return
+
+    wanted = set(_index(path)[0].values())
+    for offset, record in _iter_lines(path):
+        if offset in wanted:
+            yield record
+
+
+def load_jobs(name: str) -> List[Dict]:
+    return list(iter_jobs(name))
+
+
+def _write_lines(f, jobs: Iterable[Dict]) -> int:
+    count = 0
+    for job in jobs:
+        f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        count += 1
+    f.flush()
+    os.fsync(f.fileno())
+    return count
+
+
+def write_jobs(name: str, jobs: Iterable[Dict]) -> int:
+    """
+    Replace a store's contents atomically; `jobs` may be a generator.
+
+    Returns:
+        Number of jobs written
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = store_path(name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        count = _write_lines(f, jobs)
+    os.replace(tmp_path, path)
+    return count
+
+
+def append_jobs(name: str, jobs: Iterable[Dict]) -> int:
+    """Append jobs to a store (new records or new versions of existing ones)"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = store_path(name)
+    if not os.path.exists(path) and os.path.exists(legacy_path(name)):
+        # Carry over the old JSON file before appending to it
+        write_jobs(name, iter_jobs(name))
+    with open(path, "a+b") as f:
+        # Terminate a torn last line from a crashed writer so it stays isolated
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    with open(path, "a", encoding="utf-8") as f:
+        return _write_lines(f, jobs)
+
+
+def update_jobs(name: str, updates: Dict[str, Dict]) -> int:
+    """
+    Apply per-record field updates, keyed by job_key.
+
+    The updated records are appended as new versions. Collect a run's updates
+    and apply them in one call: each call reads the whole store. The store is
+    compacted once STALE_LINES_BEFORE_COMPACT superseded lines have built up.
+
+    Returns:
+        Number of jobs updated
+    """
+    if not updates:
+        return 0
+    path = store_path(name)
+    if not os.path.exists(path):
+        # Old JSON file: append_jobs carries it over
+        changed = [{**job, **updates[job_key(job)]} for job in iter_jobs(name) if job_key(job) in updates]
+        return append_jobs(name, changed)
+
+    latest, records = _index(path)
+    wanted = {latest[key] for key in updates if key in latest}
+    changed = [
+        {**job, **updates[job_key(job)]}
+        for offset, job in _iter_lines(path)
+        if offset in wanted
+    ]
+    count = append_jobs(name, changed)
+    # Every appended version supersedes one record
+    if records + count - len(latest) >= STALE_LINES_BEFORE_COMPACT:
+        compact(name)
+    return count
+
+
+def compact(name: str) -> int:
+    """Rewrite a store with only the latest version of each job"""
+    return write_jobs(name, iter_jobs(name))
+
+
+def merge_ranked(finished: Iterable[Dict], name: str = "ranked_jobs") -> int:
+    """
+    Merge this run's ranked jobs into a store without dropping the others.
+
+    Jobs ranked this run replace their earlier record (and leave the store if
+    they no longer qualify); every job this run did not rank is kept, so a
+    limited or single-source run never erases the history.
+
+    Returns:
+        Number of jobs in the store
+    """
+    ranked = {job_key(job): job for job in finished if "match_score" in job}
+    kept = (job for job in iter_jobs(name) if job_key(job) not in ranked)
+    return write_jobs(name, itertools.chain(kept, (job for job in ranked.values() if job.get("qualified"))))
@@ -0,0 +1,332 @@
+"""Single entry point for LLM calls.
+
+- One OpenAI client per process, with a shared HTTP connection pool, instead
+  of a new client (and TLS handshake) per call
+- Each stage picks a model tier: the cheap model for ranking, the strong
+  model for documents (override with LLM_CHEAP_MODEL / LLM_STRONG_MODEL)
+- complete_json() asks for JSON mode and repairs near-JSON locally (code
+  fences, surrounding prose, trailing commas, smart or single quotes, a
+  truncated tail) before giving up
+- METER records per-stage calls, errors, tokens (cached/uncached input,
+  output), latency and estimated cost; export_metrics() writes them to
+  data/llm_metrics.json
+
+    text = complete("cover_letter", messages)
+    result = complete_json("match", messages, max_tokens=500)
+    print(format_metrics())
+"""
+import ast
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+import httpx
+from openai import OpenAI
+
+MODEL_TIERS = {
+    "cheap": os.getenv("LLM_CHEAP_MODEL", "gpt-4o-mini"),
+    "strong": os.getenv("LLM_STRONG_MODEL", "gpt-4o")
+}
+
+# Model tier of each call type; unknown stages use the strong tier
+STAGE_TIERS = {
+    "match": "cheap",
+    "match-batch": "cheap",
+    "resume": "strong",
+    "resume-delta": "strong",
+    "cover_letter": "strong",
+    "cover": "strong"
+}
+
+# List prices in USD per 1M tokens: (input, cached input, output); matched by model name prefix
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-4": (30.00, 30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50)
+}
+
+# Context window in tokens (input and output together); matched by model name prefix
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o-mini": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385
+}
+DEFAULT_CONTEXT_WINDOW = 8_192
+
+METRICS_PATH = "data/llm_metrics.json"
+POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", 20))
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def model_for(stage):
+    return MODEL_TIERS[STAGE_TIERS.get(stage, "strong")]
+
+
+def _by_prefix(table, model):
+    """The table entry with the longest name prefix of `model`, or None"""
+    matches = [name for name in table if model.startswith(name)]
+    return table[max(matches, key=len)] if matches else None
+
+
+def context_window(model):
+    """Context window of a model, DEFAULT_CONTEXT_WINDOW if unknown"""
+    return _by_prefix(MODEL_CONTEXT_WINDOWS, model) or DEFAULT_CONTEXT_WINDOW
+
+
+def get_client():
+    """The process-wide OpenAI client (thread-safe, created on first use)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=httpx.Client(limits=limits))
+        return _client
+
+
+# --- usage metering ---
+
+
+def _field(obj, name, default=None):
+    """Read a field from an SDK response object or a raw response dict"""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def prompt_usage(usage):
+    """
+    Split a response's `usage` into cached and uncached input tokens.
+
+    Returns:
+        Dictionary with prompt_tokens, cached_tokens, uncached_tokens and completion_tokens
+    """
+    prompt_tokens = _field(usage, "prompt_tokens") or 0
+    cached_tokens = _field(_field(usage, "prompt_tokens_details") or {}, "cached_tokens") or 0
+    return {
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "uncached_tokens": prompt_tokens - cached_tokens,
+        "completion_tokens": _field(usage, "completion_tokens") or 0
+    }
+
+
+def call_cost(model, split):
+    """Estimated USD cost of one call, or 0.0 for a model without a known price"""
+    prices = _by_prefix(MODEL_PRICES, model)
+    if prices is None:
+        return 0.0
+    input_price, cached_price, output_price = prices
+    return (split["uncached_tokens"] * input_price + split["cached_tokens"] * cached_price
+            + split["completion_tokens"] * output_price) / 1_000_000
+
+
+class Meter:
+    """Per-stage call, token, latency and cost totals (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def _totals(self, stage, model):
+        totals = self.stages.setdefault(stage, {
+            "model": model, "calls": 0, "errors": 0, "prompt_tokens": 0, "cached_tokens": 0,
+            "uncached_tokens": 0, "completion_tokens": 0, "latency_s": 0.0, "cost_usd": 0.0
+        })
+        totals["model"] = model
+        return totals
+
+    def record(self, stage, model, usage, latency):
+        """Add one successful call; returns that call's prompt_usage() split"""
+        split = prompt_usage(usage)
+        with self._lock:
+            totals = self._totals(stage, model)
+            totals["calls"] += 1
+            totals["latency_s"] += latency
+            totals["cost_usd"] += call_cost(model, split)
+            for name, value in split.items():
+                totals[name] += value
+        return split
+
+    def record_error(self, stage, model, latency):
+        with self._lock:
+            totals = self._totals(stage, model)
+            totals["errors"] += 1
+            totals["latency_s"] += latency
+
+    def snapshot(self):
+        with self._lock:
+            stages = {stage: dict(totals) for stage, totals in self.stages.items()}
+        for totals in stages.values():
+            attempts = totals["calls"] + totals["errors"]
+            totals["avg_latency_s"] = totals["latency_s"] / attempts if attempts else 0.0
+        return stages
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+
+
+METER = Meter()
+
+
+def format_metrics():
+    """One line per stage, or '' if no calls were made"""
+    return "\n".join(
+        f"{stage} ({t['model']}): {t['calls']} calls, {t['errors']} errors, "
+        f"{t['prompt_tokens']:,} input tokens ({t['cached_tokens']:,} cached), "
+        f"{t['completion_tokens']:,} output, {t['avg_latency_s']:.2f}s avg, ${t['cost_usd']:.4f}"
+        for stage, t in METER.snapshot().items()
+    )
+
+
+def export_metrics(path=METRICS_PATH):
+    """Write the per-stage metrics to a JSON file (atomic replace); returns the path"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"exported_at": datetime.now().isoformat(timespec="seconds"),
+                   "stages": METER.snapshot()}, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+# --- calls ---
+
+
+def complete(stage, messages, max_tokens=None, temperature=0.7, json_mode=False):
+    """
+    Run one chat completion on the stage's model tier and meter it.
+
+    Returns:
+        The assistant message text
+    """
+    model = model_for(stage)
+    options = {"max_tokens": max_tokens} if max_tokens else {}
+    if json_mode:
+        options["response_format"] = {"type": "json_object"}
+
+    start = time.perf_counter()
+    try:
+        response = get_client().chat.completions.create(
+            model=model, messages=messages, temperature=temperature, **options
+        )
+    except Exception:
+        METER.record_error(stage, model, time.perf_counter() - start)
+        raise
+    METER.record(stage, model, response.usage, time.perf_counter() - start)
+    return response.choices[0].message.content
+
+
+def complete_json(stage, messages, max_tokens=None, temperature=0.3):
+    """complete() in JSON mode, parsed with parse_json(); raises ValueError if unparseable"""
+    return parse_json(complete(stage, messages, max_tokens, temperature, json_mode=True))
+
+
+# --- near-JSON repair ---
+
+
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _json_span(text):
+    """Text from the first '{' or '[' to the last matching closer (or the end, if truncated)"""
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return text[start:end + 1] if end > start else text[start:]
+
+
+def _close_truncated(text):
+    """Close an unterminated string and any open brackets, dropping a dangling comma or key"""
+    stack = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = re.sub(r'(,\s*"[^"]*"\s*:?\s*|,\s*)$', "", text.rstrip())
+    return text + "".join(reversed(stack))
+
+
+JSON_LITERALS = {"true": "True", "false": "False", "null": "None"}
+BARE_LITERAL = re.compile(r"\b(?:true|false|null)\b")
+QUOTED = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'""")
+
+
+def _python_literals(text):
+    """true/false/null -> True/False/None outside quoted strings, for ast.literal_eval"""
+    parts = []
+    end = 0
+    for quoted in QUOTED.finditer(text):
+        parts.append(BARE_LITERAL.sub(lambda m: JSON_LITERALS[m.group(0)], text[end:quoted.start()]))
+        parts.append(quoted.group(0))
+        end = quoted.end()
+    parts.append(BARE_LITERAL.sub(lambda m: JSON_LITERALS[m.group(0)], text[end:]))
+    return "".join(parts)
+
+
+def _repair_candidates(text):
+    """Progressively repaired copies of the JSON span in `text`"""
+    span = _json_span(text)
+    if span is None:
+        return []
+    return [span, TRAILING_COMMA.sub(r"\1", span), TRAILING_COMMA.sub(r"\1", _close_truncated(span))]
+
+
+def parse_json(text):
+    """
+    Parse an LLM's JSON reply, repairing common near-JSON output.
+
+    Valid JSON is parsed as-is, so curly quotes inside its strings are kept;
+    smart quotes are only straightened when the reply uses them as delimiters.
+
+    Raises:
+        ValueError: if no JSON value can be recovered
+    """
+    text = (text or "").strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    candidates = _repair_candidates(text)
+    if not candidates:
+        raise ValueError("No JSON object in LLM response")
+    candidates += _repair_candidates(text.translate(SMART_QUOTES))
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        try:
+            # Python-style literals: single quotes, True/False/None
+            value = ast.literal_eval(_python_literals(candidate))
+            if isinstance(value, (dict, list)):
+                return value
+        except (ValueError, SyntaxError):
+            pass
+    raise ValueError(f"Unparseable JSON in LLM response: {text[:80]!r}")
@@ -1,21 +1,43 @@
+import argparse
 import os
 import json
+import time
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 import base64
 import re
 from datetime import datetime
-# Email keywords for classification
-EMAIL_KEYWORDS = {
-    "interview": ["interview", "phone screen", "call you", "speak with you", "meeting", "zoom", "teams"],
-    "rejection": ["unfortunately", "not moving forward", "decided to", "other candidates", "not selected"],
-    "offer": ["offer", "congratulations", "pleased to offer", "job offer"],
-    "received": ["received your application", "thank you for applying", "application received"]
-}from update_sheet import update_status_from_email
 
-SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
+from email_classifier import classify_email, extract_company_position
+from update_sheet import update_statuses_from_emails
+
+# gmail.modify (not just gmail.readonly) so processed emails can be marked as read
+SCOPES = ['https://www.googleapis.com/auth/gmail.modify']
+REAUTH_MESSAGE = ("The Gmail token in GMAIL_TOKEN_JSON was not granted {missing}. Email monitoring "
+                  "now marks processed emails as read, so the token needs re-authorizing: run "
+                  "`python scripts/monitor_email.py --authorize credentials.json` and replace "
+                  "GMAIL_TOKEN_JSON with the printed token.")
+
+GMAIL_STATE_PATH = 'data/gmail_state.json'
+FULL_SYNC_QUERY = 'is:unread newer_than:7d (from:noreply OR from:recruiting OR from:hr OR subject:application OR subject:interview OR subject:opportunity)'
+BATCH_SIZE = 50     # Gmail recommends at most 50 calls per batch request
+BATCH_RETRIES = 3
+
+# Metadata-level equivalents of FULL_SYNC_QUERY, for incrementally synced messages
+CANDIDATE_SENDER = re.compile(r'noreply|no-reply|recruit|\bhr\b|careers|talent', re.I)
+CANDIDATE_SUBJECT = re.compile(r'application|interview|opportunity', re.I)
+
+def missing_scopes(token_info):
+    """Scopes in SCOPES that a stored token was not granted"""
+    granted = token_info.get('scopes') or []
+    if isinstance(granted, str):
+        granted = granted.split()
+    # Tokens saved without a scope list are checked by the refresh instead
+    return [scope for scope in SCOPES if granted and scope not in granted]
 
 def get_gmail_service():
     """Authenticate and return Gmail API service"""
@@ -23,22 +45,31 @@ def get_gmail_service():
     token_json = os.getenv("GMAIL_TOKEN_JSON")
     
     if token_json:
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            f.write(token_json)
-            token_file = f.name
-        
-        creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-        os.unlink(token_file)
+        token_info = json.loads(token_json)
+        missing = missing_scopes(token_info)
+        if missing:
+            raise ValueError(REAUTH_MESSAGE.format(missing=", ".join(missing)))
+        creds = Credentials.from_authorized_user_info(token_info, SCOPES)
     
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+            try:
+                creds.refresh(Request())
+            except RefreshError as e:
+                if 'invalid_scope' in str(e):
+                    raise ValueError(REAUTH_MESSAGE.format(missing=", ".join(SCOPES))) from e
+                raise
         else:
             raise ValueError("Gmail authentication required. Run locally first to generate token.")
     
     return build('gmail', 'v1', credentials=creds)
 
+def authorize(client_secrets_path):
+    """Run the OAuth consent flow locally and print a token for GMAIL_TOKEN_JSON"""
+    flow = InstalledAppFlow.from_client_secrets_file(client_secrets_path, SCOPES)
+    creds = flow.run_local_server(port=0)
+    print(creds.to_json())
+
 def extract_email_body(payload):
     """Extract text from email body"""
     body = ""
@@ -57,117 +88,220 @@ def extract_email_body(payload):
     
     return body
 
-def classify_email(subject, body):
-    """Classify email type based on keywords"""
-    subject_lower = subject.lower()
-    body_lower = body.lower()
-    text = f"{subject_lower} {body_lower}"
-    
-    # Check for interview invitation
-    if any(keyword in text for keyword in EMAIL_KEYWORDS['interview']):
-        return 'Interview Scheduled'
-    
-    # Check for rejection
-    if any(keyword in text for keyword in EMAIL_KEYWORDS['rejection']):
-        return 'Rejected'
-    
-    # Check for offer
-    if any(keyword in text for keyword in EMAIL_KEYWORDS['offer']):
-        return 'Offer Received'
-    
-    # Check for application received
-    if any(keyword in text for keyword in EMAIL_KEYWORDS['received']):
-        return 'Application Received'
-    
-    return None
-
-def extract_company_position(subject, body):
-    """Try to extract company name and position from email"""
-    # Common patterns in job emails
-    patterns = [
-        r'(position|role|opportunity)\s+(?:of|as|for)?\s+([\w\s]+)\s+at\s+([\w\s]+)',
-        r'([\w\s]+)\s+-\s+([\w\s]+)\s+position',
-        r'application\s+for\s+([\w\s]+)\s+at\s+([\w\s]+)',
-    ]
-    
-    text = f"{subject} {body}"
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            groups = match.groups()
-            if len(groups) >= 2:
-                return {
-                    'position': groups[-2].strip(),
-                    'company': groups[-1].strip()
-                }
-    
-    return None
+def header_value(payload, name):
+    return next((h['value'] for h in payload.get('headers', []) if h['name'] == name), '')
 
-def monitor_emails():
-    """Monitor Gmail for job application responses"""
-    service = get_gmail_service()
-    
-    # Get unread messages from last 7 days
-    query = 'is:unread newer_than:7d (from:noreply OR from:recruiting OR from:hr OR subject:application OR subject:interview OR subject:opportunity)'
-    
+def is_candidate(message):
+    """Decide from metadata alone whether a message is worth downloading in full"""
+    if 'UNREAD' not in message.get('labelIds', []):
+        return False
+    subject = header_value(message['payload'], 'Subject')
+    sender = header_value(message['payload'], 'From')
+    return bool(
+        CANDIDATE_SENDER.search(sender) or
+        CANDIDATE_SUBJECT.search(subject) or
+        classify_email(subject, message.get('snippet', ''))
+    )
+
+def is_retryable(exception):
+    """Rate limits and server errors are worth retrying; other failures are not"""
+    return isinstance(exception, HttpError) and (exception.resp.status == 429 or exception.resp.status >= 500)
+
+def batch_get(service, message_ids, **params):
+    """
+    Fetch messages with Gmail batch HTTP requests, BATCH_SIZE calls per round trip.
+
+    Messages that fail inside a batch with a rate limit or server error are
+    retried in a later batch with backoff; other failures are not retried.
+
+    Returns:
+        (dictionary of message ID -> message resource, set of IDs that no
+        longer exist in the mailbox)
+    """
+    messages = {}
+    gone = set()
+    pending = list(message_ids)
+    for attempt in range(BATCH_RETRIES + 1):
+        failed = []
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                messages[request_id] = response
+            elif isinstance(exception, HttpError) and exception.resp.status == 404:
+                gone.add(request_id)
+            elif is_retryable(exception):
+                failed.append(request_id)
+            else:
+                print(f"⚠️ Could not fetch message {request_id}: {exception}")
+
+        for i in range(0, len(pending), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=callback)
+            for message_id in pending[i:i + BATCH_SIZE]:
+                batch.add(service.users().messages().get(userId='me', id=message_id, **params),
+                          request_id=message_id)
+            batch.execute()
+
+        if not failed:
+            break
+        pending = failed
+        if attempt < BATCH_RETRIES:
+            time.sleep(2 ** attempt)
+    else:
+        print(f"⚠️ Could not fetch {len(pending)} messages")
+    return messages, gone
+
+def list_query_messages(service):
+    """Full listing: unread job-related messages from the last 7 days"""
+    ids = []
+    request = service.users().messages().list(userId='me', q=FULL_SYNC_QUERY, maxResults=500)
+    while request is not None:
+        response = request.execute()
+        ids.extend(m['id'] for m in response.get('messages', []))
+        request = service.users().messages().list_next(request, response)
+    return ids
+
+def list_history_messages(service, start_history_id):
+    """
+    Incremental listing: messages added since start_history_id.
+
+    Returns:
+        (message IDs, latest history ID), or (None, None) if the history ID
+        has expired and a full sync is needed
+    """
+    ids = []
+    history_id = start_history_id
+    request = service.users().history().list(
+        userId='me', startHistoryId=start_history_id, historyTypes=['messageAdded'], maxResults=500
+    )
     try:
-        results = service.users().messages().list(userId='me', q=query).execute()
-        messages = results.get('messages', [])
-        
-        if not messages:
-            print("✅ No new job-related emails found")
-            return
+        while request is not None:
+            response = request.execute()
+            for record in response.get('history', []):
+                ids.extend(m['message']['id'] for m in record.get('messagesAdded', []))
+            history_id = response.get('historyId', history_id)
+            request = service.users().history().list_next(request, response)
+    except HttpError as e:
+        if e.resp.status == 404:
+            return None, None
+        raise
+    return list(dict.fromkeys(ids)), history_id
+
+def load_sync_state(path=GMAIL_STATE_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_sync_state(state, path=GMAIL_STATE_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def sync_job_emails(service, state_path=GMAIL_STATE_PATH, full=False):
+    """
+    Collect status updates from job emails received since the last sync.
+
+    The first run (or --full, or an expired history ID) lists unread
+    messages with FULL_SYNC_QUERY; later runs only look at messages added
+    since the stored historyId. Messages are fetched as metadata first and
+    only candidates are downloaded in full.
+
+    A message that could not be fetched, or was classified but whose
+    company/position could not be extracted, stays unread and is kept in
+    the state as pending; later runs retry it until it yields an update
+    (or is read or deleted in Gmail).
+
+    Returns:
+        List of update dictionaries for update_statuses_from_emails
+    """
+    state = load_sync_state(state_path)
+    pending_ids = state.get('pending_ids', [])
+    message_ids, history_id = None, None
+    if state.get('history_id') and not full:
+        message_ids, history_id = list_history_messages(service, state['history_id'])
+        if message_ids is None:
+            print("⚠️ Sync state expired, falling back to a full sync")
+    if message_ids is None:
+        # Capture the mailbox position before listing so nothing slips between runs
+        history_id = service.users().getProfile(userId='me').execute()['historyId']
+        message_ids = list_query_messages(service)
+    message_ids = list(dict.fromkeys(message_ids + pending_ids))
+
+    if not message_ids:
+        print("✅ No new job-related emails found")
+        save_sync_state({'history_id': history_id, 'pending_ids': []}, state_path)
+        return []
+
+    metadata, gone = batch_get(service, message_ids, format='metadata', metadataHeaders=['Subject', 'From'])
+    candidates = [mid for mid in message_ids if mid in metadata and is_candidate(metadata[mid])]
+    # Deleted messages are dropped; other failures are retried next sync
+    pending = [mid for mid in message_ids if mid not in metadata and mid not in gone]
+    print(f"📧 {len(message_ids)} new messages, {len(candidates)} potential job emails...\n")
+
+    full_messages, gone = batch_get(service, candidates, format='full')
+    updates = []
+    read_ids = []
+
+    for message_id in candidates:
+        msg_data = full_messages.get(message_id)
+        if msg_data is None:
+            if message_id not in gone:
+                pending.append(message_id)
+            continue
         
-        print(f"📧 Found {len(messages)} potential job emails...\n")
+        subject = header_value(msg_data['payload'], 'Subject')
+        sender = header_value(msg_data['payload'], 'From')
+        body = extract_email_body(msg_data['payload'])
         
-        updates = []
+        # Classify email
+        status = classify_email(subject, body)
         
-        for msg in messages:
-            msg_data = service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
+        if status:
+            print(f"✅ {status}: {subject[:60]}...")
+            print(f"   From: {sender}")
             
-            headers = msg_data['payload']['headers']
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '')
-            sender = next((h['value'] for h in headers if h['name'] == 'From'), '')
+            # Extract company and position
+            info = extract_company_position(subject, body)
             
-            body = extract_email_body(msg_data['payload'])
+            if info:
+                updates.append({
+                    'company': info['company'],
+                    'position': info['position'],
+                    'status': status,
+                    'notes': f"Email received: {datetime.now().strftime('%Y-%m-%d')}\nSubject: {subject}"
+                })
+                read_ids.append(message_id)
+            else:
+                # Left unread and retried next run
+                print(f"   ⚠️ Could not extract company/position details, will retry")
+                pending.append(message_id)
             
-            # Classify email
-            status = classify_email(subject, body)
-            
-            if status:
-                print(f"✅ {status}: {subject[:60]}...")
-                print(f"   From: {sender}")
-                
-                # Extract company and position
-                info = extract_company_position(subject, body)
-                
-                if info:
-                    email_data = {
-                        'company': info['company'],
-                        'position': info['position'],
-                        'status': status,
-                        'notes': f"Email received: {datetime.now().strftime('%Y-%m-%d')}\nSubject: {subject}"
-                    }
-                    
-                    updates.append(email_data)
-                    
-                    # Mark as read
-                    service.users().messages().modify(
-                        userId='me',
-                        id=msg['id'],
-                        body={'removeLabelIds': ['UNREAD']}
-                    ).execute()
-                else:
-                    print(f"   ⚠️ Could not extract company/position details")
-                
-                print()
+            print()
+
+    # Mark as read, up to 1000 messages per call
+    for i in range(0, len(read_ids), 1000):
+        service.users().messages().batchModify(
+            userId='me',
+            body={'ids': read_ids[i:i + 1000], 'removeLabelIds': ['UNREAD']}
+        ).execute()
+
+    save_sync_state({'history_id': history_id, 'pending_ids': pending}, state_path)
+    return updates
+
+def monitor_emails(full=False):
+    """Monitor Gmail for job application responses"""
+    service = get_gmail_service()
+    
+    try:
+        updates = sync_job_emails(service, full=full)
         
         # Update spreadsheet
         if updates:
             print(f"\n📄 Updating {len(updates)} jobs in spreadsheet...")
-            for update in updates:
-                update_status_from_email(update)
+            update_statuses_from_emails(updates)
         
         print(f"\n✅ Email monitoring complete!")
         
@@ -175,4 +309,13 @@ def monitor_emails():
         print(f"❌ Error monitoring emails: {e}")
 
 if __name__ == "__main__":
-    monitor_emails()
+    parser = argparse.ArgumentParser(description="Update application statuses from Gmail")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the stored history ID and re-scan the last 7 days")
+    parser.add_argument("--authorize", metavar="CLIENT_SECRETS",
+                        help="Authorize Gmail access with an OAuth client file and print the token")
+    args = parser.parse_args()
+    if args.authorize:
+        authorize(args.authorize)
+    else:
+        monitor_emails(full=args.full)
@@ -0,0 +1,514 @@
+"""Resumable job pipeline: fetch -> rank -> docs -> sheet.
+
+Each stage runs on its own worker threads and hands jobs to the next stage
+through a bounded queue, so a job can be ranked and tailored while later
+fetches are still in flight, and a slow stage applies back-pressure instead
+of piling up work in memory.
+
+Every (job, stage) result is checkpointed in data/pipeline.db together with
+the hash of its inputs: the job content for rank, the upstream stage's
+output for later stages, plus each stage's version (prompt, model, resume).
+A stage is re-run for a job only when that input hash changed or its last
+attempt failed, so re-running after a crash or with a few new jobs only
+does the missing work. A failed job is recorded and skipped; the rest of
+the run carries on.
+
+Jobs are deduplicated by job_key as they arrive. Match scores go through
+the same score cache as rank_jobs; the rank_jobs TF-IDF top_k pre-filter,
+multi-job batching and the dedup.py near-duplicate merge need the whole
+job list up front, so they are not applied in this streaming mode (run
+fetch_jobs.py / rank_jobs.py for those).
+
+Usage:
+    python scripts/pipeline.py                       # LinkedIn + company pages
+    python scripts/pipeline.py --source companies --no-docs
+    python scripts/pipeline.py --rerun rank          # ignore rank checkpoints
+
+Only one run at a time: run_pipeline holds data/pipeline.lock (with the
+owner's PID) and raises PipelineBusyError while another process has it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import JOB_CRITERIA
+from job_store import job_key, merge_ranked
+from llm_gateway import METER, export_metrics, format_metrics, model_for
+from prefilter import excluded_titles
+from rate_limit import RateLimiter, estimate_tokens
+from score_cache import ScoreCache, make_cache_key
+from scoring_engine import REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE
+from seen_jobs import content_hash
+
+PIPELINE_DB_PATH = "data/pipeline.db"
+RUN_LOCK_PATH = "data/pipeline.lock"
+QUEUE_SIZE = 20
+RANK_WORKERS = int(os.getenv("OPENAI_CONCURRENCY", 5))
+DOC_WORKERS = 3
+STAGES = ("rank", "docs", "sheet")
+
+_DONE = object()
+
+
+class PipelineBusyError(RuntimeError):
+    """Another pipeline run holds the run lock"""
+
+
+def stable_hash(*parts):
+    text = "\x1f".join(json.dumps(p, sort_keys=True, ensure_ascii=False, default=str) for p in parts)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """Per-job, per-stage results keyed by input hash (SQLite, shared by worker threads)"""
+
+    def __init__(self, path=PIPELINE_DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS stage_runs (
+                job_key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                output TEXT,
+                error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (job_key, stage)
+            )
+        """)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key, stage, input_hash):
+        """Stored output if this stage already succeeded on these exact inputs"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT output FROM stage_runs WHERE job_key = ? AND stage = ? AND input_hash = ? AND status = 'done'",
+                (key, stage, input_hash)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, stage, input_hash, status, output=None, error=None):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO stage_runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, stage, input_hash, status, json.dumps(output, ensure_ascii=False),
+                 error, datetime.now().isoformat(timespec="seconds"))
+            )
+
+    def invalidate(self, stage):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM stage_runs WHERE stage = ?", (stage,))
+
+    def close(self):
+        self.conn.close()
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    process(job) returns a dict of fields to merge onto the job; it may raise
+    to mark the job failed. Only jobs for which accept(job) is true are
+    handed to this stage; the rest finish at the previous stage. close(),
+    if given, runs once the stage's workers have finished.
+    """
+
+    def __init__(self, name, process, version="", workers=1, accept=None, close=None):
+        self.name = name
+        self.process = process
+        self.version = version
+        self.workers = workers
+        self.accept = accept or (lambda job: True)
+        self.close = close
+
+
+class Pipeline:
+    """Runs stages concurrently over a stream of jobs, with checkpoints"""
+
+    def __init__(self, stages, checkpoints, queue_size=QUEUE_SIZE):
+        self.stages = stages
+        self.checkpoints = checkpoints
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.stats = {"fetch": {"done": 0, "duplicates": 0}}
+        for stage in stages:
+            self.stats[stage.name] = {"done": 0, "reused": 0, "failed": 0, "skipped": 0}
+        self.seen = set()
+        self.finished = []
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def _count(self, stage, outcome):
+        with self._lock:
+            self.stats[stage][outcome] += 1
+
+    def _forward(self, index, job):
+        """Hand a job to stage `index`, or finish it if that stage does not want it"""
+        if index < len(self.stages) and self.stages[index].accept(job):
+            self.queues[index].put(job)
+            return
+        if index < len(self.stages):
+            self._count(self.stages[index].name, "skipped")
+        with self._lock:
+            self.finished.append(job)
+
+    def _run_stage(self, index):
+        stage = self.stages[index]
+        inbox = self.queues[index]
+        while True:
+            job = inbox.get()
+            if job is _DONE:
+                break
+            try:
+                self._run_job(index, job)
+            except Exception as e:
+                # A checkpoint write or hand-off failed: record it and keep draining the
+                # inbox, or the previous stage's workers block on a full queue
+                self._fail(stage.name, job, e)
+
+    def _run_job(self, index, job):
+        stage = self.stages[index]
+        key = job["_key"]
+        input_hash = stable_hash(job["_hash"], stage.name, stage.version)
+        output = self.checkpoints.get(key, stage.name, input_hash)
+        if output is not None:
+            self._count(stage.name, "reused")
+        else:
+            try:
+                output = stage.process(job)
+            except Exception as e:
+                self.checkpoints.put(key, stage.name, input_hash, "failed", error=str(e))
+                self._fail(stage.name, job, e)
+                return
+            self.checkpoints.put(key, stage.name, input_hash, "done", output)
+            self._count(stage.name, "done")
+        self._forward(index + 1, {**job, **output, "_hash": stable_hash(input_hash, output)})
+
+    def _fail(self, stage_name, job, error):
+        self._count(stage_name, "failed")
+        with self._lock:
+            self.errors.append((stage_name, job, error))
+            # Keep what earlier stages produced (e.g. a rank without documents)
+            self.finished.append({**job, "failed_stage": stage_name})
+
+    def _feed(self, source, limit):
+        try:
+            self._feed_jobs(source, limit)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(("fetch", {}, e))
+
+    def _feed_jobs(self, source, limit):
+        for job in source:
+            key = job_key(job)
+            with self._lock:
+                if limit and len(self.seen) >= limit:
+                    return
+                duplicate = key in self.seen
+                self.seen.add(key)
+                self.stats["fetch"]["duplicates" if duplicate else "done"] += 1
+            if not duplicate:
+                self._forward(0, {**job, "_key": key, "_hash": content_hash(job)})
+
+    def run(self, sources, limit=None, on_progress=None, interval=0.5):
+        """
+        Stream jobs from `sources` (iterables of job dicts) through all stages.
+
+        on_progress(stats) is called on the calling thread every `interval`
+        seconds and once at the end.
+
+        Returns:
+            Jobs that completed their last applicable stage
+        """
+        groups = []
+        for index, stage in enumerate(self.stages):
+            threads = [threading.Thread(target=self._run_stage, args=(index,), daemon=True)
+                       for _ in range(stage.workers)]
+            for thread in threads:
+                thread.start()
+            groups.append(threads)
+
+        # Each source fetches on its own thread, so a slow one does not hold up the others
+        feeders = [threading.Thread(target=self._feed, args=(source, limit), daemon=True) for source in sources]
+        for feeder in feeders:
+            feeder.start()
+
+        def wait(thread):
+            while thread.is_alive():
+                thread.join(interval)
+                if on_progress:
+                    on_progress(self.stats)
+
+        # Shut stages down in order: once a stage's feeders are done, tell each of its workers
+        for feeder in feeders:
+            wait(feeder)
+        for index, threads in enumerate(groups):
+            for _ in threads:
+                self.queues[index].put(_DONE)
+            for thread in threads:
+                wait(thread)
+            if self.stages[index].close:
+                self.stages[index].close()
+
+        if on_progress:
+            on_progress(self.stats)
+        return [{k: v for k, v in job.items() if not k.startswith("_")} for job in self.finished]
+
+
+# --- stage implementations ---
+
+def linkedin_source():
+    from fetch_jobs import fetch_linkedin_jobs
+    yield from fetch_linkedin_jobs()
+
+
+def company_source():
+    from company_scraper import stream_company_jobs
+    yield from stream_company_jobs()
+
+
+def title_excluded(job):
+    """Same word-boundary title exclusion as the rank_jobs pre-filter"""
+    return bool(excluded_titles([job], JOB_CRITERIA.get("exclude_keywords", []))[0])
+
+
+def rank_stage(limiter):
+    """
+    LLM match scoring, one job at a time on RANK_WORKERS threads.
+
+    Scores are shared with rank_jobs through the score cache (same key and
+    version), so a job scored by either entry point is not scored again.
+    The TF-IDF top_k cut, multi-job batching and near-duplicate merge of
+    rank_jobs need the whole job list up front and are not applied here.
+    """
+    from rank_jobs import ERROR_RESULT, MODEL, PROMPT_VERSION, calculate_ai_match_score, candidate_resume
+
+    resume = candidate_resume()
+    cache = ScoreCache()
+    cache_version = f"{PROMPT_VERSION}:{MODEL}"
+
+    def process(job):
+        key = make_cache_key(job, resume, cache_version)
+        result = cache.get(key)
+        if result is None:
+            limiter.wait(estimate_tokens(resume + (job.get("description") or "")) + 500)
+            result = calculate_ai_match_score(job)
+            if result == ERROR_RESULT:
+                raise RuntimeError("match scoring failed")
+            cache.put(key, result)
+        return {
+            "match_score": result["match_score"] / 100,
+            "match_reasoning": result["reasoning"],
+            "key_matches": result["key_matches"],
+            "gaps": result["gaps"],
+            "qualified": result["match_score"] >= 80
+        }
+
+    return Stage("rank", process, version=stable_hash(PROMPT_VERSION, MODEL, resume),
+                 workers=RANK_WORKERS, accept=lambda job: not title_excluded(job), close=cache.close)
+
+
+def docs_stage(limiter, full_rewrite=False):
+    from generate_docs import (
+        country_code_for, generate_cover_letter, save_tailored_resume, tailor_resume, tailor_resume_delta
+    )
+    from resume_cache import load_resume, prompt_profile
+    from resume_template import RESUME_LAYOUTS, build_template
+
+    resume = load_resume()
+    if not resume:
+        raise FileNotFoundError("No resume file found (PDF or DOCX)")
+    templates = {country: build_template(resume["profile"], country) for country in RESUME_LAYOUTS}
+    full_rewrite = full_rewrite or not templates["DE"]["experience"]
+    profile_text = prompt_profile(resume)
+    # Resume and cover letter of each job are generated side by side
+    executor = ThreadPoolExecutor(max_workers=2 * DOC_WORKERS)
+
+    def process(job):
+        country = country_code_for(job)
+        job_dir = f"output/{job['company'].replace(' ', '_')}_{stable_hash(job['_key'])[:8]}"
+        os.makedirs(job_dir, exist_ok=True)
+
+        job_tokens = estimate_tokens(job["description"])
+
+        def resume_doc():
+            limiter.wait(job_tokens + estimate_tokens(resume["text"]) * (2 if full_rewrite else 1))
+            if full_rewrite:
+                path = f"{job_dir}/resume.txt"
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(tailor_resume(resume["text"], job["description"], country))
+                return path
+            delta = tailor_resume_delta(templates[country], job["description"], country)
+            return save_tailored_resume(templates[country], delta, f"{job_dir}/resume")
+
+        def cover_doc():
+            limiter.wait(job_tokens + estimate_tokens(profile_text) + 500)
+            path = f"{job_dir}/cover_letter.txt"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(generate_cover_letter(profile_text, job["description"], job["company"], country))
+            return path
+
+        resume_future, cover_future = executor.submit(resume_doc), executor.submit(cover_doc)
+        return {"documents": {"resume": resume_future.result(), "cover_letter": cover_future.result()},
+                "documents_generated": True}
+
+    models = [model_for(stage) for stage in ("resume", "resume-delta", "cover_letter")]
+    return Stage("docs", process, version=stable_hash("docs-v3", resume["text"], full_rewrite, models),
+                 workers=DOC_WORKERS, accept=lambda job: job.get("qualified"), close=executor.shutdown)
+
+
+def sheet_stage():
+    from application_tracker import ApplicationTracker
+    from update_sheet import application_from_job
+
+    tracker = {}
+
+    def process(job):
+        # Single worker, so one SQLite connection created on that thread
+        if "conn" not in tracker:
+            tracker["conn"] = ApplicationTracker()
+        tracker["conn"].upsert_applications([application_from_job(job)])
+        return {"tracked": True}
+
+    return Stage("sheet", process, version="sheet-v1", workers=1, accept=lambda job: job.get("qualified"))
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def run_lock(path=RUN_LOCK_PATH):
+    """Exclusive run lock file; a lock left by a dead process is taken over"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    pid = int(f.read().strip() or 0)
+            except (FileNotFoundError, ValueError):
+                pid = 0
+            if pid and process_alive(pid):
+                raise PipelineBusyError(f"A pipeline run is already in progress (pid {pid})")
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    else:
+        raise PipelineBusyError("Could not acquire the pipeline run lock")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(str(os.getpid()))
+    try:
+        yield
+    finally:
+        os.remove(path)
+
+
+def run_pipeline(source="all", limit=None, generate_docs=True, update_tracker=True,
+                 rerun=(), on_progress=None):
+    """
+    Run the pipeline and merge the qualified jobs into the ranked_jobs store.
+
+    Raises PipelineBusyError if another run is in progress.
+
+    Returns:
+        (qualified jobs sorted by match score, stats dict, list of (stage, job, error))
+    """
+    sources = []
+    if source in ("all", "boards"):
+        sources.append(linkedin_source())
+    if source in ("all", "companies"):
+        sources.append(company_source())
+
+    # One limiter for every LLM call in the run
+    limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+    stages = [rank_stage(limiter)]
+    if generate_docs:
+        stages.append(docs_stage(limiter))
+    if update_tracker:
+        stages.append(sheet_stage())
+
+    with run_lock():
+        METER.reset()
+        checkpoints = CheckpointStore()
+        for stage in rerun:
+            checkpoints.invalidate(stage)
+
+        pipeline = Pipeline(stages, checkpoints)
+        finished = pipeline.run(sources, limit=limit, on_progress=on_progress)
+        checkpoints.close()
+
+        qualified = sorted((job for job in finished if job.get("qualified")),
+                           key=lambda j: j["match_score"], reverse=True)
+        merge_ranked(finished)
+        export_metrics()
+    return qualified, pipeline.stats, pipeline.errors
+
+
+def format_stats(stats):
+    return " | ".join(
+        f"{name}: " + ", ".join(f"{v} {k}" for k, v in counts.items() if v)
+        for name, counts in stats.items() if any(counts.values())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run fetch -> rank -> docs -> sheet with checkpoints")
+    parser.add_argument("--source", choices=["all", "boards", "companies"], default="all")
+    parser.add_argument("--limit", type=int, help="Max unique jobs to take from the sources")
+    parser.add_argument("--no-docs", action="store_true", help="Skip document generation")
+    parser.add_argument("--no-sheet", action="store_true", help="Skip the application tracker update")
+    parser.add_argument("--rerun", nargs="+", choices=STAGES, default=[],
+                        help="Ignore existing checkpoints for these stages")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    last = {"line": ""}
+
+    def on_progress(stats):
+        line = format_stats(stats)
+        if line != last["line"]:
+            print(f"⏳ {line}")
+            last["line"] = line
+
+    try:
+        qualified, stats, errors = run_pipeline(
+            args.source, args.limit, not args.no_docs, not args.no_sheet, args.rerun, on_progress
+        )
+    except PipelineBusyError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    for stage, job, error in errors:
+        print(f"❌ {stage} failed for {job.get('title')} at {job.get('company')}: {error}")
+    print(f"\n✅ {len(qualified)} qualified jobs in {time.perf_counter() - start:.1f}s "
+          f"(saved to data/ranked_jobs.jsonl)")
+    if errors:
+        print(f"   {len(errors)} failures; rerun to retry only those")
+    if format_metrics():
+        print(f"\nLLM usage (data/llm_metrics.json):\n{format_metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Background pipeline runs for the Streamlit dashboard.
+
+Streamlit re-executes app.py on every interaction, so running the pipeline
+inside the script thread freezes the page and a rerun or page switch
+abandons the work. PipelineRunner runs run_pipeline on a daemon thread
+instead, and the page polls snapshot() for live progress.
+
+The module-level RUNNER outlives Streamlit reruns and is shared by every
+session of the server process, so a second start() while a run is active
+is rejected rather than starting a duplicate. run_pipeline's lock file
+covers runs started from other processes (e.g. the CLI).
+
+    if RUNNER.start(source="boards", limit=20):
+        ...
+    progress = RUNNER.snapshot()
+    progress["finished"], progress["throughput"], progress["eta"]
+"""
+import copy
+import threading
+import time
+
+from pipeline import PipelineBusyError, run_pipeline
+
+
+def finished_count(stats):
+    """Jobs that have left the pipeline: failed or skipped at a stage, or through the last one"""
+    stages = [name for name in stats if name != "fetch"]
+    if not stages:
+        return 0
+    count = sum(stats[name]["failed"] + stats[name]["skipped"] for name in stages)
+    return count + stats[stages[-1]]["done"] + stats[stages[-1]]["reused"]
+
+
+class PipelineRunner:
+    """Runs at most one pipeline at a time on a background thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._state = {"status": "idle"}
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, **options):
+        """
+        Start run_pipeline(**options) in the background.
+
+        Returns:
+            True if the run started, False if one is already running
+        """
+        with self._lock:
+            if self.is_running():
+                return False
+            self._state = {
+                "status": "running", "options": options, "started": time.time(), "ended": None,
+                "limit": options.get("limit"), "stats": {},
+                "qualified": [], "errors": [], "error": None
+            }
+            self._thread = threading.Thread(target=self._run, args=(options,), daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, options):
+        def on_progress(stats):
+            with self._lock:
+                self._state["stats"] = copy.deepcopy(stats)
+
+        try:
+            qualified, stats, errors = run_pipeline(on_progress=on_progress, **options)
+        except PipelineBusyError as e:
+            self._finish("busy", error=str(e))
+        except Exception as e:
+            self._finish("failed", error=str(e))
+        else:
+            self._finish("done", stats=copy.deepcopy(stats), qualified=qualified, errors=errors)
+
+    def _finish(self, status, **updates):
+        with self._lock:
+            self._state.update(updates, status=status, ended=time.time())
+
+    def snapshot(self):
+        """
+        Current run state, safe to read from any thread.
+
+        Returns:
+            Dictionary with status ("idle", "running", "done", "failed" or
+            "busy"), per-stage stats, fetched/finished job counts, elapsed
+            seconds, throughput (finished jobs per minute), eta (seconds, or
+            None while unknown), and the qualified jobs and errors of a
+            finished run
+        """
+        with self._lock:
+            state = copy.copy(self._state)
+        if state["status"] == "idle":
+            return state
+
+        stats = state["stats"]
+        fetched = stats.get("fetch", {}).get("done", 0)
+        finished = finished_count(stats)
+        elapsed = (state["ended"] or time.time()) - state["started"]
+        rate = finished / elapsed if elapsed else 0
+
+        # Until fetching is over the total is only known if there is a limit
+        total = fetched
+        if state["status"] == "running" and state["limit"] and fetched < state["limit"]:
+            total = state["limit"]
+        eta = None
+        if state["status"] == "running" and rate:
+            eta = max(total - finished, 0) / rate
+        elif state["status"] != "running":
+            eta = 0
+
+        state.update(fetched=fetched, finished=finished, total=total, elapsed=elapsed,
+                     throughput=rate * 60, eta=eta)
+        return state
+
+
+RUNNER = PipelineRunner()
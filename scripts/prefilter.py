@@ -0,0 +1,235 @@
+"""Cheap local pre-scoring of jobs before the LLM ranker.
+
+Builds a sparse TF-IDF representation of all job postings at once, scores it
+against the resume and JOB_CRITERIA keywords, drops titles matching
+exclude_keywords, and passes only the jobs above a score threshold (and,
+with --top-k, at most that many of the best) on to rank_jobs.
+
+Usage:
+    python scripts/prefilter.py            # preview scores for the raw_jobs store
+    python scripts/prefilter.py --report   # recall vs. cutoff from logged LLM scores
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import JOB_CRITERIA
+from job_store import load_jobs
+
+PREFILTER_LOG = "data/prefilter_log.jsonl"
+
+DEFAULT_TOP_K = None  # no cap: every job above the threshold reaches the LLM
+DEFAULT_THRESHOLD = 0.1
+QUALIFY_SCORE = 80  # LLM score a job needs to count as a true match
+
+# Weight of resume similarity vs. keyword coverage in the combined score
+SIMILARITY_WEIGHT = 0.6
+KEYWORD_WEIGHT = 0.4
+
+TOKEN_RE = re.compile(r"[\w+#]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def job_text(job):
+    # Title counts twice: it is the strongest signal in short postings
+    return f"{job.get('title', '')} {job.get('title', '')} {job.get('description', '')}"
+
+
+def build_tfidf(docs):
+    """Sparse TF-IDF matrix in COO form.
+
+    Returns (rows, cols, weights, vocab, idf) where rows/cols/weights are
+    parallel arrays of the non-zero entries.
+    """
+    vocab = {}
+    rows, cols = [], []
+    for row, doc in enumerate(docs):
+        for token in tokenize(doc):
+            rows.append(row)
+            cols.append(vocab.setdefault(token, len(vocab)))
+
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    if not len(rows):
+        empty = np.zeros(0)
+        return rows, cols, empty, vocab, empty
+
+    # Collapse repeated (doc, term) pairs into counts
+    pairs, counts = np.unique(rows * len(vocab) + cols, return_counts=True)
+    rows, cols = np.divmod(pairs, len(vocab))
+
+    df = np.bincount(cols, minlength=len(vocab))
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    weights = (1 + np.log(counts)) * idf[cols]
+    return rows, cols, weights, vocab, idf
+
+
+def query_vector(text, vocab, idf):
+    """TF-IDF vector for the query over the job vocabulary"""
+    ids = [vocab[t] for t in tokenize(text) if t in vocab]
+    vector = np.zeros(len(vocab))
+    if ids:
+        counts = np.bincount(ids, minlength=len(vocab)).astype(float)
+        nonzero = counts > 0
+        vector[nonzero] = (1 + np.log(counts[nonzero])) * idf[nonzero]
+    return vector
+
+
+def keyword_coverage(texts, keywords):
+    """Fraction of keywords (phrases allowed) found in each text"""
+    if not keywords:
+        return np.zeros(len(texts))
+    patterns = [re.compile(rf"\b{re.escape(k.lower())}\b") for k in keywords]
+    hits = np.array([[bool(p.search(t)) for p in patterns] for t in texts], dtype=float)
+    return hits.mean(axis=1)
+
+
+def excluded_titles(jobs, exclude_keywords):
+    """Boolean mask of jobs whose title contains an excluded keyword"""
+    if not exclude_keywords:
+        return np.zeros(len(jobs), dtype=bool)
+    pattern = re.compile("|".join(rf"\b{re.escape(k.lower())}\b" for k in exclude_keywords))
+    return np.array([bool(pattern.search((j.get("title") or "").lower())) for j in jobs], dtype=bool)
+
+
+def prefilter_scores(jobs, resume, criteria=JOB_CRITERIA):
+    """Score all jobs against the resume and keywords in one vectorized pass.
+
+    Returns (scores, excluded) arrays; scores are in [0, 1].
+    """
+    if not jobs:
+        return np.zeros(0), np.zeros(0, dtype=bool)
+
+    texts = [job_text(j).lower() for j in jobs]
+    keywords = criteria.get("keywords", [])
+    rows, cols, weights, vocab, idf = build_tfidf(texts)
+
+    query = query_vector(f"{resume} {' '.join(keywords)}", vocab, idf)
+    dot = np.bincount(rows, weights=weights * query[cols], minlength=len(jobs))
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(jobs)))
+    query_norm = np.linalg.norm(query)
+    similarity = np.divide(dot, norms * query_norm, out=np.zeros(len(jobs)), where=norms * query_norm > 0)
+
+    scores = SIMILARITY_WEIGHT * similarity + KEYWORD_WEIGHT * keyword_coverage(texts, keywords)
+    return scores, excluded_titles(jobs, criteria.get("exclude_keywords", []))
+
+
+def prefilter_jobs(jobs, resume, top_k=DEFAULT_TOP_K, threshold=DEFAULT_THRESHOLD):
+    """Split jobs into (passed, rejected, capped).
+
+    Passed jobs score at least `threshold` and are among the `top_k` best;
+    `capped` counts rejected jobs above the threshold that only the top_k cap
+    cut. Every job gets a "prefilter_score" field (None if excluded by title).
+    """
+    scores, excluded = prefilter_scores(jobs, resume)
+
+    order = np.argsort(-scores, kind="stable")
+    passed, rejected = [], []
+    capped = 0
+    for i in order:
+        job = jobs[i]
+        if excluded[i]:
+            job["prefilter_score"] = None
+            rejected.append(job)
+        elif scores[i] >= threshold and (top_k is None or len(passed) < top_k):
+            job["prefilter_score"] = round(float(scores[i]), 4)
+            passed.append(job)
+        else:
+            job["prefilter_score"] = round(float(scores[i]), 4)
+            rejected.append(job)
+            if scores[i] >= threshold:
+                capped += 1
+
+    return passed, rejected, capped
+
+
+def record_recall(passed, audited, rejected_count, log_path=PREFILTER_LOG):
+    """Log pre-filter vs. LLM scores and return the estimated recall.
+
+    `passed` and `audited` are jobs carrying both "prefilter_score" and an
+    LLM "match_score" (0-1); `audited` is a random sample of the
+    `rejected_count` jobs the pre-filter dropped on score.
+    """
+    qualified_passed = sum(1 for j in passed if j["match_score"] * 100 >= QUALIFY_SCORE)
+    qualified_audited = sum(1 for j in audited if j["match_score"] * 100 >= QUALIFY_SCORE)
+
+    # Scale the audit sample up to all score-rejected jobs
+    missed = qualified_audited * rejected_count / len(audited) if audited else 0.0
+    total = qualified_passed + missed
+    recall = qualified_passed / total if total else None
+
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        for job, was_passed in [(j, True) for j in passed] + [(j, False) for j in audited]:
+            f.write(json.dumps({
+                "time": time.time(),
+                "title": job.get("title"),
+                "company": job.get("company"),
+                "prefilter_score": job["prefilter_score"],
+                "passed": was_passed,
+                "llm_score": round(job["match_score"] * 100),
+            }, ensure_ascii=False) + "\n")
+
+    return recall
+
+
+def recall_report(log_path=PREFILTER_LOG, cutoffs=(0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4)):
+    """Print recall and pass rate for candidate cutoffs over all logged jobs"""
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        print(f"No pre-filter log yet ({log_path}); run rank_jobs.py with --prefilter-audit")
+        return
+
+    scores = np.array([r["prefilter_score"] for r in rows], dtype=float)
+    qualified = np.array([r["llm_score"] >= QUALIFY_SCORE for r in rows])
+    print(f"{len(rows)} logged jobs, {int(qualified.sum())} qualified (LLM {QUALIFY_SCORE}%+)\n")
+    print("cutoff  recall  pass rate")
+    for cutoff in cutoffs:
+        kept = scores >= cutoff
+        recall = (kept & qualified).sum() / qualified.sum() if qualified.any() else float("nan")
+        print(f"{cutoff:6.2f}  {recall:6.1%}  {kept.mean():8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local TF-IDF pre-filter for job postings")
+    parser.add_argument("--report", action="store_true", help="Show recall by cutoff from the log")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Max jobs to pass (default: no cap)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.report:
+        recall_report()
+        return
+
+    from rank_jobs import candidate_resume
+
+    jobs = load_jobs("raw_jobs")
+    if not jobs:
+        print("Error: Run fetch_jobs.py first")
+        return
+
+    passed, rejected, capped = prefilter_jobs(jobs, candidate_resume(), args.top_k, args.threshold)
+    print(f"Passed {len(passed)}/{len(jobs)} jobs to the LLM ranker")
+    if capped:
+        print(f"⚠️ {capped} jobs above the threshold were cut by --top-k {args.top_k}")
+    print()
+    for job in passed + rejected:
+        score = job["prefilter_score"]
+        mark = "✓" if any(job is p for p in passed) else "✗"
+        label = "excluded" if score is None else f"{score:.3f}"
+        print(f"{mark} {label:>8}  {job.get('title')} at {job.get('company')}")
+
+
+if __name__ == "__main__":
+    main()
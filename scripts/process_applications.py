@@ -1,9 +1,18 @@
 import os
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from openai import OpenAI
 from datetime import datetime
-import time
+
+from doc_pipeline import DocumentPipeline
+from generate_docs import country_code_for, save_tailored_resume, tailor_resume_delta
+from llm_gateway import complete, export_metrics, format_metrics
+from prompts import profile_cover_letter_messages, profile_resume_messages
+from rate_limit import estimate_tokens
+from resume_cache import load_resume, prompt_profile
+from resume_template import DELTA_MAX_TOKENS, RESUME_LAYOUTS, build_template
+from sheet_sync import SheetSync
+
+CHECKPOINT_PATH = 'data/sheet_doc_checkpoint.json'
 
 def connect_to_sheets():
     scope = [
@@ -18,122 +27,117 @@ def connect_to_sheets():
     sheet_id = os.environ['SHEET_ID']
     return client.open_by_key(sheet_id)
 
-def get_job_listings(sheet):
-    worksheet = sheet.worksheet('Jobs')
-    records = worksheet.get_all_records()
-    return [r for r in records if r.get('Status') == 'New']
+def get_job_listings(sync):
+    """
+    Jobs to process as (sheet row number, record) pairs from the worksheet snapshot.
+    
+    'Error' rows are retried; documents already written for them are reused
+    from the checkpoint.
+    """
+    return [(row_number, r) for row_number, r in sync.records() if r.get('Status') in ('New', 'Error')]
 
 def generate_resume_with_openai(job, user_profile):
-    client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-    
-    prompt = f"""Create a tailored resume for the following job posting:
-
-Job Title: {job.get('Title', 'N/A')}
-Company: {job.get('Company', 'N/A')}
-Location: {job.get('Location', 'N/A')}
-Description: {job.get('Description', 'N/A')}
-
-Candidate Profile:
-{user_profile}
-
-Generate a professional resume in markdown format that highlights relevant experience and skills for this position."""
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a professional resume writer who creates ATS-friendly, tailored resumes."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=2000
-    )
-    
-    return response.choices[0].message.content
+    return complete("resume", profile_resume_messages(job, user_profile), max_tokens=2000)
 
 def generate_cover_letter(job, user_profile):
-    client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
-    
-    prompt = f"""Create a compelling cover letter for the following job:
-
-Job Title: {job.get('Title', 'N/A')}
-Company: {job.get('Company', 'N/A')}
-Location: {job.get('Location', 'N/A')}
-Description: {job.get('Description', 'N/A')}
-
-Candidate Profile:
-{user_profile}
+    return complete("cover", profile_cover_letter_messages(job, user_profile), max_tokens=1000)
 
-Write a professional cover letter that demonstrates enthusiasm and fit for this role."""
-    
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "You are a professional career coach who writes compelling cover letters."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=1000
-    )
-    
-    return response.choices[0].message.content
-
-def save_documents(resume, cover_letter, job_title, company):
+def document_stem(kind, job_title, company, timestamp):
     os.makedirs('output/resumes', exist_ok=True)
     
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     safe_company = company.replace(' ', '_').replace('/', '_')
     safe_title = job_title.replace(' ', '_').replace('/', '_')
-    
-    resume_path = f'output/resumes/{safe_company}_{safe_title}_{timestamp}_resume.md'
-    cover_path = f'output/resumes/{safe_company}_{safe_title}_{timestamp}_cover.md'
-    
-    with open(resume_path, 'w', encoding='utf-8') as f:
-        f.write(resume)
-    
-    with open(cover_path, 'w', encoding='utf-8') as f:
-        f.write(cover_letter)
-    
-    print(f"Documents saved for {company} - {job_title}")
+    return f'output/resumes/{safe_company}_{safe_title}_{timestamp}_{kind}'
+
+def save_document(kind, text, job_title, company, timestamp):
+    """Write one generated document; kind is 'resume' or 'cover'"""
+    path = f'{document_stem(kind, job_title, company, timestamp)}.md'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
 
-def update_job_status(sheet, row_number, status):
-    worksheet = sheet.worksheet('Jobs')
-    worksheet.update_cell(row_number + 2, worksheet.find('Status').col, status)
+def update_job_status(sync, row_number, status):
+    """Buffer a status change; written to the sheet by sync.flush()"""
+    sync.set(row_number, 'Status', status)
+
+def process_jobs(sync, jobs, user_profile):
+    """Generate resumes and cover letters for all jobs in parallel"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    rows = {}
+    keyed_jobs = []
+    for row_number, job in jobs:
+        key = f"{row_number}:{job.get('Company', '')}:{job.get('Title', '')}"
+        rows[key] = row_number
+        keyed_jobs.append((key, job))
+    
+    # With a resume file on disk, resumes are template deltas rendered locally
+    resume = load_resume()
+    templates = {country: build_template(resume["profile"], country) for country in RESUME_LAYOUTS} if resume else {}
+    use_templates = bool(templates and templates["DE"]["experience"])
+    
+    def country_of(job):
+        return country_code_for({'location': job.get('Location', '')})
+    
+    def save(key, job, doc_name, text):
+        if doc_name == 'resume' and use_templates:
+            stem = document_stem(doc_name, job.get('Title', 'Unknown'), job.get('Company', 'Unknown'), timestamp)
+            return save_tailored_resume(templates[country_of(job)], text, stem)
+        return save_document(doc_name, text, job.get('Title', 'Unknown'), job.get('Company', 'Unknown'), timestamp)
+    
+    def on_job_done(key, job, paths, errors):
+        if errors:
+            print(f"Error processing {job.get('Title')} at {job.get('Company')}: "
+                  f"{'; '.join(str(e) for e in errors.values())}")
+            update_job_status(sync, rows[key], 'Error')
+        else:
+            print(f"Successfully processed: {job.get('Title')} at {job.get('Company')}")
+            update_job_status(sync, rows[key], 'Processed')
+    
+    def input_tokens(job):
+        return estimate_tokens(f"{job.get('Description', '')}\n{user_profile}")
+    
+    if use_templates:
+        resume_generator = (lambda job: tailor_resume_delta(templates[country_of(job)], job.get('Description', ''), country_of(job)),
+                            lambda job: input_tokens(job) + DELTA_MAX_TOKENS)
+    else:
+        resume_generator = (lambda job: generate_resume_with_openai(job, user_profile),
+                            lambda job: input_tokens(job) + 2000)
+    
+    pipeline = DocumentPipeline(
+        {
+            'resume': resume_generator,
+            'cover': (lambda job: generate_cover_letter(job, user_profile),
+                      lambda job: input_tokens(job) + 1000)
+        },
+        save,
+        checkpoint_path=CHECKPOINT_PATH
+    )
+    pipeline.run(keyed_jobs, on_job_done)
 
 def main():
+    resume = load_resume()
+    if not resume:
+        print("❌ Error: No resume file found (PDF or DOCX)")
+        return
+    user_profile = prompt_profile(resume)
+    
     print("Connecting to Google Sheets...")
     sheet = connect_to_sheets()
     
-    user_profile = """Master's student in Business Analytics with 3+ years of experience in market data management and competitive analysis. Strong background in data analytics, ETL processes, business intelligence (Power BI, Google Data Studio), and project management. Proficient in SQL and Python. Seeking project management and PMO roles in Munich."""
-    
     print("Fetching job listings...")
-    jobs = get_job_listings(sheet)
-    print(f"Found {len(jobs)} new job listings")
+    sync = SheetSync(sheet.worksheet('Jobs'))
+    jobs = get_job_listings(sync)
+    print(f"Found {len(jobs)} new or failed job listings")
     
-    for idx, job in enumerate(jobs, 1):
-        print(f"\nProcessing job {idx}/{len(jobs)}: {job.get('Title')} at {job.get('Company')}")
-        
-        try:
-            resume = generate_resume_with_openai(job, user_profile)
-            time.sleep(1)
-            
-            cover_letter = generate_cover_letter(job, user_profile)
-            time.sleep(1)
-            
-            save_documents(
-                resume, 
-                cover_letter, 
-                job.get('Title', 'Unknown'), 
-                job.get('Company', 'Unknown')
-            )
-            
-            update_job_status(sheet, idx - 1, 'Processed')
-            print(f"Successfully processed: {job.get('Title')} at {job.get('Company')}")
-            
-        except Exception as e:
-            print(f"Error processing job: {str(e)}")
-            update_job_status(sheet, idx - 1, 'Error')
+    try:
+        process_jobs(sync, jobs, user_profile)
+    finally:
+        sync.flush()
     
     print("\nJob processing complete!")
+    if format_metrics():
+        print(f"LLM usage:\n{format_metrics()}")
+        export_metrics()
 
 if __name__ == '__main__':
     main()
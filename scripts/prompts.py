@@ -0,0 +1,175 @@
+"""Shared prompt layout for every LLM call.
+
+Providers cache prompt prefixes: a request whose leading tokens exactly
+match a recent request's is billed and processed faster for that part
+(OpenAI caches in 128-token steps once the prompt exceeds 1024 tokens).
+Every prompt here is therefore built in the same order:
+
+    system:  SYSTEM_PREFIX            shared by all calls
+             CANDIDATE RESUME         static for the run
+             TASK                     static per call type
+    user:    per-job content          the only part that changes
+
+so everything before the job text is a byte-identical prefix across calls
+of the same type, and calls using the same resume share the leading
+system prefix and resume across types.
+
+Calls go through llm_gateway, which meters cached vs uncached input tokens:
+
+    result = match_result(complete_json("match", match_messages(job, resume)))
+"""
+import re
+
+SYSTEM_PREFIX = ("You are an expert career advisor, recruiter and resume writer helping one candidate "
+                 "apply for jobs. Stay truthful to the candidate's resume; never invent experience.")
+
+MATCH_INSTRUCTIONS = """Compare the job posting in the next message with the candidate's resume and provide a match score.
+
+1. Analyze how well the candidate's skills, experience, and background match the job requirements
+2. Consider: required skills, years of experience, education, location fit
+3. Provide a match score from 0-100%
+4. Be realistic and honest in your assessment
+
+RESPONSE FORMAT:
+Return ONLY a JSON object with this exact structure:
+{
+    "match_score": <number between 0-100>,
+    "reasoning": "<brief explanation of the match>",
+    "key_matches": ["<skill/experience 1>", "<skill/experience 2>"],
+    "gaps": ["<missing requirement 1>", "<missing requirement 2>"]
+}"""
+
+BATCH_MATCH_INSTRUCTIONS = """Compare each job posting in the next message with the candidate's resume and provide a match score for every job.
+
+1. Analyze how well the candidate's skills, experience, and background match each job's requirements
+2. Consider: required skills, years of experience, education, location fit
+3. Provide a match score from 0-100% for each job, judging every job independently
+4. Be realistic and honest in your assessment
+
+RESPONSE FORMAT:
+Return ONLY a JSON array with one object per job, using the job's ID exactly as given:
+[
+    {
+        "id": "<job ID>",
+        "match_score": <number between 0-100>,
+        "reasoning": "<brief explanation of the match>",
+        "key_matches": ["<skill/experience 1>", "<skill/experience 2>"],
+        "gaps": ["<missing requirement 1>", "<missing requirement 2>"]
+    }
+]"""
+
+RESUME_INSTRUCTIONS = """Tailor the candidate's resume to the job description in the next message.
+
+Create a tailored resume that:
+1. Highlights relevant skills and experiences
+2. Uses keywords from the job description
+3. Follows the resume format requirements given with the job
+4. Maintains truthfulness
+5. Is ATS-friendly
+
+Return only the tailored resume text."""
+
+RESUME_DELTA_INSTRUCTIONS = """Tailor the candidate's resume (IDs in brackets) to the job in the next message by returning ONLY a JSON object, no other text. You reorder and emphasize; you never invent experience.
+
+Return:
+{"summary": "2-3 sentence summary tailored to the job, truthful to the resume",
+  "skills_order": ["existing skills, most relevant first"],
+  "bullet_order": {"<entry ID>": ["<bullet IDs, most relevant first>"]},
+  "emphasize": ["up to 5 job keywords that already appear in the resume"]}"""
+
+COVER_LETTER_INSTRUCTIONS = """Write a compelling cover letter for the job application in the next message.
+
+Create a cover letter that:
+1. Is specific to the role and company
+2. Highlights relevant achievements
+3. Shows enthusiasm and cultural fit
+4. Follows the business writing conventions of the job's country
+5. Is concise (max 350 words)
+
+Return only the cover letter text."""
+
+PROFILE_RESUME_INSTRUCTIONS = """Create a tailored resume for the job posting in the next message.
+
+Generate a professional, ATS-friendly resume in markdown format that highlights relevant experience and skills for this position."""
+
+PROFILE_COVER_LETTER_INSTRUCTIONS = """Create a compelling cover letter for the job posting in the next message.
+
+Write a professional cover letter that demonstrates enthusiasm and fit for this role."""
+
+
+def match_result(data):
+    """
+    Validate a match response (MATCH_INSTRUCTIONS format), coercing near-misses.
+
+    Raises:
+        ValueError: if there is no usable match_score
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Match response is not a JSON object")
+    score = data.get("match_score")
+    if isinstance(score, str):
+        # "85%", "85/100"
+        found = re.match(r"\s*(\d+(?:\.\d+)?)", score)
+        score = float(found.group(1)) if found else None
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        raise ValueError(f"Invalid match_score: {data.get('match_score')!r}")
+
+    def as_list(value):
+        return value if isinstance(value, list) else [value] if value else []
+
+    return {
+        "match_score": min(max(float(score), 0.0), 100.0),
+        "reasoning": str(data.get("reasoning") or ""),
+        "key_matches": as_list(data.get("key_matches")),
+        "gaps": as_list(data.get("gaps"))
+    }
+
+
+def build_messages(resume, instructions, job_content):
+    """Static prefix (shared system text, resume, task) first; per-job content last"""
+    return [
+        {"role": "system", "content": f"{SYSTEM_PREFIX}\n\nCANDIDATE RESUME:\n{resume.strip()}\n\nTASK:\n{instructions}"},
+        {"role": "user", "content": job_content}
+    ]
+
+
+def posting_text(job, fields=("title", "company", "location", "description")):
+    """Job posting lines; `fields` are the job's keys (sheet rows use 'Title', ...)"""
+    return "\n".join(f"{field.title()}: {job.get(field) or 'N/A'}" for field in fields)
+
+
+def match_messages(job, resume):
+    return build_messages(resume, MATCH_INSTRUCTIONS, f"JOB POSTING:\n{posting_text(job)}")
+
+
+def batch_match_messages(postings, count, resume):
+    return build_messages(resume, BATCH_MATCH_INSTRUCTIONS, f"JOB POSTINGS ({count}):\n\n{postings}")
+
+
+def resume_messages(resume_text, job_description, country, format_instructions):
+    return build_messages(resume_text, RESUME_INSTRUCTIONS,
+                          f"Resume Format Requirements ({country}):\n{format_instructions}\n\n"
+                          f"Job Description:\n{job_description}")
+
+
+def resume_delta_messages(outline, job_description, country, format_instructions):
+    """`outline` is resume_template.template_outline() of the base template"""
+    return build_messages(outline, RESUME_DELTA_INSTRUCTIONS,
+                          f"Resume format ({country}): {format_instructions}\n\n"
+                          f"Job Description:\n{job_description}")
+
+
+def cover_letter_messages(resume_text, job_description, company_name, country):
+    return build_messages(resume_text, COVER_LETTER_INSTRUCTIONS,
+                          f"Company: {company_name}\nCountry: {country}\n\nJob Description:\n{job_description}")
+
+
+def profile_resume_messages(job, user_profile):
+    """For worksheet rows ('Title', 'Company', ... columns)"""
+    return build_messages(user_profile, PROFILE_RESUME_INSTRUCTIONS,
+                          posting_text(job, ("Title", "Company", "Location", "Description")))
+
+
+def profile_cover_letter_messages(job, user_profile):
+    return build_messages(user_profile, PROFILE_COVER_LETTER_INSTRUCTIONS,
+                          posting_text(job, ("Title", "Company", "Location", "Description")))
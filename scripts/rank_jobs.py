@@ -1,13 +1,23 @@
 """Rank and filter jobs using AI-powered resume matching"""
-import json
+import argparse
+import asyncio
+import functools
 import os
+import random
 import sys
 import time
-from openai import OpenAI
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import job_store
+from scoring_engine import DEFAULT_CONCURRENCY, ScoringEngine, response_text
+from score_cache import ScoreCache, make_cache_key
+from batch_scoring import BATCH_PROMPT_VERSION, score_jobs_in_batches
+from llm_gateway import complete_json, export_metrics, format_metrics, model_for, parse_json, prompt_usage
+from prompts import match_messages, match_result
+from prefilter import DEFAULT_THRESHOLD, DEFAULT_TOP_K, prefilter_jobs, record_recall
+from resume_cache import load_resume, prompt_profile
 
-# Your resume profile
+# Resume profile used when there is no resume file to parse
 USER_RESUME = """
 Master's student in Business Analytics with 3+ years of experience in market data management and competitive analysis. 
 
@@ -34,107 +44,185 @@ SEEKING:
 - Business Analyst roles
 """
 
+MODEL = model_for("match")
+
+# Bump whenever the scoring prompt changes so cached scores are not reused
+PROMPT_VERSION = "match-v3"
+
+ERROR_RESULT = {
+    "match_score": 0,
+    "reasoning": "Error in analysis",
+    "key_matches": [],
+    "gaps": []
+}
+
+@functools.lru_cache(maxsize=None)
+def candidate_resume():
+    """The resume for match prompts: the parsed resume file's compact profile, else USER_RESUME"""
+    resume = load_resume()
+    return prompt_profile(resume) if resume else USER_RESUME
+
 def calculate_ai_match_score(job):
     """Use OpenAI to calculate match score between job and resume"""
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    
-    prompt = f"""You are an expert career advisor. Compare this job description with the candidate's resume and provide a match score.
-
-JOB POSTING:
-Title: {job.get('title', 'N/A')}
-Company: {job.get('company', 'N/A')}
-Location: {job.get('location', 'N/A')}
-Description: {job.get('description', 'N/A')}
-
-CANDIDATE RESUME:
-{USER_RESUME}
-
-INSTRUCTIONS:
-1. Analyze how well the candidate's skills, experience, and background match the job requirements
-2. Consider: required skills, years of experience, education, location fit
-3. Provide a match score from 0-100%
-4. Be realistic and honest in your assessment
-
-RESPONSE FORMAT:
-Return ONLY a JSON object with this exact structure:
-{{
-    "match_score": <number between 0-100>,
-    "reasoning": "<brief explanation of the match>",
-    "key_matches": ["<skill/experience 1>", "<skill/experience 2>"],
-    "gaps": ["<missing requirement 1>", "<missing requirement 2>"]
-}}"""
-    
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert career advisor and recruiter who evaluates job-candidate fit."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result
-        
+        return match_result(complete_json("match", match_messages(job, candidate_resume()), max_tokens=500))
     except Exception as e:
         print(f"Error calculating AI match for {job.get('title')}: {e}")
-        return {
-            "match_score": 0,
-            "reasoning": "Error in analysis",
-            "key_matches": [],
-            "gaps": []
-        }
-
-def main():
+        return dict(ERROR_RESULT)
+
+def score_jobs_concurrently(jobs, concurrency):
+    """Score all jobs through the async engine, printing results as they arrive"""
+    engine = ScoringEngine(concurrency=concurrency, model=MODEL, stage="match", json_mode=True)
+    results = [None] * len(jobs)
+    
+    def on_result(index, response):
+        job = jobs[index]
+        cached = ""
+        try:
+            if isinstance(response, Exception):
+                raise response
+            usage = prompt_usage(response.get("usage", {}))
+            cached = f" ({usage['cached_tokens']}/{usage['prompt_tokens']} input tokens cached)"
+            results[index] = match_result(parse_json(response_text(response)))
+        except Exception as e:
+            print(f"Error calculating AI match for {job.get('title')}: {e}")
+            results[index] = dict(ERROR_RESULT)
+        print(f"Scored {job.get('title')} at {job.get('company')}: {results[index]['match_score']}%{cached}")
+    
+    requests = [(match_messages(job, candidate_resume()), 500) for job in jobs]
+    asyncio.run(engine.run(requests, on_result=on_result))
+    
+    print(f"\nEngine stats: {engine.stats}\n")
+    return results
+
+def score_jobs_batched(jobs, concurrency):
+    """Score jobs several per request, sharing the resume and instructions"""
+    engine = ScoringEngine(concurrency=concurrency, model=model_for("match-batch"), stage="match-batch")
+    results = score_jobs_in_batches(jobs, candidate_resume(), engine, ERROR_RESULT)
+    print(f"\nEngine stats: {engine.stats}\n")
+    return results
+
+def apply_match_result(job, ai_result):
+    """Copy the AI result onto the job; return True if it qualifies"""
+    job["match_score"] = ai_result["match_score"] / 100  # Convert to 0-1 scale
+    job["match_reasoning"] = ai_result["reasoning"]
+    job["key_matches"] = ai_result["key_matches"]
+    job["gaps"] = ai_result["gaps"]
+    
+    # Only keep jobs with 80%+ match
+    return ai_result["match_score"] >= 80
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rank jobs by AI resume match")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Max in-flight OpenAI requests (1 = sequential)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached scores and call the API for every job")
+    parser.add_argument("--batch", action="store_true",
+                        help="Pack several jobs into each request to cut repeated prompt tokens")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="Send every job to the LLM, skipping the local TF-IDF pre-filter")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K,
+                        help="Max jobs the pre-filter passes to the LLM (default: no cap)")
+    parser.add_argument("--prefilter-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Min pre-filter score (0-1) to reach the LLM")
+    parser.add_argument("--prefilter-audit", type=int, default=3,
+                        help="Rejected jobs to LLM-score anyway, to measure pre-filter recall")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("\n" + "="*50)
     print("AI-Powered Job Matcher")
     print("="*50 + "\n")
     
-    try:
-        with open("data/raw_jobs.json", "r", encoding="utf-8") as f:
-            jobs = json.load(f)
-    except FileNotFoundError:
+    if not job_store.exists("raw_jobs"):
         print("Error: Run fetch_jobs.py first")
         return
+    jobs = job_store.load_jobs("raw_jobs")
+    
+    audited = []
+    if not args.no_prefilter:
+        total = len(jobs)
+        jobs, rejected, capped = prefilter_jobs(jobs, candidate_resume(), args.top_k, args.prefilter_threshold)
+        score_rejected = [j for j in rejected if j["prefilter_score"] is not None]
+        audited = random.sample(score_rejected, min(args.prefilter_audit, len(score_rejected)))
+        print(f"Pre-filter: {len(jobs)}/{total} jobs passed, "
+              f"{len(rejected) - len(score_rejected)} excluded by title, auditing {len(audited)} rejected")
+        if capped:
+            print(f"⚠️ {capped} jobs above the threshold were cut by --top-k {args.top_k}")
+        print()
+        jobs = jobs + audited
     
     print(f"Total jobs to analyze: {len(jobs)}")
     print("Using OpenAI to calculate match scores...\n")
     
+    cache = None if args.no_cache else ScoreCache()
+    cache_version = f"{BATCH_PROMPT_VERSION if args.batch else PROMPT_VERSION}:{MODEL}"
+    
+    results = [None] * len(jobs)
+    if cache:
+        for i, job in enumerate(jobs):
+            results[i] = cache.get(make_cache_key(job, candidate_resume(), cache_version))
+        print(f"Score cache: {cache.hits} hits, {cache.misses} misses\n")
+    
+    misses = [i for i, result in enumerate(results) if result is None]
+    if misses and args.batch:
+        print(f"Scoring {len(misses)} jobs in batches with up to {args.concurrency} concurrent requests...\n")
+        fresh = score_jobs_batched([jobs[i] for i in misses], args.concurrency)
+        for i, ai_result in zip(misses, fresh):
+            results[i] = ai_result
+    elif misses and args.concurrency > 1:
+        print(f"Scoring {len(misses)} jobs with up to {args.concurrency} concurrent requests...\n")
+        fresh = score_jobs_concurrently([jobs[i] for i in misses], args.concurrency)
+        for i, ai_result in zip(misses, fresh):
+            results[i] = ai_result
+    else:
+        for n, i in enumerate(misses, 1):
+            job = jobs[i]
+            print(f"Analyzing {n}/{len(misses)}: {job.get('title')} at {job.get('company')}...")
+            
+            results[i] = calculate_ai_match_score(job)
+            print(f"   Match: {results[i]['match_score']}%")
+            
+            # Rate limiting
+            time.sleep(1)
+            print()
+    
+    unscored = [jobs[i] for i in misses if results[i] == ERROR_RESULT]
+    if unscored:
+        print(f"⚠️  {len(unscored)} jobs could not be scored and are left out of this ranking; "
+              f"rerun to retry them: {', '.join(str(j.get('title')) for j in unscored[:5])}\n")
+    
+    if cache:
+        for i in misses:
+            # Failed calls are retried next run rather than cached as a zero score
+            if results[i] != ERROR_RESULT:
+                cache.put(make_cache_key(jobs[i], candidate_resume(), cache_version), results[i])
+        cache.close()
+    
     scored_jobs = []
-    for i, job in enumerate(jobs, 1):
-        print(f"Analyzing {i}/{len(jobs)}: {job.get('title')} at {job.get('company')}...")
-        
-        ai_result = calculate_ai_match_score(job)
-        
-        job["match_score"] = ai_result["match_score"] / 100  # Convert to 0-1 scale
-        job["match_reasoning"] = ai_result["reasoning"]
-        job["key_matches"] = ai_result["key_matches"]
-        job["gaps"] = ai_result["gaps"]
-        
-        print(f"   Match: {ai_result['match_score']}%")
-        
-        # Only keep jobs with 80%+ match
-        if ai_result["match_score"] >= 80:
+    for job, ai_result in zip(jobs, results):
+        job["qualified"] = apply_match_result(job, ai_result)
+        if job["qualified"]:
             scored_jobs.append(job)
-            print(f"   ✓ QUALIFIED - Adding to pipeline")
-        else:
-            print(f"   ✗ Below threshold (need 80%+)")
-        
-        # Rate limiting
-        time.sleep(1)
-        print()
+    
+    if not args.no_prefilter:
+        passed = jobs[:len(jobs) - len(audited)]
+        recall = record_recall(passed, audited, len(score_rejected))
+        if recall is not None:
+            print(f"Pre-filter estimated recall: {recall:.0%} (see: python scripts/prefilter.py --report)\n")
     
     # Sort by match score
     scored_jobs.sort(key=lambda x: x["match_score"], reverse=True)
     
-    # Save results
-    with open("data/ranked_jobs.json", "w", encoding="utf-8") as f:
-        json.dump(scored_jobs, f, indent=2, ensure_ascii=False)
+    # Save results: raw_jobs only holds newly fetched jobs, so merge rather than replace;
+    # jobs that could not be scored keep their earlier record
+    stored = job_store.merge_ranked(job for job, ai_result in zip(jobs, results) if ai_result != ERROR_RESULT)
     
     print("="*50)
-    print(f"RESULTS: {len(scored_jobs)} jobs qualified (80%+ match)")
+    print(f"RESULTS: {len(scored_jobs)} jobs qualified (80%+ match), {stored} in data/ranked_jobs.jsonl")
     print("="*50 + "\n")
     
     if scored_jobs:
@@ -146,6 +234,10 @@ def main():
             print(f"   Strengths: {', '.join(job['key_matches'][:3])}")
     else:
         print("No jobs met the 80% match threshold.")
+    
+    if format_metrics():
+        print(f"\nLLM usage:\n{format_metrics()}")
+        export_metrics()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,68 @@
+"""Token-bucket rate limiting for OpenAI API calls"""
+import asyncio
+import threading
+import time
+
+
+def estimate_tokens(text):
+    """Rough token count for budgeting (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Bucket of `capacity` units that refills evenly over `period` seconds.
+
+    Callers reserve units up front and the bucket is allowed to go into debt,
+    so the returned wait time is exactly how long until the reservation is
+    covered. This keeps waiters in FIFO order without any locking inside a
+    single event loop.
+    """
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """Take `amount` units and return the seconds to wait before using them"""
+        self._refill()
+        # A single request larger than the bucket would otherwise never fit
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Combined requests-per-minute and tokens-per-minute limiter.
+
+    Safe to share between threads: reservations are taken under a lock, and
+    the wait happens outside it.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        with self._lock:
+            return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def wait(self, tokens):
+        """Block the calling thread until one request of `tokens` tokens is allowed"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire(self, tokens):
+        """Wait until one request of `tokens` tokens is allowed"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
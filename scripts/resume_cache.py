@@ -0,0 +1,318 @@
+"""Parse-once resume ingestion.
+
+The resume PDF/DOCX is parsed only when its content changes: the extracted
+text and a compact structured profile are cached in data/resume_cache.json,
+keyed by the file's hash and mtime and the parser version. Whitespace is
+normalized so prompts do not pay for PDF layout artifacts.
+
+    resume = load_resume()
+    resume["text"]      # normalized full text
+    resume["profile"]   # {"name", "contact", "summary", "skills", "experience", ...}
+    resume["compact"]   # short rendering of the profile for prompts, without contact details
+    prompt_profile(resume)  # compact, or the full text if no experience was detected
+
+Section detection copes with exported two-column layouts: headings in DOCX
+text boxes, headings glued to the previous line by PDF extraction, contact
+lines anywhere in the text, and an experience block that lands under the
+wrong heading.
+"""
+import hashlib
+import json
+import os
+import re
+
+import PyPDF2
+from docx import Document
+
+RESUME_CACHE_PATH = "data/resume_cache.json"
+# Bump when parsing changes so cached profiles are rebuilt
+PARSER_VERSION = 2
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+MAX_SECTION_CHARS = 1200
+
+# Heading line -> profile section (English and German resume headings)
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "professional summary", "about me", "profil", "kurzprofil"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "berufserfahrung", "praxiserfahrung"],
+    "education": ["education", "academic background", "ausbildung", "studium"],
+    "skills": ["skills", "technical skills", "core skills", "competencies", "core competencies",
+               "kenntnisse", "fähigkeiten"],
+    "projects": ["projects", "projekte"],
+    "certifications": ["certifications", "certificates", "zertifikate"],
+    "languages": ["languages", "sprachen", "sprachkenntnisse"],
+    "additional": ["additional information", "interests", "weitere informationen", "interessen"]
+}
+HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+# An upper-case heading that PDF extraction glued to the end of the previous line ("A2TECHNICAL SKILLS")
+GLUED_HEADING = re.compile(r"^(.*\S)(%s)$" % "|".join(
+    re.escape(heading.upper()) for heading in sorted(HEADING_SECTION, key=len, reverse=True)))
+
+BULLET = re.compile(r"^(?:[•▪●◦]\s*|[-–*]\s+)")
+CONTACT_LINE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"                         # email
+    r"|^\+?[\d\s()/-]{7,}$"                               # phone
+    r"|\b(?:https?://|www\.|linkedin\.com/|github\.com/)"  # profile links
+    r"|^[^,\d]+\s\d+\w?,\s*\d{4,5}\s+\S+"                 # street and postcode
+)
+DATE_RANGE = re.compile(r"\b(?:19|20)\d{2}\s*[–-]\s*(?:(?:19|20)\d{2}|current|present|today|heute)\b", re.I)
+LANGUAGE_LEVEL = re.compile(r"^(?:[ABC][12]|native|fluent|basic|intermediate|advanced|business fluent|"
+                            r"muttersprache|fließend|grundkenntnisse|verhandlungssicher)\b", re.I)
+SKILL_SEPARATORS = re.compile(r"\s*[;|•·]\s*")
+SKILL_COMMAS = re.compile(r",\s*(?![^()]*\))")
+
+
+def find_resume_file(directory="."):
+    """The RESUME_FILE env var, else the first PDF/DOCX in `directory` (by name)"""
+    if os.getenv("RESUME_FILE"):
+        return os.getenv("RESUME_FILE")
+    for filename in sorted(os.listdir(directory)):
+        if filename.lower().endswith(RESUME_EXTENSIONS):
+            return os.path.join(directory, filename)
+    return None
+
+
+def extract_text_from_file(file_path):
+    """Extract text from PDF or DOCX file"""
+    if file_path.lower().endswith('.pdf'):
+        with open(file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+    elif file_path.lower().endswith('.docx'):
+        return "\n".join(docx_lines(Document(file_path)))
+    else:
+        raise ValueError("Unsupported file format. Use .pdf or .docx")
+
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+WP_NS = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}"
+
+
+def starts_with_picture(paragraph):
+    """True if an inline picture (a bullet image) comes before the paragraph's first text"""
+    for run in paragraph.findall(f"{W_NS}r"):
+        for child in run:
+            if child.tag == f"{W_NS}t" and (child.text or "").strip():
+                return False
+            if child.tag == f"{W_NS}drawing" and child.find(f"{WP_NS}inline") is not None:
+                return True
+    return False
+
+
+def docx_lines(doc):
+    """
+    Paragraph texts in document order, plus the text of any text boxes
+    anchored in a paragraph (exported layouts put section headings there).
+    List paragraphs and paragraphs starting with a bullet picture get a "• ".
+    """
+    lines = []
+    for paragraph in doc.paragraphs:
+        element = paragraph._p
+        text = paragraph.text.strip()
+        if text and (element.find(f"{W_NS}pPr/{W_NS}numPr") is not None or starts_with_picture(element)):
+            text = f"• {text}"
+        lines.append(text)
+        # Each text box is stored twice (DrawingML and a VML fallback)
+        boxes = []
+        for box in element.iter(f"{W_NS}txbxContent"):
+            box_text = "\n".join("".join(t.text or "" for t in box_paragraph.iter(f"{W_NS}t"))
+                                 for box_paragraph in box.iter(f"{W_NS}p")).strip()
+            if box_text and box_text not in boxes:
+                boxes.append(box_text)
+        lines.extend(boxes)
+    return lines
+
+
+def normalize_whitespace(text):
+    """Collapse runs of spaces/tabs, strip line ends, keep at most one blank line"""
+    text = re.sub(r"[ \t\u00a0]+", " ", text or "")
+    text = "\n".join(line.strip() for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def section_for(line):
+    """Profile section a heading line starts, or None for ordinary lines"""
+    heading = line.strip().rstrip(":").lower()
+    return HEADING_SECTION.get(heading) if len(heading) <= 40 else None
+
+
+def split_glued_heading(line):
+    """[line] or [text, heading] when a heading is glued to the end of the line"""
+    found = GLUED_HEADING.match(line)
+    return [found.group(1), found.group(2)] if found and not section_for(line) else [line]
+
+
+def is_contact(line):
+    return len(line) <= 120 and bool(CONTACT_LINE.search(line))
+
+
+def split_skills(line):
+    """
+    Skills on one line. "Label: a | b | c" gives the items; a label followed
+    by a sentence ("Stakeholder communication: Clear updates to ...") gives
+    the label.
+    """
+    line = BULLET.sub("", line).strip()
+    label, _, rest = line.partition(":") if ":" in line[:60] else ("", "", line)
+    separators = SKILL_SEPARATORS if SKILL_SEPARATORS.search(rest) else SKILL_COMMAS
+    items = [item.strip(" -.") for item in separators.split(rest) if item.strip(" -.")]
+    if label and (rest.rstrip().endswith(".") or any(len(item.split()) > 8 for item in items)):
+        return [label.strip()]
+    return items
+
+
+def split_header(lines):
+    """Name and headline from the lines before the first heading"""
+    if not lines:
+        return "", []
+    # A name broken over lines by PDF extraction ("Jane" / "Doe")
+    name = lines[0]
+    rest = lines[1:]
+    while len(name.split()) < 2 and rest and len(rest[0].split()) == 1 and rest[0][:1].isupper():
+        name = f"{name} {rest.pop(0)}"
+    return name, rest
+
+
+def unwrap_bullets(lines):
+    """Join lines wrapped by PDF extraction back onto the bullet they continue"""
+    joined = []
+    for line in lines:
+        if (joined and BULLET.match(joined[-1]) and not joined[-1].endswith(":")
+                and not BULLET.match(line) and not line.endswith(":")):
+            joined[-1] = f"{joined[-1]} {line}"
+        else:
+            joined.append(line)
+    return joined
+
+
+def recover_experience(sections):
+    """
+    Move a dated entry block (title and employer, then a date range) out of
+    the section it landed under when the experience heading got no content.
+    """
+    for name, lines in sections.items():
+        if name in ("header", "education", "experience"):
+            continue
+        for i, line in enumerate(lines):
+            if DATE_RANGE.search(line) and i >= 2:
+                sections["experience"] = lines[i - 2:]
+                del lines[i - 2:]
+                return
+
+
+def recover_languages(sections):
+    """Swap the languages section with the one holding its language/level pairs"""
+    def has_levels(lines):
+        return len(lines) >= 2 and all(LANGUAGE_LEVEL.match(line) for line in lines[1::2])
+
+    if has_levels(sections.get("languages", [])):
+        return
+    for name, lines in sections.items():
+        if name not in ("header", "languages") and has_levels(lines):
+            sections[name], sections["languages"] = sections.get("languages", []), lines
+            return
+
+
+def build_profile(text):
+    """
+    Split a resume into sections; the skills section becomes a list.
+
+    Lines before the first heading give the name and headline, and contact
+    lines (email, phone, links, street address) are collected wherever they
+    appear, so neither ends up in the summary.
+    """
+    sections = {"header": []}
+    contact = []
+    current = "header"
+    for raw_line in text.splitlines():
+        for line in split_glued_heading(raw_line):
+            section = section_for(line)
+            if section:
+                current = section
+                sections.setdefault(current, [])
+            elif is_contact(line):
+                contact.append(line)
+            elif line:
+                sections.setdefault(current, []).append(BULLET.sub("• ", line))
+
+    if not sections.get("experience"):
+        recover_experience(sections)
+    recover_languages(sections)
+
+    name, headline = split_header(sections.pop("header"))
+    profile = {section: "\n".join(unwrap_bullets(lines)) for section, lines in sections.items() if lines}
+    if not profile.get("summary") and headline:
+        profile["summary"] = "\n".join(headline)
+    elif headline:
+        profile["headline"] = "\n".join(headline)
+    profile.update({key: value for key, value in (("name", name), ("contact", "\n".join(contact))) if value})
+    if "skills" in profile:
+        skills = [skill for line in profile["skills"].splitlines() for skill in split_skills(line)]
+        profile["skills"] = list(dict.fromkeys(skills))
+    return profile
+
+
+# Sections in the compact profile; name, contact and headline stay out of prompts
+COMPACT_SECTIONS = ("summary", "skills", "experience", "education", "projects", "certifications", "languages")
+
+
+def compact_profile(profile):
+    """Short plain-text rendering of the profile for prompts"""
+    parts = []
+    for name in COMPACT_SECTIONS:
+        value = profile.get(name)
+        if not value:
+            continue
+        if isinstance(value, list):
+            value = ", ".join(value)
+        if len(value) > MAX_SECTION_CHARS:
+            value = value[:MAX_SECTION_CHARS].rsplit("\n", 1)[0]
+        parts.append(f"{name.title()}:\n{value}")
+    return "\n\n".join(parts)
+
+
+def prompt_profile(resume):
+    """
+    The resume as sent to scoring and cover-letter prompts.
+
+    The compact profile, unless section detection found no experience: then
+    the profile would silently leave it out, so the full text is used.
+    """
+    return resume["compact"] if resume["profile"].get("experience") else resume["text"]
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_resume(path=None, cache_path=RESUME_CACHE_PATH):
+    """
+    Return the parsed resume, parsing the file only if it changed.
+
+    Returns:
+        Dictionary with path, text, profile and compact, or None if no resume file exists
+    """
+    path = path or find_resume_file()
+    if not path:
+        return None
+
+    key = f"{file_hash(path)}:{os.path.getmtime(path)}:{PARSER_VERSION}"
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    if cache.get("key") == key:
+        return cache["resume"]
+
+    text = normalize_whitespace(extract_text_from_file(path))
+    profile = build_profile(text)
+    resume = {"path": path, "text": text, "profile": profile, "compact": compact_profile(profile)}
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "resume": resume}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, cache_path)
+    return resume
@@ -0,0 +1,205 @@
+"""Template-plus-delta resume generation.
+
+Most of a tailored resume is identical across jobs. Instead of asking the
+LLM to rewrite the whole document, a base template is built once per
+country format from the cached resume profile, and the LLM returns only a
+small JSON delta:
+
+    {
+        "summary": "Two or three tailored sentences",
+        "skills_order": ["SQL", "Python", ...],      # most relevant first
+        "bullet_order": {"E1": ["E1.3", "E1.1"]},    # per experience entry
+        "emphasize": ["stakeholder management", ...]
+    }
+
+The delta is applied locally and rendered to markdown, DOCX and PDF. Only
+content from the base resume is ever rendered; unknown IDs are ignored.
+"""
+import re
+
+from docx import Document
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import ListFlowable, Paragraph, SimpleDocTemplate, Spacer
+
+from llm_gateway import parse_json
+
+DELTA_MAX_TOKENS = 400
+
+# Layout per RESUME_FORMATS country code
+RESUME_LAYOUTS = {
+    "US": {"title": "Resume", "max_bullets": 3, "max_entries": 4,
+           "sections": ["experience", "skills", "education"]},
+    "DE": {"title": "Lebenslauf", "max_bullets": None, "max_entries": None,
+           "sections": ["experience", "education", "skills", "languages", "certifications"]},
+    "UK": {"title": "Curriculum Vitae", "max_bullets": 6, "max_entries": None,
+           "sections": ["experience", "skills", "education", "projects", "certifications"]}
+}
+
+BULLET_RE = re.compile(r"^\s*(?:[-•*▪–]|\d+\.)\s+")
+
+
+def parse_experience(text):
+    """
+    Split an experience section into entries with stable bullet IDs.
+
+    Consecutive plain lines form one heading ("Title | Employer | Dates");
+    a line ending in ":" ("PMO Operations:") starts a sub-entry of its own.
+    """
+    entries = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        label = line.endswith(":")
+        if BULLET_RE.match(line) and not label and entries:
+            entry = entries[-1]
+            entry["bullets"].append({"id": f"{entry['id']}.{len(entry['bullets']) + 1}",
+                                     "text": BULLET_RE.sub("", line).strip()})
+        elif entries and not label and not entries[-1]["bullets"] and not entries[-1]["heading"].endswith(":"):
+            entries[-1]["heading"] += f" | {line}"
+        else:
+            entries.append({"id": f"E{len(entries) + 1}", "heading": BULLET_RE.sub("", line), "bullets": [],
+                            "group": label})
+    for entry in entries:
+        entry["heading"] = entry["heading"].rstrip(":")
+    return entries
+
+
+def limit_entries(entries, max_entries):
+    """The first `max_entries` positions, each with its sub-entries"""
+    starts = [i for i, entry in enumerate(entries) if not entry["group"]]
+    if max_entries is None or len(starts) <= max_entries:
+        return entries
+    return entries[:starts[max_entries]]
+
+
+def build_template(profile, country="DE"):
+    """Base resume for one country format, from a resume_cache profile"""
+    layout = RESUME_LAYOUTS.get(country, RESUME_LAYOUTS["DE"])
+    return {
+        "country": country,
+        "title": layout["title"],
+        "name": profile.get("name", ""),
+        "summary": " ".join((profile.get("summary") or "").split()),
+        "skills": list(profile.get("skills", [])),
+        "experience": limit_entries(parse_experience(profile.get("experience")), layout["max_entries"]),
+        "sections": {name: profile[name] for name in layout["sections"]
+                     if name not in ("experience", "skills") and profile.get(name)},
+        "order": layout["sections"],
+        "max_bullets": layout["max_bullets"]
+    }
+
+
+def template_outline(template):
+    """Compact, ID-tagged view of the template for the delta prompt"""
+    lines = [f"SUMMARY: {template['summary']}", f"SKILLS: {', '.join(template['skills'])}"]
+    for entry in template["experience"]:
+        lines.append(f"[{entry['id']}] {entry['heading']}")
+        lines.extend(f"  [{b['id']}] {b['text']}" for b in entry["bullets"])
+    return "\n".join(lines)
+
+
+def parse_delta(text):
+    """Parse the LLM's JSON delta, repairing near-JSON (prose, code fences, trailing commas)"""
+    delta = parse_json(text)
+    if not isinstance(delta, dict):
+        raise ValueError("Resume delta is not a JSON object")
+    return delta
+
+
+def apply_delta(template, delta):
+    """Tailored copy of the template; only reorders, filters and re-summarizes"""
+    skills = template["skills"]
+    preferred = [s for s in delta.get("skills_order", []) if s in skills]
+    skills = preferred + [s for s in skills if s not in preferred]
+
+    experience = []
+    orders = delta.get("bullet_order", {}) or {}
+    for entry in template["experience"]:
+        by_id = {b["id"]: b for b in entry["bullets"]}
+        ordered = [by_id[i] for i in orders.get(entry["id"], []) if i in by_id]
+        ordered += [b for b in entry["bullets"] if b not in ordered]
+        experience.append({**entry, "bullets": ordered[:template["max_bullets"]]})
+
+    summary = delta.get("summary")
+    return {
+        **template,
+        "summary": summary if isinstance(summary, str) and summary.strip() else template["summary"],
+        "skills": skills,
+        "experience": experience,
+        "emphasize": [k for k in delta.get("emphasize", []) if isinstance(k, str) and k.strip()][:5]
+    }
+
+
+def emphasize(text, keywords):
+    """Bold keyword occurrences in markdown"""
+    if not keywords:
+        return text
+    pattern = re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)), re.I)
+    return pattern.sub(lambda m: f"**{m.group(0)}**", text)
+
+
+def render_markdown(resume):
+    keywords = resume.get("emphasize", [])
+    lines = [f"# {resume['name'] or resume['title']}", f"*{resume['title']}*", ""]
+    if resume["summary"]:
+        lines += [emphasize(resume["summary"], keywords), ""]
+    for name in resume["order"]:
+        if name == "experience" and resume["experience"]:
+            lines.append("## Experience")
+            for entry in resume["experience"]:
+                lines.append(f"### {entry['heading']}")
+                lines += [f"- {emphasize(b['text'], keywords)}" for b in entry["bullets"]]
+                lines.append("")
+        elif name == "skills" and resume["skills"]:
+            lines += ["## Skills", ", ".join(resume["skills"]), ""]
+        elif name in resume["sections"]:
+            lines += [f"## {name.title()}", resume["sections"][name], ""]
+    return "\n".join(lines).strip() + "\n"
+
+
+def render_docx(resume, path):
+    doc = Document()
+    doc.add_heading(resume["name"] or resume["title"], level=0)
+    if resume["summary"]:
+        doc.add_paragraph(resume["summary"])
+    for name in resume["order"]:
+        if name == "experience" and resume["experience"]:
+            doc.add_heading("Experience", level=1)
+            for entry in resume["experience"]:
+                doc.add_heading(entry["heading"], level=2)
+                for bullet in entry["bullets"]:
+                    doc.add_paragraph(bullet["text"], style="List Bullet")
+        elif name == "skills" and resume["skills"]:
+            doc.add_heading("Skills", level=1)
+            doc.add_paragraph(", ".join(resume["skills"]))
+        elif name in resume["sections"]:
+            doc.add_heading(name.title(), level=1)
+            doc.add_paragraph(resume["sections"][name])
+    doc.save(path)
+
+
+def render_pdf(resume, path):
+    styles = getSampleStyleSheet()
+
+    def para(text, style="BodyText"):
+        text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return Paragraph(text.replace("\n", "<br/>"), styles[style])
+
+    story = [para(resume["name"] or resume["title"], "Title")]
+    if resume["summary"]:
+        story.append(para(resume["summary"]))
+    for name in resume["order"]:
+        if name == "experience" and resume["experience"]:
+            story.append(para("Experience", "Heading2"))
+            for entry in resume["experience"]:
+                story.append(para(entry["heading"], "Heading4"))
+                if entry["bullets"]:
+                    story.append(ListFlowable([para(b["text"]) for b in entry["bullets"]], bulletType="bullet"))
+        elif name == "skills" and resume["skills"]:
+            story += [para("Skills", "Heading2"), para(", ".join(resume["skills"]))]
+        elif name in resume["sections"]:
+            story += [para(name.title(), "Heading2"), para(resume["sections"][name])]
+        story.append(Spacer(1, 6))
+    SimpleDocTemplate(path, pagesize=A4).build(story)
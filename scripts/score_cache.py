@@ -0,0 +1,99 @@
+"""Persistent SQLite cache for AI match scores"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = "data/score_cache.db"
+DEFAULT_TTL_DAYS = 14
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def normalize_text(text):
+    """Lowercase and collapse whitespace so cosmetic edits don't miss the cache"""
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+
+def make_cache_key(job, resume, prompt_version):
+    """Content hash of the job text, resume and prompt/model version"""
+    resume_hash = hashlib.sha256(normalize_text(resume).encode("utf-8")).hexdigest()
+    parts = [
+        normalize_text(job.get("title")),
+        normalize_text(job.get("company")),
+        normalize_text(job.get("description")),
+        resume_hash,
+        prompt_version,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """Match-score cache with TTL and size-based (least recently used) eviction; usable from worker threads"""
+
+    def __init__(self, path=CACHE_PATH, ttl_days=DEFAULT_TTL_DAYS, max_entries=DEFAULT_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_last_used ON scores (last_used)")
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached result for `key`, or None if missing or expired"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT result, created_at FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+
+            now = time.time()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.conn.execute("UPDATE scores SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO scores (key, result, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), now, now)
+            )
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        self.conn.execute("DELETE FROM scores WHERE created_at < ?", (time.time() - self.ttl,))
+        self.conn.execute("""
+            DELETE FROM scores WHERE key IN (
+                SELECT key FROM scores ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def close(self):
+        self.evict()
+        self.conn.commit()
+        self.conn.close()
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
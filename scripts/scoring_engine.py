@@ -0,0 +1,132 @@
+"""Async engine for running many OpenAI chat completions concurrently"""
+import asyncio
+import os
+import random
+import time
+
+import aiohttp
+
+from llm_gateway import METER, model_for
+from rate_limit import RateLimiter, estimate_tokens
+
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+# Conservative defaults for a low usage tier; override per account via env or CLI
+DEFAULT_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", 5))
+REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM", 500))
+TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM", 10000))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableError(Exception):
+    """Raised for responses worth retrying (rate limits, server errors)"""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class ScoringEngine:
+    """Runs chat completions with bounded in-flight calls, rate limits and retries"""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, requests_per_minute=REQUESTS_PER_MINUTE,
+                 tokens_per_minute=TOKENS_PER_MINUTE, model=None, max_retries=5,
+                 base_url=OPENAI_BASE_URL, api_key=None, timeout=60, stage=None, json_mode=False):
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        # Without an explicit model, the stage's tier in llm_gateway.MODEL_TIERS
+        self.model = model or model_for(stage or "match")
+        self.max_retries = max_retries
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY", "")
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+        # Calls are metered under `stage` in llm_gateway.METER
+        self.stage = stage
+        self.json_mode = json_mode
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _post(self, session, payload):
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        async with session.post(f"{self.base_url}/chat/completions", json=payload, headers=headers) as response:
+            if response.status in RETRY_STATUSES:
+                retry_after = response.headers.get("Retry-After")
+                raise RetryableError(response.status, float(retry_after) if retry_after else None)
+            response.raise_for_status()
+            return await response.json()
+
+    async def chat(self, session, semaphore, messages, max_tokens=500, temperature=0.3):
+        """Send one chat completion and return the response JSON"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        # OpenAI counts max_tokens against the TPM limit up front
+        budget = sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(budget)
+            start = time.perf_counter()
+            try:
+                async with semaphore:
+                    self.stats["requests"] += 1
+                    response = await self._post(session, payload)
+                if self.stage:
+                    METER.record(self.stage, self.model, response.get("usage", {}), time.perf_counter() - start)
+                return response
+            except (RetryableError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    self._record_failure(start)
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt, getattr(e, "retry_after", None)))
+            except Exception:
+                # Not worth retrying (e.g. a 4xx from raise_for_status), but still metered
+                self._record_failure(start)
+                raise
+
+    def _record_failure(self, start):
+        self.stats["failures"] += 1
+        if self.stage:
+            METER.record_error(self.stage, self.model, time.perf_counter() - start)
+
+    async def run(self, requests, on_result=None):
+        """Run (messages, max_tokens) requests concurrently.
+
+        Returns one entry per request in input order: the response JSON, or
+        the exception that made the request fail. `on_result(index, result)`
+        is called as each request finishes.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=self.timeout) as session:
+            async def worker(index, messages, max_tokens):
+                try:
+                    result = await self.chat(session, semaphore, messages, max_tokens)
+                except Exception as e:
+                    result = e
+                if on_result:
+                    on_result(index, result)
+                return result
+
+            return await asyncio.gather(*(
+                worker(i, messages, max_tokens) for i, (messages, max_tokens) in enumerate(requests)
+            ))
+
+
+def response_text(response):
+    """Extract the assistant message text from a chat completion response"""
+    return response["choices"][0]["message"]["content"]
@@ -0,0 +1,120 @@
+"""Seen-jobs index for incremental fetching.
+
+Tracks every posting already fetched, keyed on canonical URL and posting ID,
+with a content hash to tell updated postings from unchanged ones. Also keeps
+a per-query cursor (newest posted date seen).
+"""
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+SEEN_INDEX_PATH = "data/seen_jobs.json"
+
+# Query parameters that only track how a link was reached
+TRACKING_PARAMS = re.compile(r"^(utm_.*|ref.*|trk.*|tracking.*|position|pagenum|src|source|gh_src|lipi)$", re.I)
+LINKEDIN_JOB_RE = re.compile(r"linkedin\.com/jobs/view/(?:[^/?#]*-)?(\d+)")
+
+
+def canonical_url(url):
+    """Normalize a job URL so the same posting always maps to the same key"""
+    if not url:
+        return ""
+    match = LINKEDIN_JOB_RE.search(url)
+    if match:
+        return f"https://www.linkedin.com/jobs/view/{match.group(1)}"
+
+    parsed = urlparse(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query) if not TRACKING_PARAMS.match(k))
+    return urlunparse((
+        parsed.scheme.lower() or "https",
+        parsed.netloc.lower().removeprefix("www."),
+        parsed.path.rstrip("/") or "/",
+        "",
+        urlencode(query),
+        ""
+    ))
+
+
+def posting_id(job):
+    """Source-specific posting ID, if one can be determined"""
+    if job.get("id"):
+        return f"{job.get('source', '')}:{job['id']}"
+    match = LINKEDIN_JOB_RE.search(job.get("url") or job.get("link") or "")
+    return f"linkedin:{match.group(1)}" if match else None
+
+
+def content_hash(job):
+    """Hash of the fields that matter downstream; changes mean 'updated'"""
+    text = "\x1f".join(
+        re.sub(r"\s+", " ", str(job.get(field) or "")).strip().lower()
+        for field in ("title", "company", "location", "description")
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def query_key(run_input):
+    """Stable key for a search query, for cursor tracking"""
+    return hashlib.sha256(json.dumps(run_input, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class SeenJobsIndex:
+    """Persistent index of fetched postings plus per-query cursors"""
+
+    def __init__(self, path=SEEN_INDEX_PATH):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self.jobs = data.get("jobs", {})
+        self.ids = data.get("ids", {})
+        self.cursors = data.get("cursors", {})
+        self.stats = {"new": 0, "updated": 0, "unchanged": 0}
+
+    def classify(self, job):
+        """Record the job and return 'new', 'updated' or 'unchanged'"""
+        url_key = canonical_url(job.get("url") or job.get("link"))
+        pid = posting_id(job)
+        key = self.ids.get(pid) if pid else None
+        key = key or url_key
+        digest = content_hash(job)
+        now = datetime.now().isoformat(timespec="seconds")
+
+        entry = self.jobs.get(key)
+        if entry is None:
+            status = "new"
+            self.jobs[key] = {"hash": digest, "first_seen": now, "last_seen": now}
+        elif entry["hash"] != digest:
+            status = "updated"
+            entry.update(hash=digest, last_seen=now)
+        else:
+            status = "unchanged"
+            entry["last_seen"] = now
+
+        if pid:
+            self.ids[pid] = key
+        self.stats[status] += 1
+        return status
+
+    def cursor(self, key):
+        return self.cursors.get(key)
+
+    def advance_cursor(self, key, posted_dates):
+        """Move the query's cursor to the newest posted date seen"""
+        dates = [d for d in posted_dates if d]
+        if self.cursors.get(key):
+            dates.append(self.cursors[key])
+        if dates:
+            self.cursors[key] = max(dates)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"jobs": self.jobs, "ids": self.ids, "cursors": self.cursors}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
@@ -0,0 +1,78 @@
+"""Buffered Google Sheets access for the job tracking worksheet.
+
+The worksheet is read once with get_all_values and the header -> column map
+is built from that snapshot. Cell changes are buffered and written in one
+values.batchUpdate call on flush(), with runs of adjacent rows in a column
+coalesced into a single range. A run therefore costs one read and one write
+API call, however many jobs it touches.
+"""
+from gspread.utils import rowcol_to_a1
+
+
+class SheetSync:
+    """Snapshot reads and batched writes for one worksheet"""
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        self.values = worksheet.get_all_values()
+        self.header = self.values[0] if self.values else []
+        self.columns = {name: col for col, name in enumerate(self.header, 1) if name}
+        self.pending = {}   # (row, col) -> value
+
+    def records(self):
+        """
+        Yield (row_number, record) for every data row of the snapshot.
+
+        row_number is the 1-based sheet row, so it can be passed to set().
+        """
+        for row_number, row in enumerate(self.values[1:], 2):
+            padded = row + [''] * (len(self.header) - len(row))
+            yield row_number, dict(zip(self.header, padded))
+
+    def set(self, row_number, column, value):
+        """Buffer a cell change; `column` is a header name"""
+        if column not in self.columns:
+            raise KeyError(f"No '{column}' column in worksheet {self.worksheet.title}")
+        self.pending[(row_number, self.columns[column])] = value
+
+    def ranges(self):
+        """Coalesce buffered cells into ranges of adjacent rows per column"""
+        data = []
+        run = []
+        for row, col in sorted(self.pending, key=lambda cell: (cell[1], cell[0])):
+            if run and (col != run[-1][1] or row != run[-1][0] + 1):
+                data.append(self._range(run))
+                run = []
+            run.append((row, col))
+        if run:
+            data.append(self._range(run))
+        return data
+
+    def _range(self, cells):
+        start, end = cells[0], cells[-1]
+        return {
+            'range': f"{rowcol_to_a1(*start)}:{rowcol_to_a1(*end)}",
+            'values': [[self.pending[cell]] for cell in cells]
+        }
+
+    def flush(self):
+        """
+        Write all buffered changes in a single batch_update call.
+
+        Returns:
+            Number of cells written
+        """
+        if not self.pending:
+            return 0
+        data = self.ranges()
+        self.worksheet.batch_update(data, value_input_option='USER_ENTERED')
+        count = len(self.pending)
+        for (row, col), value in self.pending.items():
+            while len(self.values) < row:
+                self.values.append([])
+            cells = self.values[row - 1]
+            cells.extend([''] * (col - len(cells)))
+            cells[col - 1] = value
+        self.pending.clear()
+        print(f"Updated {count} cells in {len(data)} ranges with one Sheets request")
+        return count
@@ -0,0 +1,79 @@
+import os
+import threading
+from types import SimpleNamespace
+from urllib.robotparser import RobotFileParser
+
+import pytest
+
+import company_scraper
+from company_scraper import HostScheduler, check_profile, compile_profile, scrape_profile_pages
+from config import COMPANY_CAREERS
+
+LISTING = '<ul>{}</ul>'.format(''.join(
+    f'<li class="job"><a href="/jobs/{i}">Data Analyst {i}</a></li>' for i in range(3)))
+
+
+def test_robots_failure_does_not_block_waiting_threads(monkeypatch):
+    scheduler = HostScheduler(delay=0)
+
+    def failing_load(host_url):
+        raise RuntimeError("robots.txt parse error")
+
+    monkeypatch.setattr(scheduler, "_load_robots", failing_load)
+    with pytest.raises(RuntimeError):
+        scheduler.allowed("https://careers.example.com/jobs")
+
+    waiter = threading.Thread(target=scheduler.allowed, args=("https://careers.example.com/jobs?page=2",))
+    waiter.start()
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+
+
+def test_pagination_skips_pages_disallowed_by_robots(monkeypatch):
+    robots = RobotFileParser()
+    robots.parse(["User-agent: *", "Disallow: /jobs?startrow=50"])
+    scheduler = HostScheduler(delay=0)
+    monkeypatch.setattr(scheduler, "_load_robots", lambda host_url: robots)
+
+    fetched = []
+
+    def fake_get(url, **kwargs):
+        fetched.append(url)
+        return SimpleNamespace(text=LISTING, url=url, raise_for_status=lambda: None)
+
+    monkeypatch.setattr(company_scraper, "get_session", lambda: SimpleNamespace(get=fake_get))
+    company = {"name": "Example", "url": "https://careers.example.com/jobs?startrow=0", "keywords": ["Munich"],
+               "profile": {"list": "li.job", "link": "a",
+                           "pagination": {"param": "startrow", "step": 25, "max_pages": 4}}}
+    first = SimpleNamespace(text=LISTING, url=company["url"])
+
+    jobs = scrape_profile_pages(first, company, compile_profile(company), scheduler)
+
+    assert fetched == ["https://careers.example.com/jobs?startrow=25"]
+    assert len(jobs) == 6
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "careers")
+
+
+@pytest.mark.parametrize("name, fixture, titles", [
+    ("BMW Group", "bmw_group.html", ["Project Manager Digital Sales (m/w/x)", "Data Analyst Produktion (m/w/x)"]),
+    ("Siemens", "siemens.html", ["IT Project Manager (f/m/d)", "PMO Analyst Smart Infrastructure (f/m/d)"]),
+    ("SAP", "sap.html", ["Data Analyst - Customer Success", "Project Manager Cloud ERP"]),
+])
+def test_profiles_extract_fixture_listings(name, fixture, titles):
+    jobs = check_profile(name, os.path.join(FIXTURES, fixture))
+    assert [job["title"] for job in jobs] == titles
+    assert all(job["link"].startswith("http") for job in jobs)
+    assert all(job["location"].startswith("M") for job in jobs)
+
+
+def test_profile_matching_nothing_falls_back_to_generic_selectors():
+    company = next(c for c in COMPANY_CAREERS if c["name"] == "BMW Group")
+    with open(os.path.join(FIXTURES, "redesigned.html"), encoding="utf-8") as f:
+        html = f.read()
+    response = SimpleNamespace(text=html, url=company["url"])
+
+    jobs = scrape_profile_pages(response, company, compile_profile(company))
+
+    assert [job["title"] for job in jobs] == ["Junior Project Manager", "Data Analyst Finance"]
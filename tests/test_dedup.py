@@ -0,0 +1,43 @@
+from dedup import deduplicate, is_near_duplicate
+
+
+def description(start, count):
+    return " ".join(f"word{i}" for i in range(start, start + count))
+
+
+def job(source, url, desc, title="Data Analyst (m/w/d)", company="Siemens AG"):
+    return {"title": title, "company": company, "source": source, "url": url, "description": desc}
+
+
+def test_truncated_linkedin_description_matches_full_company_description():
+    full = description(0, 600)
+    linkedin = job("linkedin", "https://www.linkedin.com/jobs/view/1", full[:500])
+    company = job("company", "https://jobs.siemens.com/123", full, title="Data Analyst")
+
+    assert is_near_duplicate(linkedin, company)
+    merged, stats = deduplicate([linkedin, company])
+    assert stats["near"] == 1
+    assert len(merged) == 1
+    assert merged[0]["description"] == full
+    assert len(merged[0]["sources"]) == 2
+
+
+def test_unrelated_descriptions_do_not_merge():
+    a = job("linkedin", "https://www.linkedin.com/jobs/view/1", description(0, 100))
+    b = job("company", "https://jobs.siemens.com/123", description(1000, 600))
+
+    merged, _ = deduplicate([a, b])
+    assert len(merged) == 2
+
+
+def test_merges_are_not_transitive():
+    # B has no description yet, so it matches both A and C; A and C are different roles
+    a = job("linkedin", "https://www.linkedin.com/jobs/view/1", description(0, 100))
+    b = job("company", "https://jobs.siemens.com/1", "")
+    c = job("company", "https://jobs.siemens.com/2", description(1000, 100))
+
+    merged, stats = deduplicate([a, b, c])
+    assert len(merged) == 2
+    assert stats["near"] == 1
+    descriptions = [m["description"] for m in merged]
+    assert a["description"] in descriptions and c["description"] in descriptions
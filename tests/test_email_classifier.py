@@ -0,0 +1,15 @@
+from email_classifier import classify_email
+
+
+def test_specific_phrase_decides_over_earlier_category():
+    subject = "Your interview for Data Analyst"
+    body = "Thank you for the interview. We will move forward with other candidates."
+
+    assert classify_email(subject, body) == "Rejected"
+
+
+def test_weak_keyword_only_counts_without_stronger_ones():
+    assert classify_email("Project sync", "Can we move our meeting to Thursday?") == "Interview Scheduled"
+    assert classify_email("Offer", "We are pleased to offer you the role. The team meeting is on Monday.") \
+        == "Offer Received"
+    assert classify_email("Newsletter", "Nothing relevant here.") is None
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import company_scraper
+from company_scraper import parse_signature
+from http_cache import ValidatorStore
+
+
+def test_stored_jobs_are_not_mutated_by_callers(tmp_path):
+    store = ValidatorStore(str(tmp_path / "validators.json"))
+    url = "https://careers.example.com/jobs"
+    jobs = [{"title": "Data Analyst", "link": f"{url}/1", "description": ""}]
+    response = SimpleNamespace(content=b"<html></html>", headers={"ETag": '"v1"'})
+
+    store.update(url, response, "sig", jobs, cost=1.0)
+    jobs[0]["description"] = "Fetched later by job_details"
+    reused = store.not_modified(url, elapsed=0.1)
+    reused[0]["description"] = "Fetched again"
+
+    assert store.not_modified(url, elapsed=0.1)[0]["description"] == ""
+
+
+def test_signature_covers_parser_version_and_criteria(monkeypatch):
+    company = {"name": "Example", "keywords": ["data"]}
+    before = parse_signature(company)
+
+    monkeypatch.setattr(company_scraper, "PARSER_VERSION", company_scraper.PARSER_VERSION + 1)
+    assert parse_signature(company) != before
+
+    monkeypatch.undo()
+    monkeypatch.setitem(company_scraper.JOB_CRITERIA, "job_titles", ["Controller"])
+    assert parse_signature(company) != before
@@ -0,0 +1,46 @@
+import logging
+
+import job_store
+
+
+def make_job(i):
+    return {"title": f"Data Analyst {i}", "company": "Acme", "description": "SQL Python",
+            "url": f"https://example.com/acme/jobs/{i}"}
+
+
+def store_lines():
+    with open(job_store.store_path("ranked_jobs"), encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_update_compacts_once_superseded_lines_pass_threshold(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(job_store, "STALE_LINES_BEFORE_COMPACT", 5)
+    jobs = [make_job(i) for i in range(3)]
+    job_store.write_jobs("ranked_jobs", jobs)
+    keys = [job_store.job_key(job) for job in jobs]
+
+    assert job_store.update_jobs("ranked_jobs", {key: {"documents_generated": False} for key in keys}) == 3
+    assert len(store_lines()) == 6
+
+    job_store.update_jobs("ranked_jobs", {key: {"documents_generated": True} for key in keys[:2]})
+    assert len(store_lines()) == 3
+    stored = {job_store.job_key(job): job["documents_generated"] for job in job_store.iter_jobs("ranked_jobs")}
+    assert stored == {keys[0]: True, keys[1]: True, keys[2]: False}
+
+
+def test_corrupt_line_and_key_collision_are_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    first = {"title": "Data Analyst", "company": "Acme", "description": "Munich office"}
+    second = {"title": "Data Analyst", "company": "Acme", "description": "Berlin office"}
+    job_store.write_jobs("ranked_jobs", [first])
+    with open(job_store.store_path("ranked_jobs"), "a", encoding="utf-8") as f:
+        f.write('{"title": "broken\n')
+    job_store.append_jobs("ranked_jobs", [second])
+
+    with caplog.at_level(logging.WARNING, logger="job_store"):
+        assert job_store.load_jobs("ranked_jobs") == [second]
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("corrupt line" in message for message in messages)
+    assert any("share key" in message for message in messages)
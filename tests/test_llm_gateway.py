@@ -0,0 +1,41 @@
+import pytest
+
+from llm_gateway import parse_json
+
+
+def test_valid_json_keeps_curly_quotes_in_strings():
+    text = '{"match_score": 85, "reasoning": "Described as a “team player”, it’s a fit"}'
+    assert parse_json(text) == {"match_score": 85,
+                                "reasoning": "Described as a “team player”, it’s a fit"}
+
+
+def test_code_fence_prose_and_trailing_commas():
+    text = 'Here is the result:\n```json\n{"match_score": 70, "gaps": ["German",],}\n```\nHope this helps.'
+    assert parse_json(text) == {"match_score": 70, "gaps": ["German"]}
+
+
+def test_smart_quote_delimiters():
+    assert parse_json("{“match_score”: 60, “reasoning”: “ok”}") == {
+        "match_score": 60, "reasoning": "ok"}
+
+
+def test_python_style_literals():
+    assert parse_json("{'match_score': 75, 'remote': True, 'notes': None}") == {
+        "match_score": 75, "remote": True, "notes": None}
+
+
+def test_literal_rewrite_leaves_strings_alone():
+    assert parse_json("{'reasoning': 'a true story, not null', 'remote': true, 'gaps': null}") == {
+        "reasoning": "a true story, not null", "remote": True, "gaps": None}
+
+
+def test_truncated_object_and_array():
+    assert parse_json('{"match_score": 80, "reasoning": "Strong Python backgr') == {
+        "match_score": 80, "reasoning": "Strong Python backgr"}
+    assert parse_json('[{"id": "1", "match_score": 50}, {"id": "2", "match_sc') == [
+        {"id": "1", "match_score": 50}, {"id": "2"}]
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        parse_json("I cannot score this job.")
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+import monitor_email
+from fake_gmail_service import FakeGmailService
+from monitor_email import sync_job_emails
+
+
+def test_unextracted_message_stays_pending_until_extraction_succeeds(tmp_path, monkeypatch):
+    service = FakeGmailService(latency=0)
+    state_path = str(tmp_path / "gmail_state.json")
+    message_id = service.add_message("recruiting@bmw.example", "Interview invitation",
+                                     "We would like to schedule an interview with you. Please pick a slot.")
+    monkeypatch.setattr(monitor_email, "extract_company_position", lambda subject, body: None)
+
+    assert sync_job_emails(service, state_path=state_path) == []
+    assert json.load(open(state_path))["pending_ids"] == [message_id]
+    assert "UNREAD" in service.mailbox[message_id]["labelIds"]
+
+    # No new mail arrives, but the pending message is retried
+    monkeypatch.setattr(monitor_email, "extract_company_position",
+                        lambda subject, body: {"company": "BMW", "position": "Data Analyst"})
+    updates = sync_job_emails(service, state_path=state_path)
+
+    assert [(u["company"], u["status"]) for u in updates] == [("BMW", "Interview Scheduled")]
+    assert json.load(open(state_path))["pending_ids"] == []
+    assert "UNREAD" not in service.mailbox[message_id]["labelIds"]
+
+
+
+def test_deleted_pending_message_is_dropped_without_retrying(tmp_path, monkeypatch):
+    service = FakeGmailService(latency=0)
+    state_path = str(tmp_path / "gmail_state.json")
+    message_id = service.add_message("recruiting@bmw.example", "Interview invitation",
+                                     "We would like to schedule an interview with you. Please pick a slot.")
+    monkeypatch.setattr(monitor_email, "extract_company_position", lambda subject, body: None)
+    assert sync_job_emails(service, state_path=state_path) == []
+    assert json.load(open(state_path))["pending_ids"] == [message_id]
+
+    del service.mailbox[message_id]
+    round_trips = service.stats["round_trips"]
+
+    assert sync_job_emails(service, state_path=state_path) == []
+    assert json.load(open(state_path))["pending_ids"] == []
+    # history list + one metadata batch, no retry batches
+    assert service.stats["round_trips"] - round_trips == 2
+
+def test_token_without_modify_scope_asks_for_reauthorization(monkeypatch):
+    token = {"token": "t", "refresh_token": "r", "client_id": "c", "client_secret": "s",
+             "scopes": ["https://www.googleapis.com/auth/gmail.readonly"]}
+    monkeypatch.setenv("GMAIL_TOKEN_JSON", json.dumps(token))
+
+    with pytest.raises(ValueError, match="--authorize"):
+        monitor_email.get_gmail_service()
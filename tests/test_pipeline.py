@@ -0,0 +1,95 @@
+import job_store
+import pipeline
+
+
+def make_job(i, company="Acme"):
+    return {"title": f"Data Analyst {i}", "company": company, "location": "Munich, Germany",
+            "description": "SQL Python", "url": f"https://example.com/{company.lower()}/jobs/{i}"}
+
+
+def fake_rank_stage(limiter):
+    def process(job):
+        score = 90 if job["title"].endswith(("0", "2", "4")) else 50
+        return {"match_score": score / 100, "qualified": score >= 80}
+
+    return pipeline.Stage("rank", process, version="test")
+
+
+def run(monkeypatch, jobs, **kwargs):
+    monkeypatch.setattr(pipeline, "rank_stage", fake_rank_stage)
+    monkeypatch.setattr(pipeline, "linkedin_source", lambda: iter(jobs))
+    monkeypatch.setattr(pipeline, "company_source", lambda: iter([]))
+    return pipeline.run_pipeline(generate_docs=False, update_tracker=False, **kwargs)
+
+
+def test_limited_run_keeps_existing_ranked_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    history = [{**make_job(i, "Old"), "match_score": 0.85, "qualified": True} for i in range(500)]
+    job_store.write_jobs("ranked_jobs", history)
+
+    qualified, stats, errors = run(monkeypatch, [make_job(i) for i in range(20)], source="boards", limit=20)
+
+    stored = job_store.load_jobs("ranked_jobs")
+    assert not errors
+    assert len(qualified) == 6
+    assert len(stored) == 506
+    assert {job_store.job_key(j) for j in history} <= {job_store.job_key(j) for j in stored}
+
+
+def test_rerank_replaces_record_and_drops_jobs_that_no_longer_qualify(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    kept = {**make_job(100), "match_score": 0.9, "qualified": True}
+    stale = {**make_job(1), "match_score": 0.95, "qualified": True}
+    updated = {**make_job(2), "match_score": 0.5, "qualified": True}
+    job_store.write_jobs("ranked_jobs", [kept, stale, updated])
+
+    run(monkeypatch, [make_job(1), make_job(2)], source="boards")
+
+    stored = {job["url"]: job for job in job_store.load_jobs("ranked_jobs")}
+    assert set(stored) == {kept["url"], updated["url"]}
+    assert stored[updated["url"]]["match_score"] == 0.9
+
+
+def test_rank_stage_reuses_score_cache(tmp_path, monkeypatch):
+    import rank_jobs
+    from rate_limit import RateLimiter
+
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def fake_score(job):
+        calls.append(job["title"])
+        return {"match_score": 85, "reasoning": "", "key_matches": [], "gaps": []}
+
+    monkeypatch.setattr(rank_jobs, "calculate_ai_match_score", fake_score)
+    for _ in range(2):
+        stage = pipeline.rank_stage(RateLimiter(1000, 10 ** 7))
+        result = stage.process(make_job(1))
+        stage.close()
+
+    assert calls == ["Data Analyst 1"]
+    assert result["qualified"] and result["match_score"] == 0.85
+
+
+def test_handoff_error_does_not_block_the_previous_stage(tmp_path):
+    import threading
+
+    def accept(job):
+        if job["title"].endswith("3"):
+            raise ValueError("bad record")
+        return True
+
+    stages = [pipeline.Stage("first", lambda job: {"first": True}, workers=1),
+              pipeline.Stage("second", lambda job: {"second": True}, workers=1, accept=accept)]
+    checkpoints = pipeline.CheckpointStore(str(tmp_path / "pipeline.db"))
+    runner = pipeline.Pipeline(stages, checkpoints, queue_size=1)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(finished=runner.run([[make_job(i) for i in range(10)]])),
+                              daemon=True)
+    thread.start()
+    thread.join(10)
+    checkpoints.close()
+
+    assert not thread.is_alive()
+    assert len(result["finished"]) == 10
+    assert [(stage, job["title"]) for stage, job, error in runner.errors] == [("first", "Data Analyst 3")]
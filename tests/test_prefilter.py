@@ -0,0 +1,25 @@
+from prefilter import prefilter_jobs
+
+RESUME = "Data analyst with SQL, Python and Power BI; agile project management."
+
+
+def make_jobs():
+    jobs = [{"title": f"Data Analyst {i}", "company": "Acme",
+             "description": "SQL Python Power BI data analysis agile"} for i in range(4)]
+    jobs.append({"title": "Senior Data Analyst", "company": "Acme", "description": "SQL Python"})
+    return jobs
+
+
+def test_no_cap_by_default():
+    passed, rejected, capped = prefilter_jobs(make_jobs(), RESUME)
+
+    assert len(passed) == 4
+    assert [job["prefilter_score"] for job in rejected] == [None]
+    assert capped == 0
+
+
+def test_top_k_reports_jobs_it_cut():
+    passed, rejected, capped = prefilter_jobs(make_jobs(), RESUME, top_k=1)
+
+    assert len(passed) == 1
+    assert capped == 3
@@ -0,0 +1,29 @@
+import job_store
+import rank_jobs
+
+
+def make_job(i):
+    return {"title": f"Data Analyst {i}", "company": "Acme", "location": "Munich, Germany",
+            "description": "SQL Python", "url": f"https://example.com/acme/jobs/{i}"}
+
+
+def test_second_run_keeps_jobs_ranked_by_the_first(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(rank_jobs.time, "sleep", lambda seconds: None)
+
+    def fake_score(job):
+        score = 90 if job["title"].endswith(("1", "3")) else 40
+        return {"match_score": score, "reasoning": "", "key_matches": [], "gaps": []}
+
+    monkeypatch.setattr(rank_jobs, "calculate_ai_match_score", fake_score)
+    args = ["--no-prefilter", "--no-cache", "--concurrency", "1"]
+
+    # fetch_jobs writes only newly seen jobs to raw_jobs
+    job_store.write_jobs("raw_jobs", [make_job(1), make_job(2)])
+    rank_jobs.main(args)
+    job_store.write_jobs("raw_jobs", [make_job(3)])
+    rank_jobs.main(args)
+
+    stored = {job["title"]: job for job in job_store.load_jobs("ranked_jobs")}
+    assert set(stored) == {"Data Analyst 1", "Data Analyst 3"}
+    assert stored["Data Analyst 1"]["match_score"] == 0.9
@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+from resume_cache import build_profile, compact_profile, extract_text_from_file, normalize_whitespace, prompt_profile
+from resume_template import RESUME_LAYOUTS, apply_delta, build_template, parse_delta, render_markdown
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUMES = ["Chidghana-Hemantharaju.docx", "Chidghana-Hemantharaju.pdf"]
+
+
+@pytest.fixture(scope="module", params=RESUMES)
+def profile(request):
+    return build_profile(normalize_whitespace(extract_text_from_file(os.path.join(ROOT, request.param))))
+
+
+def test_header_and_contact_are_split_out(profile):
+    assert profile["name"] == "Chidghana Hemantharaju"
+    assert "@" in profile["contact"] and "+49" in profile["contact"]
+    assert profile["summary"].startswith("Project-driven Master's student")
+
+
+def test_compact_profile_has_experience_but_no_contact(profile):
+    compact = compact_profile(profile)
+    assert "Experience:\nProject Manager & Data Analyst" in compact
+    assert "@" not in compact and "+49" not in compact and "80997" not in compact
+
+
+def test_prompt_profile_falls_back_to_text_without_experience(profile):
+    resume = {"text": "full resume text", "profile": profile, "compact": compact_profile(profile)}
+    assert prompt_profile(resume) == resume["compact"]
+
+    no_experience = {**profile, "experience": ""}
+    assert prompt_profile({**resume, "profile": no_experience}) == "full resume text"
+
+
+def test_sections_found_despite_layout(profile):
+    assert "Jira (basic, eager to deepen)" in profile["skills"]
+    assert "Stakeholder communication" in profile["skills"]
+    assert profile["experience"].startswith("Project Manager & Data Analyst\nButterfly Interiors")
+    assert "Butterfly" not in profile["certifications"]
+    assert profile["languages"].split("\n") == ["English", "Fluent", "German", "A2"]
+
+
+@pytest.mark.parametrize("country", RESUME_LAYOUTS)
+def test_delta_mode_uses_template(profile, country):
+    template = build_template(profile, country)
+    assert template["experience"][0]["heading"].startswith("Project Manager & Data Analyst | Butterfly Interiors")
+    bullets = [b["id"] for entry in template["experience"] for b in entry["bullets"]]
+    assert len(bullets) >= 12
+
+    delta = parse_delta(json.dumps({"summary": "PMO specialist.", "skills_order": ["Status reporting"],
+                                    "bullet_order": {"E2": ["E2.3", "E2.1"]}, "emphasize": ["PMO"]}))
+    resume = apply_delta(template, delta)
+    assert resume["skills"][0] == "Status reporting"
+    assert resume["experience"][1]["bullets"][0]["id"] == "E2.3"
+    markdown = render_markdown(resume)
+    assert markdown.startswith("# Chidghana Hemantharaju")
+    assert "@" not in markdown
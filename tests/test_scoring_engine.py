@@ -0,0 +1,28 @@
+import asyncio
+
+from fake_openai_server import start_fake_server
+from llm_gateway import METER, model_for
+from scoring_engine import ScoringEngine
+
+
+def test_default_model_follows_the_stage_tier():
+    assert ScoringEngine(stage="match").model == model_for("match")
+    assert ScoringEngine(stage="cover_letter").model == model_for("cover_letter")
+
+
+def test_non_retryable_error_is_metered():
+    async def run():
+        runner, base_url = await start_fake_server(latency=0, jitter=0)
+        try:
+            # Unknown path: the fake server answers 404, which is not retried
+            engine = ScoringEngine(base_url=f"{base_url}/missing", api_key="fake", stage="test-4xx")
+            return engine, await engine.run([([{"role": "user", "content": "Job 1"}], 50)])
+        finally:
+            await runner.cleanup()
+
+    METER.reset()
+    engine, results = asyncio.run(run())
+
+    assert isinstance(results[0], Exception)
+    assert engine.stats == {"requests": 1, "retries": 0, "failures": 1}
+    assert METER.snapshot()["test-4xx"]["errors"] == 1
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import structured_sources
+from config import COMPANY_CAREERS
+from structured_sources import iter_structured_jobs
+
+
+def page(jobs, total):
+    return {"operationResult": {"result": {"jobs": jobs, "totalJobs": total}}}
+
+
+def test_microsoft_preset_pages_until_total(monkeypatch):
+    pages = [
+        page([{"jobId": "1", "title": "Data Analyst", "postingDate": "2026-10-01",
+               "properties": {"primaryLocation": "Munich, Bavaria, Germany", "description": "SQL"}},
+              {"jobId": "2", "title": "Software Engineer", "properties": {}}], 3),
+        page([{"jobId": "3", "title": "Program Manager", "properties": {}}], 3),
+    ]
+    requests = []
+
+    def fake_request(method, url, params=None, json=None, **kwargs):
+        requests.append(dict(params))
+        return SimpleNamespace(json=lambda: pages[len(requests) - 1], raise_for_status=lambda: None)
+
+    monkeypatch.setattr(structured_sources, "get_session", lambda: SimpleNamespace(request=fake_request))
+    company = next(c for c in COMPANY_CAREERS if c["name"] == "Microsoft")
+
+    jobs = list(iter_structured_jobs(company, title_filter=lambda title, keywords: "Engineer" not in title))
+
+    assert [r["pg"] for r in requests] == [1, 2]
+    assert requests[0]["lc"] == "Munich, Bavaria, Germany"
+    assert [job["link"] for job in jobs] == ["https://jobs.careers.microsoft.com/global/en/job/1",
+                                             "https://jobs.careers.microsoft.com/global/en/job/3"]
+    assert jobs[0]["location"] == "Munich, Bavaria, Germany" and jobs[0]["description"] == "SQL"
+    assert jobs[1]["location"] == "Munich" and jobs[1]["source"] == "company_api"